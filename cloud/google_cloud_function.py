@@ -71,10 +71,9 @@ def collect_data_cloud(request):
         spreadsheet_handler = SpreadsheetHandler()
         spreadsheet_handler.open_spreadsheet()
         
-        success_count = 0
-        for row in processed_data['spreadsheet_data'][1:]:  # 헤더 제외
-            if spreadsheet_handler.append_to_main_sheet(row):
-                success_count += 1
+        success_count = spreadsheet_handler.append_rows_to_main_sheet(
+            processed_data['spreadsheet_data'][1:]  # 헤더 제외
+        )
         
         logger.info(f"데이터 수집 완료: {success_count}개 행 추가")
         
@@ -15,6 +15,7 @@ sys.path.append(str(project_root))
 
 from src.config.settings import Settings
 from src.utils.helpers import get_latest_sales_file, extract_date_from_filename
+from src.services.data_processor import DataProcessor
 
 def analyze_excel_file(file_path):
     """Excel 파일 분석"""
@@ -22,8 +23,8 @@ def analyze_excel_file(file_path):
     print("=" * 60)
     
     try:
-        # Excel 파일 읽기
-        df = pd.read_excel(file_path)
+        # Excel 파일 읽기 (파싱 캐시 사용)
+        df = DataProcessor().load_dataframe(file_path)
         
         print(f"📋 기본 정보:")
         print(f"   - 행 수: {len(df)}")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Chrome 프로필별 스크래핑 성능 비교 스크립트
+기본 프로필과 경량(lean) 프로필의 페이지 로딩/전체 스크래핑 시간과
+chromedriver + 브라우저 프로세스 트리의 최대 메모리(RSS)를 비교
+(메모리 측정에는 psutil이 필요하며, 없으면 시간만 비교)
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.services.web_scraper import WebScraper
+from src.utils.logger import setup_logger
+
+class PeakMemorySampler:
+    """프로세스와 모든 하위 프로세스의 RSS 합계를 주기적으로 측정해 최대값 기록"""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                # 측정 중 종료된 하위 프로세스(렌더러 등)는 제외
+                pass
+        self.peak = max(self.peak, total)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """측정 종료 후 최대 RSS(바이트) 반환 (드라이버 종료 전에 호출)"""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak
+
+def run_once(profile):
+    """한 번의 스크래핑 실행 시간과 최대 메모리 측정 (받은 파일은 실행 후 삭제)"""
+    result = {'profile': profile}
+    started = time.monotonic()
+
+    # 실행마다 별도 다운로드 폴더를 쓰고 끝나면 지워 반복 실행해도 파일이 쌓이지 않게 함
+    download_dir = tempfile.mkdtemp(prefix='benchmark_scraper_')
+    scraper = WebScraper(profile=profile, download_dir=download_dir)
+    sampler = None
+    try:
+        scraper.setup_driver()
+        result['startup'] = time.monotonic() - started
+        if psutil is not None:
+            sampler = PeakMemorySampler(scraper.driver.service.process.pid).start()
+
+        login_started = time.monotonic()
+        scraper.login()
+        result['login'] = time.monotonic() - login_started
+
+        navigate_started = time.monotonic()
+        scraper.navigate_to_sales_management()
+        result['page_load'] = time.monotonic() - navigate_started
+
+        scraper.select_distributor()
+        scraper.set_date_range()
+        scraper.click_search_button()
+        scraper.download_excel_file()
+        result['steps'] = dict(scraper.step_timings)
+    finally:
+        if sampler is not None:
+            result['peak_rss_mb'] = sampler.stop() / (1024 * 1024)
+        scraper.close()
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    result['total'] = time.monotonic() - started
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Chrome 프로필별 스크래핑 성능 비교')
+    parser.add_argument('--runs', type=int, default=3, help='프로필별 실행 횟수')
+    parser.add_argument('--profiles', default='default,lean', help='비교할 프로필 목록')
+    args = parser.parse_args()
+
+    setup_logger()
+
+    print("⏱️  Chrome 프로필 성능 비교")
+    print("=" * 60)
+    if psutil is None:
+        print("   ⚠️ psutil이 설치되어 있지 않아 메모리는 측정하지 않습니다 (pip install psutil)")
+
+    summary = {}
+    for profile in [p.strip() for p in args.profiles.split(',') if p.strip()]:
+        results = []
+        for i in range(args.runs):
+            try:
+                result = run_once(profile)
+                results.append(result)
+                memory = f", 최대 메모리 {result['peak_rss_mb']:.0f}MB" if 'peak_rss_mb' in result else ""
+                print(f"   {profile} #{i + 1}: 시작 {result['startup']:.2f}초, "
+                      f"로그인 {result['login']:.2f}초, 페이지 로딩 {result['page_load']:.2f}초, "
+                      f"전체 {result['total']:.2f}초{memory}")
+            except Exception as e:
+                print(f"   ❌ {profile} #{i + 1} 실패: {str(e)}")
+        summary[profile] = results
+
+    print()
+    print("📋 평균 (시간: 초, 메모리: 실행별 최대 RSS MB)")
+    print(f"   {'프로필':<10}{'시작':>8}{'로그인':>8}{'페이지':>8}{'전체':>8}{'메모리':>10}")
+    for profile, results in summary.items():
+        if not results:
+            continue
+        average = lambda key: sum(r[key] for r in results) / len(results)
+        memory = f"{average('peak_rss_mb'):>10.0f}" if psutil is not None else f"{'-':>10}"
+        print(f"   {profile:<10}{average('startup'):>8.2f}{average('login'):>8.2f}"
+              f"{average('page_load'):>8.2f}{average('total'):>8.2f}{memory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Google Sheets 기록 성능 측정 스크립트
+메모리 가짜 스프레드시트(fake_sheets)에 하루치 데이터를 추가하며 API 호출 수와 실행 시간을 측정
+(인증 정보나 실제 스프레드시트 없이 실행 가능)
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.config.settings import Settings
+from src.services.sheets_scheduler import SheetsRequestScheduler
+from src.services.spreadsheet_handler import SpreadsheetHandler
+from src.utils.logger import setup_logger
+from tests.support.fake_sheets import FakeClient, FakeSpreadsheet
+
+MAIN_HEADER = ['거래번호', '자판기', '상품명', '수량', '금액', '결제수단', '카드사', '거래일시', '상태', '비고']
+
+def generate_day(day, rows, offset=0):
+    """하루치 main 시트 행 생성 (H열은 거래일시)"""
+    start = datetime.combine(day, datetime.min.time())
+    step = 86400 / max(rows, 1)
+    return [
+        [
+            f"{day:%Y%m%d}-{offset + i:06d}",
+            f"VM{(offset + i) % 40:03d}",
+            f"상품{(offset + i) % 120:03d}",
+            1 + (offset + i) % 3,
+            1000 + ((offset + i) % 20) * 100,
+            '카드' if i % 4 else '현금',
+            '',
+            (start + timedelta(seconds=int(i * step))).strftime('%Y-%m-%d %H:%M:%S'),
+            '정상',
+            ''
+        ]
+        for i in range(rows)
+    ]
+
+def run_mode(use_cache, args):
+    """한 가지 설정으로 여러 날짜를 추가하고 날짜별 호출 수/시간 기록"""
+    Settings.ROW_KEY_CACHE_ENABLED = use_cache
+    Settings.STATE_DIR = tempfile.mkdtemp(prefix='benchmark_sheets_')
+
+    first_day = datetime(2025, 1, 1).date()
+    existing = [MAIN_HEADER]
+    for i in range(args.history_days):
+        existing.extend(generate_day(first_day + timedelta(days=i), args.rows))
+
+    spreadsheet = FakeSpreadsheet(
+        sheets={
+            Settings.MAIN_SHEET: existing,
+            Settings.TABLE1_SHEET: [['구분', '매출액', '판매 수']],
+            Settings.TABLE2_SHEET: [['월', '매출액']],
+        },
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=0
+    )
+    scheduler = SheetsRequestScheduler(
+        read_per_minute=args.quota or 10 ** 9,
+        write_per_minute=args.quota or 10 ** 9,
+        base_delay=0.01,
+        max_delay=0.1
+    )
+    handler = SpreadsheetHandler(scheduler=scheduler, client=FakeClient(spreadsheet))
+    if not handler.open_spreadsheet():
+        raise RuntimeError("가짜 스프레드시트 연결 실패")
+
+    results = []
+    for i in range(args.days):
+        day = first_day + timedelta(days=args.history_days + i)
+        rows = generate_day(day, args.rows)
+
+        for label, batch in (('추가', rows), ('재실행', rows)):
+            spreadsheet.reset_calls()
+            started = time.monotonic()
+            added = handler.append_rows_to_main_sheet(batch)
+            results.append({
+                'day': day,
+                'label': label,
+                'added': added,
+                'calls': spreadsheet.total_calls(),
+                'errors': spreadsheet.calls['errors'],
+                'detail': dict(spreadsheet.calls),
+                'seconds': time.monotonic() - started
+            })
+
+    if handler.row_key_store is not None:
+        handler.row_key_store.close()
+    return results, scheduler.get_metrics()
+
+def main():
+    parser = argparse.ArgumentParser(description='Google Sheets 기록 성능 측정 (가짜 백엔드)')
+    parser.add_argument('--rows', type=int, default=10000, help='하루 행 수')
+    parser.add_argument('--days', type=int, default=3, help='추가할 날짜 수')
+    parser.add_argument('--history-days', type=int, default=5, help='시트에 미리 채울 날짜 수')
+    parser.add_argument('--latency', type=float, default=0.0, help='API 호출당 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='429 오류 확률 (0~1)')
+    parser.add_argument('--quota', type=int, default=0, help='분당 요청 한도 (0이면 제한 없음)')
+    args = parser.parse_args()
+
+    setup_logger()
+
+    print("⏱️  Google Sheets 기록 성능 측정 (가짜 백엔드)")
+    print(f"   하루 {args.rows:,}행 × {args.days}일, 기존 {args.history_days}일치, "
+          f"지연 {args.latency}초, 오류율 {args.error_rate}")
+    print("=" * 60)
+
+    for use_cache in (True, False):
+        name = '행 키 캐시' if use_cache else '시트 전체 조회'
+        results, metrics = run_mode(use_cache, args)
+
+        print(f"\n📋 {name}")
+        for result in results:
+            detail = ', '.join(f"{k}={v}" for k, v in sorted(result['detail'].items()))
+            print(f"   {result['day']} {result['label']}: {result['added']:,}행 추가, "
+                  f"호출 {result['calls']}회 ({detail}), {result['seconds']:.2f}초")
+
+        total_calls = sum(r['calls'] for r in results)
+        total_seconds = sum(r['seconds'] for r in results)
+        print(f"   합계: 호출 {total_calls}회, {total_seconds:.2f}초, "
+              f"재시도 {metrics['retries']}회, 대기 {metrics['throttled_seconds']:.2f}초")
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@
 이메일 발송 없이 데이터 수집만 수행
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
 from datetime import datetime
+from itertools import groupby
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
@@ -16,8 +18,10 @@ sys.path.append(str(project_root))
 from src.services.web_scraper import WebScraper
 from src.services.spreadsheet_handler import SpreadsheetHandler
 from src.services.data_processor import DataProcessor
+from src.services.distributor_collector import DistributorCollector
 from src.config.settings import Settings
 from src.utils.logger import setup_logger, get_logger
+from src.utils.helpers import build_date_chunks
 
 class DataCollector:
     def __init__(self):
@@ -55,19 +59,24 @@ class DataCollector:
         try:
             self.logger.info("데이터 수집 프로세스 시작")
             
-            # 1. 웹사이트에서 파일 다운로드
-            downloaded_file = self._download_file()
-            if not downloaded_file:
+            # 1. 웹사이트에서 총판별 파일 다운로드 (여러 총판이면 동시에)
+            downloads = self._download_files()
+            if not downloads:
                 self.logger.error("파일 다운로드 실패")
                 return False
             
-            # 2. 다운로드된 파일 처리
-            processed_data = self._process_file(downloaded_file)
-            if not processed_data:
+            # 2. 다운로드된 파일 처리 (실패한 총판은 제외하고 계속)
+            processed_results = []
+            for distributor_code, downloaded_file in downloads:
+                processed = self._process_file(downloaded_file, distributor_code)
+                if processed:
+                    processed_results.append((distributor_code, processed))
+            if not processed_results:
                 self.logger.error("파일 처리 실패")
                 return False
+            processed_data = self.data_processor.combine_processed(processed_results)
             
-            # 3. 스프레드시트에 데이터 추가
+            # 3. 스프레드시트에 모든 총판 데이터를 한 번에 추가
             success = self._update_spreadsheet(processed_data['spreadsheet_data'])
             if not success:
                 self.logger.warning("스프레드시트 업데이트 실패 또는 중복 데이터")
@@ -79,21 +88,56 @@ class DataCollector:
             self.logger.error(f"데이터 수집 프로세스 실패: {str(e)}")
             return False
     
-    def _download_file(self):
-        """파일 다운로드"""
+    def collect_range(self, start_date, end_date, chunk_days=1):
+        """기간 데이터 수집 (한 번의 로그인으로 여러 날짜, 모든 총판 다운로드)"""
         try:
+            date_ranges = build_date_chunks(start_date, end_date, chunk_days)
+            self.logger.info(f"기간 데이터 수집 시작: {start_date} ~ {end_date} ({len(date_ranges)}개 구간)")
+            
+            failed_ranges = []
             with WebScraper() as scraper:
-                scraper.login()
-                downloaded_file = scraper.download_file()
-                return downloaded_file
+                downloads = scraper.download_range(date_ranges, Settings.DISTRIBUTOR_CODES)
+                # 구간마다 모든 총판 파일을 처리해 시트에 한 번에 추가
+                for (range_start, range_end), entries in groupby(downloads, key=lambda entry: entry[:2]):
+                    processed_results = []
+                    for _, _, distributor_code, downloaded_file in entries:
+                        processed = self._process_file(downloaded_file, distributor_code) if downloaded_file else None
+                        if processed:
+                            processed_results.append((distributor_code, processed))
+                        else:
+                            failed_ranges.append((range_start, range_end, distributor_code))
+                    
+                    if processed_results:
+                        processed_data = self.data_processor.combine_processed(processed_results)
+                        self._update_spreadsheet(processed_data['spreadsheet_data'])
+            
+            if failed_ranges:
+                self.logger.error(f"수집 실패 구간: {failed_ranges}")
+                return False
+            
+            self.logger.info("기간 데이터 수집 완료")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"기간 데이터 수집 실패: {str(e)}")
+            return False
+    
+    def _download_files(self):
+        """총판별 파일 다운로드, 성공한 (총판 코드, 파일 경로) 목록 반환"""
+        try:
+            results = DistributorCollector().collect(Settings.DISTRIBUTOR_CODES)
+            failed = [result['distributor'] for result in results if not result['file']]
+            if failed:
+                self.logger.error(f"다운로드 실패 총판: {', '.join(failed)}")
+            return [(result['distributor'], result['file']) for result in results if result['file']]
         except Exception as e:
             self.logger.error(f"파일 다운로드 실패: {str(e)}")
-            return None
+            return []
     
-    def _process_file(self, file_path):
-        """파일 처리"""
+    def _process_file(self, file_path, distributor=None):
+        """파일 처리 (distributor: 파일의 총판 코드)"""
         try:
-            return self.data_processor.process_downloaded_file(file_path)
+            return self.data_processor.process_downloaded_file(file_path, distributor)
         except Exception as e:
             self.logger.error(f"파일 처리 실패: {str(e)}")
             return None
@@ -101,12 +145,12 @@ class DataCollector:
     def _update_spreadsheet(self, data):
         """스프레드시트 업데이트"""
         try:
-            # 헤더를 제외한 데이터만 추가
+            # 헤더를 제외한 데이터를 한 번에 추가
             if len(data) > 1:
-                for row in data[1:]:  # 헤더 제외
-                    success = self.spreadsheet_handler.append_to_main_sheet(row)
-                    if not success:
-                        self.logger.warning("중복 데이터로 인해 추가하지 않음")
+                added_count = self.spreadsheet_handler.append_rows_to_main_sheet(data[1:])
+                if added_count == 0:
+                    self.logger.warning("중복 데이터로 인해 추가하지 않음")
+            self.logger.info(f"Sheets 요청 지표: {self.spreadsheet_handler.scheduler.get_metrics()}")
             return True
         except Exception as e:
             self.logger.error(f"스프레드시트 업데이트 실패: {str(e)}")
@@ -114,6 +158,12 @@ class DataCollector:
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='TOYGO 자판기 매출 데이터 수집기')
+    parser.add_argument('--start-date', help='수집 시작일 (YYYY-MM-DD, 기본값: 어제)')
+    parser.add_argument('--end-date', help='수집 종료일 (YYYY-MM-DD, 기본값: 시작일)')
+    parser.add_argument('--chunk-days', type=int, default=1, help='한 번에 조회할 일수')
+    args = parser.parse_args()
+    
     # 로거 설정
     setup_logger()
     
@@ -134,7 +184,12 @@ def main():
     
     # 데이터 수집 실행
     print("\n🚀 데이터 수집 시작...")
-    success = collector.collect_data()
+    if args.start_date:
+        success = collector.collect_range(
+            args.start_date, args.end_date or args.start_date, args.chunk_days
+        )
+    else:
+        success = collector.collect_data()
     
     if success:
         print("\n✅ 데이터 수집 완료!")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+월 누적 집계 재구성 스크립트
+로컬 매출 저장소의 데이터로 월별/자판기별 누적값을 다시 계산
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.services.sales_warehouse import SalesWarehouse
+from src.services.running_totals import RunningTotals
+from src.utils.logger import setup_logger
+
+def main():
+    parser = argparse.ArgumentParser(description='월 누적 집계 재구성')
+    parser.add_argument('--month', action='append', help='재구성할 월 (YYYY-MM, 여러 번 지정 가능, 기본값: 전체)')
+    args = parser.parse_args()
+
+    setup_logger()
+
+    warehouse = SalesWarehouse()
+    running_totals = RunningTotals()
+
+    print("🔄 월 누적 집계 재구성")
+    print("=" * 50)
+    days = running_totals.rebuild(warehouse, args.month)
+    print(f"✅ {days}일 재구성 완료")
+
+    for month in args.month or [m for m in warehouse.monthly_totals()['month']]:
+        sales, items = running_totals.month_to_date(month)
+        print(f"   {month}: {sales:,.0f}원 ({items}건)")
+
+    running_totals.close()
+    warehouse.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+로컬 매출 저장소 조회 스크립트
+구글 스프레드시트를 읽지 않고 월별/일별/자판기별 매출을 확인
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.services.sales_warehouse import SalesWarehouse
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 매출 저장소 조회')
+    parser.add_argument('--month', default=datetime.now().strftime('%Y-%m'), help='조회할 월 (YYYY-MM)')
+    args = parser.parse_args()
+
+    warehouse = SalesWarehouse()
+
+    print("📊 월별 매출")
+    print("=" * 50)
+    print(warehouse.monthly_totals().to_string(index=False))
+    print()
+
+    print(f"📅 {args.month} 일별 매출")
+    print("=" * 50)
+    daily = warehouse.daily_totals(args.month)
+    print(daily.to_string(index=False) if not daily.empty else "데이터 없음")
+    print()
+
+    if not daily.empty:
+        print(f"🏪 {args.month} 자판기별 매출")
+        print("=" * 50)
+        machines = warehouse.machine_totals(daily['sale_date'].min(), daily['sale_date'].max())
+        print(machines.to_string(index=False))
+
+    warehouse.close()
+
+if __name__ == "__main__":
+    main()
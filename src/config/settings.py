@@ -11,6 +11,25 @@ class Settings:
     WEBSITE_USERNAME = os.getenv('WEBSITE_USERNAME', '')
     WEBSITE_PASSWORD = os.getenv('WEBSITE_PASSWORD', '')
     
+    # 총판 코드 (로컬러: 040)
+    DISTRIBUTOR_CODE = os.getenv('DISTRIBUTOR_CODE', '040')
+    # 매일 수집할 총판 코드 목록 (쉼표 구분, 기본값: DISTRIBUTOR_CODE) 및 동시 수집 수
+    DISTRIBUTOR_CODES = [
+        code.strip() for code in os.getenv('DISTRIBUTOR_CODES', DISTRIBUTOR_CODE).split(',') if code.strip()
+    ]
+    DISTRIBUTOR_CONCURRENCY = int(os.getenv('DISTRIBUTOR_CONCURRENCY', '3'))
+    
+    # 엑셀 내보내기 직접 호출 URL 템플릿 (비어 있으면 브라우저 클릭 방식만 사용)
+    # 예: https://example.com/payment/excel.php?group_first={distributor}&sdate={start_date}&edate={end_date}
+    EXPORT_URL = os.getenv('EXPORT_URL', '')
+    
+    # 로그인 세션 저장 (STATE_DIR/session.bin, Fernet 키로 암호화)
+    SESSION_STORE_ENABLED = os.getenv('SESSION_STORE_ENABLED', 'false').lower() == 'true'
+    SESSION_STORE_KEY = os.getenv('SESSION_STORE_KEY', '')
+    SESSION_STORE_TTL = int(os.getenv('SESSION_STORE_TTL', str(12 * 60 * 60)))
+    # 세션 유효성 확인용 인증 페이지 (비어 있으면 WEBSITE_URL)
+    SESSION_PROBE_URL = os.getenv('SESSION_PROBE_URL', '')
+    
     # 구글 스프레드시트 설정
     SPREADSHEET_ID = os.getenv('SPREADSHEET_ID', '1PckoSzEWtsxt6seKG-n8wms_00G-cTf7eNjR6Rj-ggE')
     GOOGLE_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials/google_credentials.json')
@@ -19,6 +38,25 @@ class Settings:
     EMAIL_SENDER = os.getenv('EMAIL_SENDER', '')
     EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
     EMAIL_RECIPIENTS = os.getenv('EMAIL_RECIPIENTS', '').split(',')
+    # 수신자별 맞춤 보고서 필터 (JSON, 예: {"a@x.com": {"machine": ["VM001"]}, "b@x.com": {"distributor": ["040"]}})
+    # 필터 역할: machine / product / distributor, 여기에 있는 수신자는 전체 보고서 대신 맞춤 보고서를 받음
+    EMAIL_RECIPIENT_FILTERS = os.getenv('EMAIL_RECIPIENT_FILTERS', '')
+    # SMTP 서버 (로컬 테스트 서버 사용 시 예: localhost / 1025 / SMTP_USE_TLS=false)
+    SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
+    SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
+    SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', '30'))
+    # 이 시간(초) 이상 사용하지 않은 SMTP 연결은 NOOP으로 살아 있는지 확인 후 재사용
+    SMTP_IDLE_CHECK_SECONDS = float(os.getenv('SMTP_IDLE_CHECK_SECONDS', '30'))
+    # 이메일 발송 대기열 (STATE_DIR/email_outbox.sqlite3, 백그라운드 발송/재시도/중복 방지)
+    EMAIL_OUTBOX_ENABLED = os.getenv('EMAIL_OUTBOX_ENABLED', 'true').lower() == 'true'
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+    EMAIL_OUTBOX_BACKOFF_BASE = float(os.getenv('EMAIL_OUTBOX_BACKOFF_BASE', '30'))
+    EMAIL_OUTBOX_BACKOFF_MAX = float(os.getenv('EMAIL_OUTBOX_BACKOFF_MAX', '600'))
+    # 발송 중('sending')으로 가져간 메시지를 다른 프로세스가 다시 가져갈 수 있기까지의 시간(초, 발송 중 종료 대비)
+    EMAIL_OUTBOX_CLAIM_TIMEOUT = float(os.getenv('EMAIL_OUTBOX_CLAIM_TIMEOUT', '300'))
+    # 종료 시 대기열을 비우기 위해 기다리는 최대 시간(초)
+    EMAIL_OUTBOX_DRAIN_TIMEOUT = float(os.getenv('EMAIL_OUTBOX_DRAIN_TIMEOUT', '120'))
     
     # 로그 설정
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -27,14 +65,85 @@ class Settings:
     # 파일 경로 설정
     DOWNLOAD_DIR = 'downloads'
     LOGS_DIR = 'logs'
+    STATE_DIR = os.getenv('STATE_DIR', 'state')
+    
+    # 다운로드 완료 대기 최대 시간 (초)
+    DOWNLOAD_TIMEOUT = int(os.getenv('DOWNLOAD_TIMEOUT', '60'))
+    
+    # 웹 스크래퍼 단계별 대기 시간 제한 (초)
+    NAVIGATE_TIMEOUT = int(os.getenv('NAVIGATE_TIMEOUT', '15'))
+    DISTRIBUTOR_TIMEOUT = int(os.getenv('DISTRIBUTOR_TIMEOUT', '10'))
+    DATE_RANGE_TIMEOUT = int(os.getenv('DATE_RANGE_TIMEOUT', '10'))
+    SEARCH_TIMEOUT = int(os.getenv('SEARCH_TIMEOUT', '30'))
+    DOWNLOAD_MENU_TIMEOUT = int(os.getenv('DOWNLOAD_MENU_TIMEOUT', '10'))
+    
+    # Chrome 프로필 ('default' 또는 이미지/폰트/분석 스크립트를 차단하는 'lean')
+    CHROME_PROFILE = os.getenv('CHROME_PROFILE', 'default')
+    LEAN_BLOCKED_URLS = [
+        pattern.strip() for pattern in os.getenv(
+            'LEAN_BLOCKED_URLS',
+            '*.woff,*.woff2,*.ttf,*.otf,*google-analytics.com*,*googletagmanager.com*,'
+            '*doubleclick.net*,*googlesyndication.com*,*facebook.net*,*analytics.js*'
+        ).split(',') if pattern.strip()
+    ]
+    
+    # 스케줄러/백필용 Chrome 드라이버 풀
+    DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))
+    DRIVER_MAX_AGE = int(os.getenv('DRIVER_MAX_AGE', str(6 * 60 * 60)))
+    DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', '20'))
+    DRIVER_RESTART_ATTEMPTS = int(os.getenv('DRIVER_RESTART_ATTEMPTS', '2'))
+    
+    # 검색 결과 테이블 선택자 (검색 완료 판단용)
+    SEARCH_RESULT_SELECTOR = os.getenv('SEARCH_RESULT_SELECTOR', 'table tbody')
+    # 검색 결과 없음 표시 선택자 (비어 있으면 사용하지 않음)
+    SEARCH_EMPTY_SELECTOR = os.getenv('SEARCH_EMPTY_SELECTOR', '.dataTables_empty')
+    # 검색 요청이 끝난 뒤 결과가 바뀌지 않으면 완료로 보기까지 기다리는 시간 (초)
+    SEARCH_SETTLE_SECONDS = float(os.getenv('SEARCH_SETTLE_SECONDS', '0.5'))
+    
+    # 파싱된 엑셀 캐시 (Feather, 크기 초과 시 LRU 삭제)
+    PARSE_CACHE_ENABLED = os.getenv('PARSE_CACHE_ENABLED', 'true').lower() == 'true'
+    PARSE_CACHE_DIR = os.getenv('PARSE_CACHE_DIR', 'cache/parsed')
+    PARSE_CACHE_MAX_BYTES = int(os.getenv('PARSE_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+    
+    # 로컬 매출 저장소 (STATE_DIR/sales_warehouse.sqlite3)
+    WAREHOUSE_ENABLED = os.getenv('WAREHOUSE_ENABLED', 'true').lower() == 'true'
+    # 월/자판기별 증분 누적 집계 (STATE_DIR/running_totals.sqlite3)
+    RUNNING_TOTALS_ENABLED = os.getenv('RUNNING_TOTALS_ENABLED', 'true').lower() == 'true'
+    
+    # Google Sheets 요청 할당량(분당)과 재시도 설정
+    SHEETS_READ_PER_MINUTE = int(os.getenv('SHEETS_READ_PER_MINUTE', '60'))
+    SHEETS_WRITE_PER_MINUTE = int(os.getenv('SHEETS_WRITE_PER_MINUTE', '60'))
+    SHEETS_MAX_RETRIES = int(os.getenv('SHEETS_MAX_RETRIES', '5'))
+    SHEETS_BACKOFF_BASE = float(os.getenv('SHEETS_BACKOFF_BASE', '1.0'))
+    SHEETS_BACKOFF_MAX = float(os.getenv('SHEETS_BACKOFF_MAX', '64.0'))
+    
+    # H열 서식을 미리 적용해 둘 여유 행 수
+    DATE_FORMAT_HEADROOM_ROWS = int(os.getenv('DATE_FORMAT_HEADROOM_ROWS', '1000'))
     
     # 스프레드시트 시트 이름
     MAIN_SHEET = 'main'
     TABLE1_SHEET = 'table1'
     TABLE2_SHEET = 'table2'
     
+    # main 시트 중복 확인 키 컬럼 (예: "A,C,D,F,H", 비어 있으면 행 전체 비교)
+    DEDUPE_KEY_COLUMNS = os.getenv('DEDUPE_KEY_COLUMNS', '')
+    
+    # main 시트 행 키 로컬 캐시 사용 여부 (STATE_DIR/row_keys.sqlite3)
+    ROW_KEY_CACHE_ENABLED = os.getenv('ROW_KEY_CACHE_ENABLED', 'true').lower() == 'true'
+    
+    # 보고서 집계 방식 ('local': 로컬 계산, 'sheet': table1/table2 시트 조회)
+    # REPORT_VERIFY로 로컬 집계가 시트와 일치하는 것을 확인한 뒤 'local'로 전환
+    REPORT_SOURCE = os.getenv('REPORT_SOURCE', 'sheet')
+    # 로컬 집계를 시트 수식 결과와 비교해 불일치를 로그로 남김 ('sheet' 모드에서도 비교만 수행)
+    REPORT_VERIFY = os.getenv('REPORT_VERIFY', 'false').lower() == 'true'
+    # 로컬 집계 결과를 기록할 시트 범위 (예: "report!A1:C20", 비어 있으면 기록하지 않음)
+    REPORT_TABLE1_WRITEBACK_RANGE = os.getenv('REPORT_TABLE1_WRITEBACK_RANGE', '')
+    REPORT_MONTHLY_WRITEBACK_RANGE = os.getenv('REPORT_MONTHLY_WRITEBACK_RANGE', '')
+    
     # 이메일 템플릿 설정
     EMAIL_SUBJECT = '📊 자판기 매출 보고서'
+    # HTML 본문 포함 여부 (켜면 텍스트/HTML을 한 메시지로 발송, 꺼져 있으면 HTML을 렌더링하지 않음)
+    EMAIL_HTML_ENABLED = os.getenv('EMAIL_HTML_ENABLED', 'false').lower() == 'true'
     
     @classmethod
     def validate_settings(cls):
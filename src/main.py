@@ -5,22 +5,28 @@
 
 import argparse
 import schedule
+from contextlib import contextmanager
+from itertools import groupby
 import time
 import sys
 import os
-from datetime import datetime
-from jinja2 import Template
 
 # 프로젝트 루트 경로를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import Settings
 from utils.logger import setup_logger, get_logger
-from utils.helpers import ensure_directory
+from utils.helpers import ensure_directory, build_date_chunks, get_report_date
+from utils.email_templates import render_report_html
 from services.web_scraper import WebScraper
+from services.driver_pool import DriverPool
+from services.distributor_collector import DistributorCollector
 from services.spreadsheet_handler import SpreadsheetHandler
 from services.data_processor import DataProcessor
 from services.email_sender import EmailSender
+from services.email_outbox import EmailOutbox
+from services.report_aggregator import ReportAggregator
+from services.report_fanout import ReportFanout, parse_recipient_filters
 
 class VendingMachineAutomation:
     def __init__(self):
@@ -28,6 +34,8 @@ class VendingMachineAutomation:
         self.spreadsheet_handler = None
         self.data_processor = None
         self.email_sender = None
+        self.email_outbox = None
+        self.driver_pool = None
     
     def setup(self):
         """시스템 초기 설정"""
@@ -44,6 +52,11 @@ class VendingMachineAutomation:
             self.data_processor = DataProcessor()
             self.email_sender = EmailSender()
             
+            # 이메일은 대기열에 넣고 백그라운드에서 발송 (이전 실행에서 남은 메시지도 발송)
+            if Settings.EMAIL_OUTBOX_ENABLED:
+                self.email_outbox = EmailOutbox(self.email_sender)
+                self.email_outbox.start()
+            
             # 스프레드시트 열기
             self.spreadsheet_handler.open_spreadsheet()
             
@@ -59,25 +72,31 @@ class VendingMachineAutomation:
         try:
             self.logger.info("자동화 프로세스 시작")
             
-            # 1. 웹사이트에서 파일 다운로드
-            downloaded_file = self._download_file()
-            if not downloaded_file:
+            # 1. 웹사이트에서 총판별 파일 다운로드 (여러 총판이면 동시에)
+            downloads = self._download_files()
+            if not downloads:
                 self.logger.error("파일 다운로드 실패")
                 return False
             
-            # 2. 다운로드된 파일 처리
-            processed_data = self._process_file(downloaded_file)
-            if not processed_data:
+            # 2. 다운로드된 파일 처리 (실패한 총판은 제외하고 계속)
+            processed_results = []
+            for distributor_code, downloaded_file in downloads:
+                processed = self._process_file(downloaded_file, distributor_code)
+                if processed:
+                    processed_results.append((distributor_code, processed))
+            if not processed_results:
                 self.logger.error("파일 처리 실패")
                 return False
+            processed_data = self.data_processor.combine_processed(processed_results)
             
-            # 3. 스프레드시트에 데이터 추가
+            # 3. 스프레드시트에 모든 총판 데이터를 한 번에 추가
             success = self._update_spreadsheet(processed_data['spreadsheet_data'])
             if not success:
                 self.logger.warning("스프레드시트 업데이트 실패 또는 중복 데이터")
             
-            # 4. 이메일 보고서 생성 및 발송
-            self._send_email_report(processed_data['summary'])
+            # 4. 이메일 보고서 생성 및 발송 (같은 날짜의 보고서는 한 번만 발송)
+            report_date = get_report_date(downloaded_file for _, downloaded_file in downloads)
+            self._send_email_report(processed_data['summary'], processed_data['dataframe'], report_date)
             
             self.logger.info("자동화 프로세스 완료")
             return True
@@ -86,21 +105,87 @@ class VendingMachineAutomation:
             self.logger.error(f"자동화 프로세스 실패: {str(e)}")
             return False
     
-    def _download_file(self):
-        """파일 다운로드"""
+    def run_backfill(self, start_date, end_date, chunk_days=1):
+        """기간 백필 실행 (한 번의 로그인으로 여러 날짜, 모든 총판 다운로드, 이메일 발송 없음)"""
         try:
+            date_ranges = build_date_chunks(start_date, end_date, chunk_days)
+            self.logger.info(f"백필 시작: {start_date} ~ {end_date} ({len(date_ranges)}개 구간)")
+            
+            failed_ranges = []
+            with self._borrow_scraper() as scraper:
+                downloads = scraper.download_range(date_ranges, Settings.DISTRIBUTOR_CODES)
+                # 구간마다 모든 총판 파일을 처리해 시트에 한 번에 추가
+                for (range_start, range_end), entries in groupby(downloads, key=lambda entry: entry[:2]):
+                    processed_results = []
+                    for _, _, distributor_code, downloaded_file in entries:
+                        processed = self._process_file(downloaded_file, distributor_code) if downloaded_file else None
+                        if processed:
+                            processed_results.append((distributor_code, processed))
+                        else:
+                            failed_ranges.append((range_start, range_end, distributor_code))
+                    
+                    if processed_results:
+                        processed_data = self.data_processor.combine_processed(processed_results)
+                        self._update_spreadsheet(processed_data['spreadsheet_data'])
+            
+            if failed_ranges:
+                self.logger.error(f"백필 실패 구간: {failed_ranges}")
+                return False
+            
+            self.logger.info("백필 완료")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"백필 실패: {str(e)}")
+            return False
+    
+    def enable_driver_pool(self):
+        """드라이버 풀 사용 (스케줄러 모드에서 실행 간 로그인된 드라이버 재사용)"""
+        if self.driver_pool is None:
+            # 총판 동시 수집 수만큼은 드라이버를 유지
+            concurrency = min(len(Settings.DISTRIBUTOR_CODES), Settings.DISTRIBUTOR_CONCURRENCY)
+            self.driver_pool = DriverPool(size=max(Settings.DRIVER_POOL_SIZE, concurrency))
+    
+    def close(self):
+        """사용 중인 리소스 정리"""
+        if self.driver_pool:
+            self.driver_pool.close_all()
+            self.driver_pool = None
+        if self.email_outbox:
+            # 대기 중인 이메일을 발송한 뒤 종료
+            self.email_outbox.stop(drain=True)
+            self.email_outbox.close()
+            self.email_outbox = None
+        if self.email_sender:
+            self.email_sender.close()
+    
+    @contextmanager
+    def _borrow_scraper(self):
+        """로그인된 WebScraper 제공 (풀이 있으면 풀에서 대여)"""
+        if self.driver_pool:
+            with self.driver_pool.borrow() as scraper:
+                yield scraper
+        else:
             with WebScraper() as scraper:
                 scraper.login()
-                downloaded_file = scraper.download_file()
-                return downloaded_file
+                yield scraper
+    
+    def _download_files(self):
+        """총판별 파일 다운로드, 성공한 (총판 코드, 파일 경로) 목록 반환"""
+        try:
+            results = DistributorCollector(self.driver_pool).collect(Settings.DISTRIBUTOR_CODES)
+            failed = [result['distributor'] for result in results if not result['file']]
+            if failed:
+                self.logger.error(f"다운로드 실패 총판: {', '.join(failed)}")
+            return [(result['distributor'], result['file']) for result in results if result['file']]
         except Exception as e:
             self.logger.error(f"파일 다운로드 실패: {str(e)}")
-            return None
+            return []
     
-    def _process_file(self, file_path):
-        """파일 처리"""
+    def _process_file(self, file_path, distributor=None):
+        """파일 처리 (distributor: 파일의 총판 코드)"""
         try:
-            return self.data_processor.process_downloaded_file(file_path)
+            return self.data_processor.process_downloaded_file(file_path, distributor)
         except Exception as e:
             self.logger.error(f"파일 처리 실패: {str(e)}")
             return None
@@ -108,79 +193,131 @@ class VendingMachineAutomation:
     def _update_spreadsheet(self, data):
         """스프레드시트 업데이트"""
         try:
-            # 헤더를 제외한 데이터만 추가
+            # 헤더를 제외한 데이터를 한 번에 추가
             if len(data) > 1:
-                for row in data[1:]:  # 헤더 제외
-                    success = self.spreadsheet_handler.append_to_main_sheet(row)
-                    if not success:
-                        self.logger.warning("중복 데이터로 인해 추가하지 않음")
+                added_count = self.spreadsheet_handler.append_rows_to_main_sheet(data[1:])
+                if added_count == 0:
+                    self.logger.warning("중복 데이터로 인해 추가하지 않음")
+            self.logger.info(f"Sheets 요청 지표: {self.spreadsheet_handler.scheduler.get_metrics()}")
             return True
         except Exception as e:
             self.logger.error(f"스프레드시트 업데이트 실패: {str(e)}")
             return False
     
-    def _send_email_report(self, summary_data):
-        """이메일 보고서 발송"""
+    def _send_email_report(self, summary_data, df=None, report_date=None):
+        """이메일 보고서 발송 (수신자별 필터가 있으면 해당 수신자에게는 맞춤 보고서 발송)
+        
+        report_date(YYYY-MM-DD, 기본값: 어제)는 발송 대기열의 중복 방지 키로 사용한다.
+        """
+        report_date = report_date or get_report_date()
         try:
-            # 스프레드시트에서 데이터 가져오기
-            table1_data = self.spreadsheet_handler.get_table1_data()
-            table2_data = self.spreadsheet_handler.get_table2_monthly_data()
+            filters = parse_recipient_filters(Settings.EMAIL_RECIPIENT_FILTERS)
+            fallback = []
+            if filters:
+                fanout = None
+                try:
+                    if df is None:
+                        raise ValueError("맞춤 보고서용 데이터가 없습니다")
+                    fanout = ReportFanout(
+                        self.data_processor,
+                        self.email_sender,
+                        self.email_outbox,
+                        self.data_processor.get_running_totals()
+                    )
+                    fanout.send(df, filters, report_date)
+                except Exception as e:
+                    # 맞춤 보고서를 받지 못한 수신자에게는 전체 보고서를 대신 발송
+                    handled = fanout.handled if fanout else []
+                    fallback = [r for r in filters if r not in handled]
+                    self.logger.error(
+                        f"맞춤 보고서 발송 실패, {len(fallback)}명에게 전체 보고서 발송: {str(e)}"
+                    )
+            
+            # 맞춤 보고서를 받는 수신자를 제외한 나머지에게 전체 보고서 발송
+            recipients = [r for r in Settings.EMAIL_RECIPIENTS if r and r not in filters] + fallback
+            if not recipients:
+                return
+            
+            # 보고서 집계 데이터 준비
+            table1_data, table2_data = self._get_report_tables(summary_data)
             
             # 이메일 내용 생성
             email_content = self.data_processor.create_email_content(
                 summary_data, table1_data, table2_data
             )
             
-            # HTML 이메일 생성
-            html_content = self._create_html_email(
-                summary_data, table1_data, table2_data
-            )
-            
-            # 이메일 발송
-            self.email_sender.send_email(
-                Settings.EMAIL_SUBJECT,
-                email_content
-            )
+            # HTML 본문은 HTML 발송이 켜져 있을 때만 생성 (텍스트와 함께 한 메시지로 발송)
+            html_content = None
+            if Settings.EMAIL_HTML_ENABLED:
+                html_content = self._create_html_email(
+                    summary_data, table1_data, table2_data
+                )
             
-            # HTML 이메일도 발송 (선택사항)
-            # self.email_sender.send_html_email(
-            #     Settings.EMAIL_SUBJECT,
-            #     html_content
-            # )
+            # 이메일 발송 (대기열이 있으면 추가만 하고 바로 반환)
+            if self.email_outbox:
+                msg, recipients = self.email_sender.build_message(
+                    Settings.EMAIL_SUBJECT, email_content, recipients, html_content=html_content
+                )
+                dedupe_key = f"daily-report:{report_date}:{','.join(sorted(recipients))}"
+                self.email_outbox.enqueue(msg, recipients, dedupe_key)
+            else:
+                self.email_sender.send_email(
+                    Settings.EMAIL_SUBJECT,
+                    email_content,
+                    recipients,
+                    html_content=html_content
+                )
             
-            self.logger.info("이메일 보고서 발송 완료")
+            self.logger.info("이메일 보고서 발송 요청 완료")
             
         except Exception as e:
             self.logger.error(f"이메일 보고서 발송 실패: {str(e)}")
     
+    def _get_report_tables(self, summary_data):
+        """table1 총계와 월 누적 매출 (로컬 계산 또는 시트 조회)"""
+        if Settings.REPORT_SOURCE == 'local':
+            try:
+                aggregator = ReportAggregator(
+                    self.data_processor.get_warehouse(),
+                    self.spreadsheet_handler,
+                    self.data_processor.get_running_totals()
+                )
+                table1_data, table2_data = aggregator.compute(summary_data)
+                
+                if table2_data is None:
+                    # 로컬 저장소에 이번 달 데이터가 없으면 시트에서 조회
+                    table2_data = self.spreadsheet_handler.get_table2_monthly_data()
+                if Settings.REPORT_VERIFY:
+                    aggregator.verify(table1_data, table2_data)
+                aggregator.write_back(table1_data, table2_data)
+                
+                return table1_data, table2_data
+            except Exception as e:
+                self.logger.warning(f"로컬 집계 실패, 시트 조회로 대체: {str(e)}")
+        
+        # 스프레드시트에서 데이터 가져오기
+        table1_data = self.spreadsheet_handler.get_table1_data()
+        table2_data = self.spreadsheet_handler.get_table2_monthly_data()
+        
+        if Settings.REPORT_SOURCE != 'local' and Settings.REPORT_VERIFY:
+            # 로컬 집계 전환 전 검증: 보고서는 시트 값으로 보내고 로컬 계산과의 차이만 기록
+            try:
+                aggregator = ReportAggregator(
+                    self.data_processor.get_warehouse(),
+                    self.spreadsheet_handler,
+                    self.data_processor.get_running_totals()
+                )
+                local_table1, local_table2 = aggregator.compute(summary_data)
+                aggregator.verify(local_table1, local_table2, table1_data, table2_data)
+            except Exception as e:
+                self.logger.warning(f"로컬 집계 검증 실패: {str(e)}")
+        
+        return table1_data, table2_data
+    
     def _create_html_email(self, summary_data, table1_data, table2_data):
-        """HTML 이메일 생성"""
+        """HTML 이메일 생성 (공용 Jinja2 환경의 컴파일된 템플릿 사용)"""
         try:
-            # HTML 템플릿 읽기
-            template_path = os.path.join(
-                os.path.dirname(__file__), 
-                'templates', 
-                'email_template.html'
-            )
-            
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-            
-            # 템플릿 렌더링
-            template = Template(template_content)
-            start_time, end_time = self.data_processor.get_yesterday_range()
-            
-            html_content = template.render(
-                generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                period=f"{start_time.strftime('%Y-%m-%d %H:%M')} ~ {end_time.strftime('%Y-%m-%d %H:%M')}",
-                total_sales=f"{summary_data.get('total_sales', 0):,}원",
-                total_items=f"{summary_data.get('total_items', 0)}개",
-                monthly_data=table2_data,
-                table_data=table1_data
-            )
-            
-            return html_content
-            
+            return render_report_html(summary_data, table1_data, table2_data)
         except Exception as e:
             self.logger.error(f"HTML 이메일 생성 실패: {str(e)}")
             return None
@@ -212,6 +349,9 @@ def main():
     parser.add_argument('--schedule', action='store_true', help='스케줄러 모드로 실행')
     parser.add_argument('--test', action='store_true', help='연결 테스트 실행')
     parser.add_argument('--time', default='09:00', help='스케줄 실행 시간 (HH:MM)')
+    parser.add_argument('--start-date', help='백필 시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='백필 종료일 (YYYY-MM-DD, 기본값: 시작일)')
+    parser.add_argument('--chunk-days', type=int, default=1, help='백필 시 한 번에 조회할 일수')
     
     args = parser.parse_args()
     
@@ -224,31 +364,52 @@ def main():
     
     if not automation.setup():
         logger.error("시스템 초기화 실패")
+        automation.close()
         sys.exit(1)
     
     if args.test:
         # 연결 테스트
         automation.test_connection()
+        automation.close()
+        return
+    
+    if args.start_date:
+        # 기간 백필 모드
+        try:
+            success = automation.run_backfill(
+                args.start_date, args.end_date or args.start_date, args.chunk_days
+            )
+        finally:
+            automation.close()
+        if not success:
+            sys.exit(1)
         return
     
     if args.schedule:
         # 스케줄러 모드
         logger.info(f"스케줄러 모드 시작 - 실행 시간: {args.time}")
         
+        # 실행 간 로그인된 드라이버 재사용
+        automation.enable_driver_pool()
+        
         # 매일 지정된 시간에 실행
         schedule.every().day.at(args.time).do(automation.run_automation)
         
-        # 즉시 한 번 실행
-        automation.run_automation()
-        
-        # 스케줄러 실행
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # 1분마다 체크
+        try:
+            # 즉시 한 번 실행
+            automation.run_automation()
+            
+            # 스케줄러 실행
+            while True:
+                schedule.run_pending()
+                time.sleep(60)  # 1분마다 체크
+        finally:
+            automation.close()
     else:
         # 즉시 실행
         logger.info("즉시 실행 모드")
         success = automation.run_automation()
+        automation.close()
         
         if success:
             logger.info("프로세스 완료")
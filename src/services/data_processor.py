@@ -2,31 +2,57 @@ import pandas as pd
 from datetime import datetime
 from ..utils.logger import get_logger
 from ..utils.helpers import parse_excel_file, create_summary_data, format_currency, get_yesterday_range
+from ..utils.parse_cache import ParseCache
+from ..utils.summary import compute_summary
+from ..config.settings import Settings
+from .sales_warehouse import SalesWarehouse
+from .running_totals import RunningTotals
+
+# 여러 총판 데이터를 합칠 때 보고서용 DataFrame에 추가하는 총판 코드 컬럼 (역할: distributor)
+DISTRIBUTOR_COLUMN = '총판코드'
 
 class DataProcessor:
     def __init__(self):
         self.logger = get_logger()
+        self.parse_cache = ParseCache()
+        self.warehouse = None
+        self.running_totals = None
     
-    def process_downloaded_file(self, file_path):
-        """다운로드된 파일 처리"""
+    def load_dataframe(self, file_path):
+        """파일을 정리된 DataFrame으로 읽기 (같은 내용의 파일은 파싱 캐시 사용)"""
+        df = self.parse_cache.get(file_path)
+        if df is not None:
+            return df
+        
+        df = parse_excel_file(file_path)
+        if df.empty:
+            return df
+        
+        df = self._clean_data(df)
+        self.parse_cache.put(file_path, df)
+        return df
+    
+    def process_downloaded_file(self, file_path, distributor=None):
+        """다운로드된 파일 처리 (distributor: 파일의 총판 코드, 없으면 파일명 또는 기본 총판)"""
         try:
             self.logger.info(f"파일 처리 시작: {file_path}")
             
-            # 파일 읽기
-            df = parse_excel_file(file_path)
+            # 파일 읽기 및 데이터 정리
+            df = self.load_dataframe(file_path)
             
             if df.empty:
                 raise Exception("파일이 비어있습니다")
             
-            # 데이터 정리
-            df = self._clean_data(df)
-            
             # 요약 데이터 생성
             summary = create_summary_data(df)
             
             # 스프레드시트용 데이터 준비
             spreadsheet_data = self._prepare_spreadsheet_data(df)
             
+            # 로컬 매출 저장소 적재 및 월 누적 집계 갱신
+            self._store_in_warehouse(df, file_path, distributor)
+            self._update_running_totals(df, file_path, distributor)
+            
             self.logger.info("파일 처리 완료")
             return {
                 'dataframe': df,
@@ -38,25 +64,105 @@ class DataProcessor:
             self.logger.error(f"파일 처리 실패: {str(e)}")
             raise
     
+    def combine_processed(self, results):
+        """총판별 처리 결과 [(총판 코드, 처리 결과)]를 하나로 합침
+        
+        시트 행은 이어 붙여 한 번에 추가할 수 있게 하고, 보고서용 DataFrame에는
+        총판 코드 컬럼을 붙여 총판별 맞춤 보고서에서 구분할 수 있게 한다.
+        헤더가 다른 총판의 행은 시트 열이 어긋나지 않도록 시트 데이터에서 제외한다.
+        """
+        header = results[0][1]['spreadsheet_data'][0]
+        rows = []
+        frames = []
+        for code, processed in results:
+            if processed['spreadsheet_data'][0] == header:
+                rows.extend(processed['spreadsheet_data'][1:])
+            else:
+                self.logger.warning(f"총판 {code} 데이터의 컬럼 구성이 달라 시트 추가에서 제외합니다")
+            frames.append(processed['dataframe'].assign(**{DISTRIBUTOR_COLUMN: code}))
+        
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        summary = results[0][1]['summary'] if len(results) == 1 else create_summary_data(df)
+        return {
+            'dataframe': df,
+            'summary': summary,
+            'spreadsheet_data': [header] + rows
+        }
+    
+    def get_warehouse(self):
+        """로컬 매출 저장소 (비활성화되어 있으면 None)"""
+        if Settings.WAREHOUSE_ENABLED and self.warehouse is None:
+            self.warehouse = SalesWarehouse()
+        return self.warehouse
+    
+    def _store_in_warehouse(self, df, file_path, distributor=None):
+        """로컬 매출 저장소에 총판별로 적재 (실패해도 처리 과정은 계속)"""
+        try:
+            warehouse = self.get_warehouse()
+            if warehouse is not None:
+                warehouse.ingest(df, file_path, distributor)
+        except Exception as e:
+            self.logger.warning(f"로컬 매출 저장소 적재 실패: {str(e)}")
+    
+    def get_running_totals(self):
+        """월 누적 집계 저장소 (비활성화되어 있으면 None)"""
+        if Settings.RUNNING_TOTALS_ENABLED and self.running_totals is None:
+            self.running_totals = RunningTotals()
+        return self.running_totals
+    
+    def _update_running_totals(self, df, file_path, distributor=None):
+        """처리된 날짜의 총판별 월 누적 집계 갱신 (실패해도 처리 과정은 계속)"""
+        try:
+            running_totals = self.get_running_totals()
+            if running_totals is not None:
+                running_totals.apply_dataframe(df, file_path, distributor)
+        except Exception as e:
+            self.logger.warning(f"월 누적 집계 갱신 실패: {str(e)}")
+    
     def _clean_data(self, df):
         """데이터 정리"""
-        # 빈 행 제거
-        df = df.dropna(how='all')
-        
-        # 빈 열 제거
-        df = df.dropna(axis=1, how='all')
+        # 빈 행/열 제거 (제거할 것이 있을 때만 한 번 복사)
+        row_mask = df.notna().any(axis=1)
+        col_mask = df.notna().any(axis=0)
+        if not row_mask.all() or not col_mask.all():
+            df = df.loc[row_mask, col_mask]
         
         # 컬럼명 정리
-        df.columns = df.columns.str.strip()
+        df.columns = df.columns.astype(str).str.strip()
         
         return df
     
     def _prepare_spreadsheet_data(self, df):
         """스프레드시트용 데이터 준비"""
+        # 날짜 컬럼은 문자열로 변환 (시간 정보가 없는 컬럼은 날짜만)
+        columns = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = series.dropna()
+                has_time = bool((values != values.dt.normalize()).any())
+                series = series.dt.strftime('%Y-%m-%d %H:%M:%S' if has_time else '%Y-%m-%d')
+            columns.append(series.tolist())
+        
         # 첫 번째 행을 헤더로 사용하고 나머지를 데이터로 변환
-        data = [df.columns.tolist()] + df.values.tolist()
+        data = [df.columns.tolist()] + [
+            [self._to_sheet_value(value) for value in row]
+            for row in zip(*columns)
+        ]
         return data
     
+    @staticmethod
+    def _to_sheet_value(value):
+        """타입이 적용된 값을 시트에 기록 가능한 값으로 변환"""
+        if value is None or value is pd.NA or value is pd.NaT:
+            return ''
+        if isinstance(value, float):
+            if pd.isna(value):
+                return ''
+            if value.is_integer():
+                return int(value)
+        return value
+    
     def create_email_content(self, summary_data, table1_data, table2_monthly_data):
         """이메일 내용 생성"""
         try:
@@ -137,37 +243,7 @@ class DataProcessor:
     def extract_summary_from_dataframe(self, df):
         """DataFrame에서 요약 정보 추출"""
         try:
-            summary = {
-                'total_sales': 0,
-                'total_items': len(df),
-                'period': "기간 정보 없음"
-            }
-            
-            # 매출 컬럼 찾기
-            sales_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['매출', '금액', '가격', 'sales', 'amount', 'price'])]
-            
-            if sales_columns:
-                # 숫자형으로 변환 시도
-                try:
-                    df[sales_columns[0]] = pd.to_numeric(df[sales_columns[0]], errors='coerce')
-                    summary['total_sales'] = df[sales_columns[0]].sum()
-                except:
-                    pass
-            
-            # 날짜 컬럼 찾기
-            date_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['날짜', 'date', '시간', 'time'])]
-            
-            if date_columns:
-                try:
-                    df[date_columns[0]] = pd.to_datetime(df[date_columns[0]], errors='coerce')
-                    min_date = df[date_columns[0]].min()
-                    max_date = df[date_columns[0]].max()
-                    if pd.notna(min_date) and pd.notna(max_date):
-                        summary['period'] = f"{min_date.strftime('%Y-%m-%d')} ~ {max_date.strftime('%Y-%m-%d')}"
-                except:
-                    pass
-            
-            return summary
+            return compute_summary(df)
             
         except Exception as e:
             self.logger.error(f"요약 정보 추출 실패: {str(e)}")
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import ensure_directory, tag_distributor_file
+from .web_scraper import WebScraper
+
+
+class DistributorCollector:
+    """여러 총판의 매출 파일을 동시에 다운로드
+
+    총판마다 별도 다운로드 폴더를 쓰는 작업을 최대 Settings.DISTRIBUTOR_CONCURRENCY개까지
+    동시에 실행한다. 드라이버 풀이 있으면 풀에서 로그인된 드라이버를 빌리고, 없으면
+    작업마다 새 드라이버로 로그인한다. HTTP 내보내기(Settings.EXPORT_URL)가 설정되어 있으면
+    한 번 로그인한 세션으로 모든 총판을 먼저 HTTP로 받고, 실패한 총판만 브라우저로 받는다.
+    한 총판의 실패는 다른 총판에 영향을 주지 않으며 총판별 소요 시간과 오류를 결과에 남긴다.
+    """
+
+    def __init__(self, driver_pool=None, max_workers=None):
+        self.logger = get_logger()
+        self.driver_pool = driver_pool
+        self.max_workers = max_workers or Settings.DISTRIBUTOR_CONCURRENCY
+
+    def collect(self, codes=None, start_date=None, end_date=None):
+        """총판별 다운로드 결과 목록 반환 ({'distributor', 'file', 'seconds', 'error'})
+
+        총판이 여러 개면 파일명에 총판 코드를 붙여(Sell_Total2025-06-19_040.xlsx)
+        같은 날짜의 파일이 서로 덮어쓰지 않게 한다.
+        """
+        codes = list(codes or Settings.DISTRIBUTOR_CODES)
+        multiple = len(codes) > 1
+        results = {
+            code: {'distributor': code, 'file': None, 'seconds': 0.0, 'error': None}
+            for code in codes
+        }
+        started = time.monotonic()
+
+        pending = codes
+        if Settings.EXPORT_URL and multiple:
+            pending = self._collect_via_http(codes, results, start_date, end_date)
+
+        if pending:
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='distributor') as executor:
+                for code in pending:
+                    executor.submit(self._collect_one, results[code], start_date, end_date, multiple)
+
+        for result in results.values():
+            status = '성공' if result['file'] else f"실패 ({result['error']})"
+            self.logger.info(f"총판 {result['distributor']} 수집 {status}: {result['seconds']:.1f}초")
+        succeeded = sum(1 for result in results.values() if result['file'])
+        self.logger.info(
+            f"총판 수집 완료: {succeeded}/{len(codes)}개 성공, 전체 {time.monotonic() - started:.1f}초"
+        )
+        return [results[code] for code in codes]
+
+    def _collect_via_http(self, codes, results, start_date, end_date):
+        """한 번의 로그인 세션으로 모든 총판을 HTTP로 동시에 다운로드, 실패한 총판 목록 반환
+
+        드라이버는 동시 다운로드 전에 쿠키를 읽을 때 한 번만 사용하고, 작업 스레드는
+        그 쿠키로 만든 스레드별 requests 세션만 쓴다 (세션과 드라이버를 스레드 간에 공유하지 않음).
+        """
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        start_date, end_date = start_date or yesterday, end_date or yesterday
+        local = threading.local()
+        sessions = []
+        sessions_lock = threading.Lock()
+
+        def session_for_thread(user_agent, cookies):
+            if getattr(local, 'session', None) is None:
+                local.session = WebScraper.build_http_session(user_agent, cookies)
+                with sessions_lock:
+                    sessions.append(local.session)
+            return local.session
+
+        def fetch(scraper, credentials, result):
+            started = time.monotonic()
+            code = result['distributor']
+            try:
+                file_path = scraper.fetch_export_via_http(
+                    start_date, end_date, code,
+                    download_dir=self._download_dir_for(code),
+                    session=session_for_thread(*credentials)
+                )
+                result['file'] = self._tag_file(file_path, code)
+            except Exception as e:
+                self.logger.warning(f"총판 {code} HTTP 내보내기 실패, 브라우저 다운로드로 대체: {str(e)}")
+            result['seconds'] += time.monotonic() - started
+
+        try:
+            with self._borrow_scraper() as scraper:
+                # 모든 요청이 같은 로그인 쿠키를 쓰도록 동시 다운로드 전에 한 번만 읽음
+                credentials = scraper.capture_http_credentials()
+                workers = max(1, min(self.max_workers, len(codes)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='distributor-http') as executor:
+                    for code in codes:
+                        executor.submit(fetch, scraper, credentials, results[code])
+        except Exception as e:
+            self.logger.warning(f"HTTP 내보내기용 로그인 실패: {str(e)}")
+        finally:
+            for session in sessions:
+                session.close()
+
+        return [code for code in codes if not results[code]['file']]
+
+    def _collect_one(self, result, start_date, end_date, multiple):
+        """한 총판 다운로드 (예외는 결과에 기록하고 다른 총판은 계속 진행)"""
+        code = result['distributor']
+        started = time.monotonic()
+        try:
+            download_dir = self._download_dir_for(code) if multiple else None
+            with self._borrow_scraper(download_dir) as scraper:
+                file_path = scraper.download_file(
+                    start_date=start_date, end_date=end_date, distributor_code=code
+                )
+            result['file'] = self._tag_file(file_path, code) if multiple else file_path
+        except Exception as e:
+            result['error'] = str(e)
+            self.logger.error(f"총판 {code} 다운로드 실패: {str(e)}")
+        finally:
+            result['seconds'] += time.monotonic() - started
+
+    @contextmanager
+    def _borrow_scraper(self, download_dir=None):
+        """로그인된 WebScraper 제공 (풀이 있으면 풀에서 대여, download_dir은 사용하는 동안만 적용)"""
+        if self.driver_pool:
+            with self.driver_pool.borrow() as scraper:
+                original_dir = scraper.download_dir
+                if download_dir:
+                    scraper.set_download_dir(download_dir)
+                try:
+                    yield scraper
+                finally:
+                    if download_dir:
+                        scraper.set_download_dir(original_dir)
+        else:
+            with WebScraper(download_dir=download_dir) as scraper:
+                scraper.login()
+                yield scraper
+
+    @staticmethod
+    def _download_dir_for(code):
+        """총판별 다운로드 폴더 (동시에 받는 파일의 감시가 서로 섞이지 않도록 분리)"""
+        download_dir = os.path.join(os.path.abspath(Settings.DOWNLOAD_DIR), f"distributor_{code}")
+        ensure_directory(download_dir)
+        return download_dir
+
+    def _tag_file(self, file_path, code):
+        """다운로드 파일을 총판 코드가 붙은 이름으로 기본 다운로드 폴더에 이동"""
+        return tag_distributor_file(file_path, code, os.path.abspath(Settings.DOWNLOAD_DIR))
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextlib import contextmanager
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from .web_scraper import WebScraper
+
+
+class _PooledScraper:
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """로그인된 Chrome 드라이버(WebScraper)를 재사용하는 풀
+
+    스케줄러/백필 작업이 borrow()로 드라이버를 빌려 쓰고 반납한다. 반납된 드라이버는
+    로그인 상태로 유지되며, 최대 사용 시간/횟수를 넘기거나 상태 확인에 실패하면
+    종료 후 새로 만든다.
+    """
+
+    def __init__(self, size=None, max_age=None, max_uses=None):
+        self.logger = get_logger()
+        self.size = size or Settings.DRIVER_POOL_SIZE
+        self.max_age = max_age if max_age is not None else Settings.DRIVER_MAX_AGE
+        self.max_uses = max_uses if max_uses is not None else Settings.DRIVER_MAX_USES
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    @contextmanager
+    def borrow(self):
+        """로그인된 WebScraper를 빌려 사용"""
+        self._slots.acquire()
+        entry = None
+        try:
+            entry = self._checkout()
+            yield entry.scraper
+        except Exception:
+            # 작업 중 드라이버가 죽었으면 폐기 (다음 대여 때 새로 생성)
+            if entry and not entry.scraper.is_healthy():
+                self.logger.warning("비정상 드라이버 폐기")
+                self._close(entry)
+                entry = None
+            raise
+        finally:
+            if entry:
+                entry.uses += 1
+                with self._lock:
+                    self._idle.append(entry)
+            self._slots.release()
+
+    def _checkout(self):
+        """재사용 가능한 드라이버를 꺼내거나 새로 생성"""
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                break
+
+            age = time.monotonic() - entry.created_at
+            if age > self.max_age or entry.uses >= self.max_uses:
+                self.logger.info(f"드라이버 교체 (사용 {entry.uses}회, {age:.0f}초 경과)")
+                self._close(entry)
+                continue
+
+            if not entry.scraper.is_healthy():
+                self.logger.warning("드라이버 상태 확인 실패 - 새로 생성합니다")
+                self._close(entry)
+                continue
+
+            try:
+                entry.scraper.ensure_logged_in()
+                return entry
+            except Exception as e:
+                self.logger.warning(f"재로그인 실패 - 드라이버를 새로 생성합니다: {str(e)}")
+                self._close(entry)
+
+        return self._create()
+
+    def _create(self):
+        """새 드라이버 생성 및 로그인 (실패 시 Settings.DRIVER_RESTART_ATTEMPTS회 재시도)"""
+        last_error = None
+        for attempt in range(1, Settings.DRIVER_RESTART_ATTEMPTS + 1):
+            scraper = WebScraper()
+            try:
+                scraper.setup_driver()
+                scraper.login()
+                self.logger.info("풀 드라이버 생성 완료")
+                return _PooledScraper(scraper)
+            except Exception as e:
+                last_error = e
+                self.logger.warning(f"풀 드라이버 생성 실패 ({attempt}/{Settings.DRIVER_RESTART_ATTEMPTS}): {str(e)}")
+                scraper.close()
+        raise last_error
+
+    def _close(self, entry):
+        try:
+            entry.scraper.close()
+        except Exception as e:
+            self.logger.warning(f"드라이버 종료 실패: {str(e)}")
+
+    def close_all(self):
+        """대기 중인 모든 드라이버 종료"""
+        with self._lock:
+            entries, self._idle = self._idle, []
+        for entry in entries:
+            self._close(entry)
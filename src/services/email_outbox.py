@@ -0,0 +1,237 @@
+import email
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import ensure_directory
+
+
+class EmailOutbox:
+    """발송할 이메일을 로컬 SQLite 대기열에 저장하고 백그라운드 스레드로 발송
+
+    enqueue()는 메시지를 저장만 하고 바로 반환하므로 SMTP 서버가 느려도 자동화
+    프로세스가 기다리지 않는다. 발송 실패는 지수 백오프로 재시도하고, 같은
+    dedupe_key의 메시지는 한 번만 저장되므로 같은 보고서가 두 번 발송되지 않는다.
+    최종 실패한 메시지는 같은 키로 다시 enqueue()하면 재발송된다.
+    발송 전에 메시지를 'sending' 상태로 가져가므로(claim) 같은 대기열을 쓰는 여러
+    프로세스가 같은 메시지를 함께 발송하지 않는다.
+    """
+
+    def __init__(self, email_sender, path=None, max_attempts=None, backoff_base=None, backoff_max=None,
+                 claim_timeout=None):
+        self.logger = get_logger()
+        self.email_sender = email_sender
+        self.max_attempts = max_attempts or Settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        self.backoff_base = backoff_base if backoff_base is not None else Settings.EMAIL_OUTBOX_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else Settings.EMAIL_OUTBOX_BACKOFF_MAX
+        self.claim_timeout = claim_timeout if claim_timeout is not None else Settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+
+        if path is None:
+            ensure_directory(Settings.STATE_DIR)
+            path = os.path.join(Settings.STATE_DIR, 'email_outbox.sqlite3')
+        self.path = path
+
+        # 작업 스레드와 호출 스레드가 같은 연결을 쓰므로 잠금으로 보호
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, dedupe_key TEXT NOT NULL UNIQUE, "
+            "subject TEXT, recipients TEXT NOT NULL, message TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "next_attempt_at REAL NOT NULL DEFAULT 0, last_error TEXT, "
+            "created_at TEXT NOT NULL, sent_at TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, next_attempt_at)")
+        self.conn.commit()
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        # 발송 스레드 실행 여부와 종료 요청 (스레드가 발송 중이면 연결은 스레드가 끝날 때 닫음)
+        self._running = False
+        self._closing = False
+
+    def enqueue(self, msg, recipients, dedupe_key):
+        """메시지를 대기열에 추가, 이미 같은 키가 있으면 False 반환
+
+        최종 실패('failed')한 키는 새 메시지로 바꿔 다시 대기열에 넣는다
+        (대기 중이거나 발송된 키만 중복으로 본다).
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO outbox (dedupe_key, subject, recipients, message, created_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (dedupe_key) DO UPDATE SET "
+                "subject = excluded.subject, recipients = excluded.recipients, message = excluded.message, "
+                "status = 'pending', attempts = 0, next_attempt_at = 0, last_error = NULL, "
+                "created_at = excluded.created_at "
+                "WHERE outbox.status = 'failed'",
+                (dedupe_key, msg['Subject'], json.dumps(list(recipients), ensure_ascii=False),
+                 msg.as_string(), datetime.now().isoformat(timespec='seconds'))
+            )
+            self.conn.commit()
+
+        if not cursor.rowcount:
+            self.logger.info(f"이미 대기열에 있거나 발송된 이메일, 건너뜀: {dedupe_key}")
+            return False
+
+        self.logger.info(f"이메일 대기열 추가: {dedupe_key}")
+        self._wakeup.set()
+        return True
+
+    def pending_count(self):
+        """아직 발송되지 않은 메시지 수 (발송 중인 메시지 포함)"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+
+    def process_due(self):
+        """발송 시각이 된 메시지를 모두 발송, 다음 재시도까지 남은 시간(초) 반환 (없으면 None)
+
+        'sending' 상태로 가져간 지 claim_timeout초가 지난 메시지(발송 중 종료된 프로세스의 것)도
+        다시 발송 대상으로 본다.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, dedupe_key, recipients, message, attempts FROM outbox "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? ORDER BY id",
+                (time.time(),)
+            ).fetchall()
+
+        for row_id, dedupe_key, recipients, message, attempts in rows:
+            if self._stopping.is_set():
+                break
+            if not self._claim(row_id):
+                continue
+            self._send_one(row_id, dedupe_key, json.loads(recipients), message, attempts)
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def _claim(self, row_id):
+        """메시지를 'sending' 상태로 가져감, 다른 프로세스/스레드가 먼저 가져갔으면 False"""
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE outbox SET status = 'sending', next_attempt_at = ? "
+                "WHERE id = ? AND status IN ('pending', 'sending') AND next_attempt_at <= ?",
+                (now + self.claim_timeout, row_id, now)
+            )
+            self.conn.commit()
+        return cursor.rowcount == 1
+
+    def _send_one(self, row_id, dedupe_key, recipients, message, attempts):
+        try:
+            self.email_sender.connection.send(email.message_from_string(message), recipients)
+        except Exception as e:
+            attempts += 1
+            if attempts >= self.max_attempts:
+                status, delay = 'failed', 0
+                self.logger.error(f"이메일 발송 최종 실패 ({attempts}회 시도): {dedupe_key}: {str(e)}")
+            else:
+                status = 'pending'
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+                self.logger.warning(
+                    f"이메일 발송 실패, {delay:.0f}초 후 재시도 ({attempts}/{self.max_attempts}): "
+                    f"{dedupe_key}: {str(e)}"
+                )
+            with self._lock:
+                self.conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                    "WHERE id = ?",
+                    (status, attempts, time.time() + delay, str(e), row_id)
+                )
+                self.conn.commit()
+            return False
+
+        with self._lock:
+            self.conn.execute(
+                "UPDATE outbox SET status = 'sent', attempts = ?, sent_at = ?, last_error = NULL WHERE id = ?",
+                (attempts + 1, datetime.now().isoformat(timespec='seconds'), row_id)
+            )
+            self.conn.commit()
+        self.logger.info(f"이메일 발송 완료: {dedupe_key} ({len(recipients)}명)")
+        return True
+
+    def start(self):
+        """백그라운드 발송 스레드 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                try:
+                    wait = self.process_due()
+                except Exception as e:
+                    self.logger.error(f"이메일 대기열 처리 실패: {str(e)}")
+                    wait = self.backoff_base
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+        finally:
+            with self._lock:
+                self._running = False
+                if self._closing:
+                    self._close_connection()
+
+    def drain(self, timeout=None):
+        """대기 중인 메시지를 timeout초 안에서 발송 (재시도 대기 포함), 남은 메시지 수 반환"""
+        timeout = Settings.EMAIL_OUTBOX_DRAIN_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while self.pending_count():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._thread is not None and self._thread.is_alive():
+                self._wakeup.set()
+                time.sleep(min(0.2, remaining))
+            else:
+                wait = self.process_due()
+                if wait:
+                    time.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+
+        left = self.pending_count()
+        if left:
+            self.logger.warning(f"발송하지 못한 이메일 {left}건이 대기열에 남아 있습니다 (다음 실행 시 발송)")
+        return left
+
+    def stop(self, drain=True, timeout=None):
+        """대기열을 비우고(drain=True) 발송 스레드 종료"""
+        if drain:
+            self.drain(timeout)
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=Settings.SMTP_TIMEOUT)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def close(self):
+        """발송 스레드를 멈추고 연결 종료 (스레드가 아직 발송 중이면 스레드가 끝날 때 닫음)"""
+        self.stop(drain=False)
+        with self._lock:
+            self._closing = True
+            if self._running:
+                self.logger.warning("이메일 발송 스레드가 아직 발송 중이라 발송이 끝난 뒤 연결을 닫습니다")
+                return
+            self._close_connection()
+
+    def _close_connection(self):
+        """연결 종료 (호출하는 쪽에서 잠금을 잡고 있어야 함)"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
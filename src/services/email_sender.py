@@ -1,4 +1,6 @@
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -6,39 +8,160 @@ from email import encoders
 from ..config.settings import Settings
 from ..utils.logger import get_logger
 
+class SMTPConnection:
+    """인증된 SMTP 세션 하나를 유지하며 재사용하는 연결 관리자
+
+    처음 보낼 때 연결/STARTTLS/로그인을 한 번만 하고, 이후 메시지는 같은 세션으로
+    보낸다. 오래 쉬었던 연결은 NOOP으로 확인하고, 서버가 연결을 끊었으면 다시 연결해
+    해당 메시지를 한 번 더 보낸다.
+    """
+
+    def __init__(self, host=None, port=None, use_tls=None, username=None, password=None,
+                 timeout=None, idle_check_seconds=None):
+        self.logger = get_logger()
+        self.host = host or Settings.SMTP_SERVER
+        self.port = port or Settings.SMTP_PORT
+        self.use_tls = Settings.SMTP_USE_TLS if use_tls is None else use_tls
+        self.username = Settings.EMAIL_SENDER if username is None else username
+        self.password = Settings.EMAIL_PASSWORD if password is None else password
+        self.timeout = timeout or Settings.SMTP_TIMEOUT
+        self.idle_check_seconds = (
+            Settings.SMTP_IDLE_CHECK_SECONDS if idle_check_seconds is None else idle_check_seconds
+        )
+        self.server = None
+        self.connect_count = 0
+        self._last_used = 0.0
+        self._lock = threading.RLock()
+    
+    def connect(self):
+        """SMTP 서버 연결 및 로그인 (비밀번호가 없으면 로그인 생략)"""
+        with self._lock:
+            self.close()
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                if self.password:
+                    server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            
+            self.server = server
+            self.connect_count += 1
+            self._last_used = time.monotonic()
+            self.logger.info(f"SMTP 연결: {self.host}:{self.port}")
+            return server
+    
+    def ensure_connected(self, check=False):
+        """연결되어 있지 않거나 끊긴 연결이면 다시 연결"""
+        with self._lock:
+            if self.server is None:
+                return self.connect()
+            
+            idle = time.monotonic() - self._last_used
+            if check or idle >= self.idle_check_seconds:
+                try:
+                    status, _ = self.server.noop()
+                except (smtplib.SMTPException, OSError):
+                    status = None
+                if status != 250:
+                    self.logger.info("SMTP 연결이 끊어져 다시 연결합니다")
+                    return self.connect()
+                self._last_used = time.monotonic()
+            
+            return self.server
+    
+    def send(self, msg, recipients):
+        """메시지 발송 (연결이 끊겼으면 다시 연결해 한 번 재시도)"""
+        with self._lock:
+            from_addr = msg['From'] or self.username
+            text = msg.as_string()
+            
+            for attempt in range(2):
+                server = self.ensure_connected()
+                try:
+                    result = server.sendmail(from_addr, recipients, text)
+                    self._last_used = time.monotonic()
+                    return result
+                except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                    self._discard()
+                    if attempt:
+                        raise
+                    self.logger.warning(f"SMTP 연결 끊김, 다시 연결 후 재발송: {str(e)}")
+    
+    def _discard(self):
+        """끊긴 연결 정리 (QUIT 없이 소켓만 닫음)"""
+        if self.server is not None:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+            self.server = None
+    
+    def close(self):
+        """SMTP 세션 종료"""
+        with self._lock:
+            if self.server is not None:
+                try:
+                    self.server.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._discard()
+    
+    def __enter__(self):
+        self.ensure_connected()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 class EmailSender:
-    def __init__(self):
+    def __init__(self, connection=None):
         self.logger = get_logger()
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.connection = connection or SMTPConnection()
+        self.smtp_server = self.connection.host
+        self.smtp_port = self.connection.port
+        self.last_batch_failures = []
     
-    def send_email(self, subject, content, recipients=None, attachments=None):
-        """이메일 발송"""
-        try:
-            if recipients is None:
-                recipients = Settings.EMAIL_RECIPIENTS
-            
-            # 이메일 메시지 생성
+    def build_message(self, subject, content=None, recipients=None, attachments=None, html_content=None):
+        """이메일 메시지 생성, (메시지, 수신자 목록) 반환
+        
+        content만 있으면 텍스트, html_content만 있으면 HTML, 둘 다 있으면
+        텍스트/HTML을 함께 담은 메시지를 만든다.
+        """
+        if recipients is None:
+            recipients = Settings.EMAIL_RECIPIENTS
+        
+        if content is not None and html_content is not None:
+            msg = MIMEMultipart('mixed')
+            body = MIMEMultipart('alternative')
+            body.attach(MIMEText(content, 'plain', 'utf-8'))
+            body.attach(MIMEText(html_content, 'html', 'utf-8'))
+            msg.attach(body)
+        elif html_content is not None:
+            msg = MIMEMultipart('alternative')
+            msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+        else:
             msg = MIMEMultipart()
-            msg['From'] = Settings.EMAIL_SENDER
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-            
-            # 본문 추가
-            msg.attach(MIMEText(content, 'plain', 'utf-8'))
-            
-            # 첨부파일 추가
-            if attachments:
-                for file_path in attachments:
-                    self._attach_file(msg, file_path)
-            
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(Settings.EMAIL_SENDER, Settings.EMAIL_PASSWORD)
-                
-                text = msg.as_string()
-                server.sendmail(Settings.EMAIL_SENDER, recipients, text)
+            msg.attach(MIMEText(content or '', 'plain', 'utf-8'))
+        
+        msg['From'] = Settings.EMAIL_SENDER
+        msg['To'] = ', '.join(recipients)
+        msg['Subject'] = subject
+        
+        # 첨부파일 추가
+        if attachments:
+            for file_path in attachments:
+                self._attach_file(msg, file_path)
+        
+        return msg, recipients
+    
+    def send_email(self, subject, content, recipients=None, attachments=None, html_content=None):
+        """이메일 발송 (html_content를 주면 텍스트/HTML을 한 메시지로 발송)"""
+        try:
+            msg, recipients = self.build_message(subject, content, recipients, attachments, html_content)
+            self.connection.send(msg, recipients)
             
             self.logger.info(f"이메일 발송 완료: {len(recipients)}명에게 발송")
             return True
@@ -47,6 +170,34 @@ class EmailSender:
             self.logger.error(f"이메일 발송 실패: {str(e)}")
             raise
     
+    def send_batch(self, messages):
+        """여러 메시지를 하나의 SMTP 세션으로 발송, 발송한 메시지 수 반환
+        
+        messages: (메시지, 수신자 목록) 튜플 또는 build_message 인자 dict 목록
+        한 메시지가 실패해도 나머지는 계속 보내고 실패 목록은 last_batch_failures에 남긴다.
+        """
+        sent = 0
+        self.last_batch_failures = []
+        
+        for item in messages:
+            subject = item.get('subject') if isinstance(item, dict) else item[0]['Subject']
+            try:
+                if isinstance(item, dict):
+                    msg, recipients = self.build_message(**item)
+                else:
+                    msg, recipients = item
+                self.connection.send(msg, recipients)
+                sent += 1
+            except Exception as e:
+                self.logger.error(f"이메일 발송 실패 ({subject}): {str(e)}")
+                self.last_batch_failures.append((item, str(e)))
+        
+        self.logger.info(
+            f"이메일 일괄 발송 완료: {sent}건 발송, {len(self.last_batch_failures)}건 실패 "
+            f"(SMTP 연결 {self.connection.connect_count}회)"
+        )
+        return sent
+    
     def _attach_file(self, msg, file_path):
         """파일 첨부"""
         try:
@@ -69,31 +220,10 @@ class EmailSender:
     def send_html_email(self, subject, html_content, recipients=None, attachments=None):
         """HTML 이메일 발송"""
         try:
-            if recipients is None:
-                recipients = Settings.EMAIL_RECIPIENTS
-            
-            # 이메일 메시지 생성
-            msg = MIMEMultipart('alternative')
-            msg['From'] = Settings.EMAIL_SENDER
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-            
-            # HTML 본문 추가
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            # 첨부파일 추가
-            if attachments:
-                for file_path in attachments:
-                    self._attach_file(msg, file_path)
-            
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(Settings.EMAIL_SENDER, Settings.EMAIL_PASSWORD)
-                
-                text = msg.as_string()
-                server.sendmail(Settings.EMAIL_SENDER, recipients, text)
+            msg, recipients = self.build_message(
+                subject, recipients=recipients, attachments=attachments, html_content=html_content
+            )
+            self.connection.send(msg, recipients)
             
             self.logger.info(f"HTML 이메일 발송 완료: {len(recipients)}명에게 발송")
             return True
@@ -103,15 +233,17 @@ class EmailSender:
             raise
     
     def test_connection(self):
-        """이메일 연결 테스트"""
+        """이메일 연결 테스트 (성공한 연결은 이후 발송에 재사용)"""
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(Settings.EMAIL_SENDER, Settings.EMAIL_PASSWORD)
+            self.connection.ensure_connected(check=True)
             
             self.logger.info("이메일 연결 테스트 성공")
             return True
             
         except Exception as e:
             self.logger.error(f"이메일 연결 테스트 실패: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def close(self):
+        """SMTP 세션 종료"""
+        self.connection.close()
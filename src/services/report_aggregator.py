@@ -0,0 +1,152 @@
+import re
+from datetime import datetime, timedelta
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import format_currency
+from ..utils.dedupe import normalize_cell_value
+
+TABLE1_HEADER = ['구분', '매출액', '판매 수']
+TABLE1_MAX_ROWS = 20  # table1!A1:C20
+
+
+def _comparable(value):
+    """시트 값과 로컬 값을 비교하기 위한 정규화 ("1,000원" -> "1000")"""
+    text = normalize_cell_value(value)
+    try:
+        return normalize_cell_value(float(re.sub(r'[,\s원개건]', '', text)))
+    except ValueError:
+        return text
+
+
+class ReportAggregator:
+    """이메일 보고서용 table1 총계와 월 누적 매출을 로컬에서 계산
+
+    시트 수식 재계산이나 table1/table2 조회 없이 처리된 데이터 요약과
+    로컬 매출 저장소(SalesWarehouse)로 같은 값을 만든다. 필요하면 결과를
+    시트에 다시 기록하고, 검증 모드에서는 시트 수식 결과와 비교한다.
+    """
+
+    def __init__(self, warehouse=None, spreadsheet_handler=None, running_totals=None):
+        self.logger = get_logger()
+        self.warehouse = warehouse
+        self.spreadsheet_handler = spreadsheet_handler
+        self.running_totals = running_totals
+
+    def compute_table1(self, summary_data):
+        """자판기별 매출/판매 수와 합계 (table1!A1:C20 형태)"""
+        rows = [list(TABLE1_HEADER)]
+        machines = sorted(
+            (summary_data.get('by_machine') or {}).items(),
+            key=lambda item: item[1]['sales'],
+            reverse=True
+        )
+        for name, totals in machines[:TABLE1_MAX_ROWS - 2]:
+            rows.append([str(name), format_currency(totals['sales']), f"{totals['items']:,}"])
+
+        rows.append([
+            '합계',
+            format_currency(summary_data.get('total_sales', 0)),
+            f"{summary_data.get('total_items', 0):,}"
+        ])
+        return rows
+
+    def compute_monthly(self, month=None, until_date=None):
+        """월 누적 매출 ([월, 금액] 형태, table2 행과 동일)
+
+        로컬 저장소에 월초부터 빠진 날짜가 있으면 None을 반환해 시트 값을 쓰게 한다.
+        """
+        month = month or datetime.now().strftime('%Y-%m')
+
+        # 증분 누적값이 있으면 한 행만 조회, 특정 날짜까지의 누적은 저장소에서 계산
+        if self.running_totals is not None and until_date is None:
+            source = self.running_totals
+        elif self.warehouse is not None:
+            source = self.warehouse
+        else:
+            return None
+        if not self.is_month_covered(source, month, until_date):
+            return None
+
+        if source is self.running_totals:
+            sales, items = self.running_totals.month_to_date(month)
+        else:
+            sales, items = self.warehouse.month_to_date(month, until_date)
+        if not items:
+            return None
+        return [month, format_currency(sales)]
+
+    def is_month_covered(self, source, month, until_date=None):
+        """source(누적 집계 또는 매출 저장소)에 월초부터 until_date까지 모든 날짜가 있는지 확인
+
+        로컬 저장소에는 배포 이후 처리한 날짜만 있으므로 빠진 날짜가 있으면 월 누적이
+        시트보다 작게 나온다. until_date를 주지 않으면 어제(해당 월 말일 이전)까지 확인한다.
+        """
+        first_day = datetime.strptime(f"{month}-01", '%Y-%m-%d').date()
+        last_day = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        if until_date:
+            end_day = datetime.strptime(until_date, '%Y-%m-%d').date()
+        else:
+            end_day = datetime.now().date() - timedelta(days=1)
+        end_day = min(end_day, last_day)
+        if end_day < first_day:
+            return False
+
+        covered = source.covered_dates(month)
+        missing = [
+            day for day in (first_day + timedelta(days=i) for i in range((end_day - first_day).days + 1))
+            if day.strftime('%Y-%m-%d') not in covered
+        ]
+        if missing:
+            self.logger.info(
+                f"로컬 집계에 {month} 중 {len(missing)}일이 없어 시트 값을 사용합니다 (첫 누락일: {missing[0]})"
+            )
+            return False
+        return True
+
+    def compute(self, summary_data, month=None):
+        """(table1, 월 누적) 계산"""
+        return self.compute_table1(summary_data), self.compute_monthly(month)
+
+    def write_back(self, table1_data, monthly_data):
+        """계산 결과를 설정된 시트 범위에 기록 (수식 영역은 덮어쓰지 않도록 별도 범위 사용)"""
+        if not self.spreadsheet_handler:
+            return False
+
+        if Settings.REPORT_TABLE1_WRITEBACK_RANGE:
+            sheet_name, cell_range = Settings.REPORT_TABLE1_WRITEBACK_RANGE.split('!', 1)
+            self.spreadsheet_handler.update_cell(sheet_name, cell_range, table1_data)
+        if Settings.REPORT_MONTHLY_WRITEBACK_RANGE and monthly_data:
+            sheet_name, cell_range = Settings.REPORT_MONTHLY_WRITEBACK_RANGE.split('!', 1)
+            self.spreadsheet_handler.update_cell(sheet_name, cell_range, [monthly_data])
+        return True
+
+    def verify(self, table1_data, monthly_data, sheet_table1=None, sheet_monthly=None):
+        """로컬 계산 결과와 시트 수식 결과 비교, 차이 목록 반환 (시트 값을 주지 않으면 조회)"""
+        differences = []
+        if sheet_table1 is None and sheet_monthly is None:
+            if not self.spreadsheet_handler:
+                return differences
+            sheet_table1 = self.spreadsheet_handler.get_table1_data()
+            sheet_monthly = self.spreadsheet_handler.get_table2_monthly_data()
+        sheet_table1 = sheet_table1 or []
+
+        for i in range(max(len(table1_data), len(sheet_table1))):
+            local_row = table1_data[i] if i < len(table1_data) else []
+            sheet_row = sheet_table1[i] if i < len(sheet_table1) else []
+            for j in range(max(len(local_row), len(sheet_row))):
+                local_value = local_row[j] if j < len(local_row) else ''
+                sheet_value = sheet_row[j] if j < len(sheet_row) else ''
+                if _comparable(local_value) != _comparable(sheet_value):
+                    differences.append((f"table1!{chr(ord('A') + j)}{i + 1}", local_value, sheet_value))
+
+        local_monthly = (monthly_data or [])[:2]
+        remote_monthly = (sheet_monthly or [])[:2]
+        if [_comparable(v) for v in local_monthly] != [_comparable(v) for v in remote_monthly]:
+            differences.append(('table2 월 누적', local_monthly, remote_monthly))
+
+        if differences:
+            for cell, local_value, sheet_value in differences:
+                self.logger.warning(f"로컬/시트 집계 불일치 {cell}: 로컬={local_value}, 시트={sheet_value}")
+        else:
+            self.logger.info("로컬 집계와 시트 수식 결과 일치")
+        return differences
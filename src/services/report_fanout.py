@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import format_currency, get_report_date
+from ..utils.summary import compute_filtered_summaries
+from ..utils.email_templates import render_report_html
+from .report_aggregator import ReportAggregator
+
+
+def parse_recipient_filters(value):
+    """수신자별 필터 설정(JSON) 파싱 ({수신자: {역할: [값, ...]}}), 비어 있으면 {}"""
+    if not value:
+        return {}
+    filters = json.loads(value) if isinstance(value, str) else value
+    if not isinstance(filters, dict):
+        raise ValueError("EMAIL_RECIPIENT_FILTERS는 {수신자: {역할: [값]}} 형태여야 합니다")
+    return {
+        recipient.strip(): {
+            role: [str(v) for v in (values if isinstance(values, list) else [values])]
+            for role, values in (criteria or {}).items()
+        }
+        for recipient, criteria in filters.items()
+        if recipient.strip()
+    }
+
+
+class ReportFanout:
+    """수신자별 맞춤 보고서 발송
+
+    처리된 DataFrame에서 모든 수신자의 필터 요약을 한 번의 group-by로 계산하고
+    (수신자마다 파일을 다시 처리하지 않음), 수신자별 메시지를 만들어 발송 대기열 또는
+    하나의 SMTP 세션으로 보낸다.
+    """
+
+    def __init__(self, data_processor, email_sender, email_outbox=None, running_totals=None):
+        self.logger = get_logger()
+        self.data_processor = data_processor
+        self.email_sender = email_sender
+        self.email_outbox = email_outbox
+        self.running_totals = running_totals
+        self.aggregator = ReportAggregator(running_totals=running_totals)
+        self.handled = []
+
+    def build_messages(self, df, filters, report_date=None):
+        """수신자별 (메시지, 수신자 목록, 중복 방지 키) 목록 생성 (데이터가 없는 수신자는 제외)
+
+        중복 방지 키는 보고서 기준 날짜(report_date, 기본값: 어제)와 수신자로 만든다.
+        """
+        report_date = report_date or get_report_date()
+        summaries = compute_filtered_summaries(
+            df, filters, constants={'distributor': Settings.DISTRIBUTOR_CODE}
+        )
+
+        messages = []
+        for recipient, summary in summaries.items():
+            if not summary['total_items']:
+                self.logger.info(f"맞춤 보고서 대상 데이터 없음, 건너뜀: {recipient}")
+                continue
+
+            table1_data = self.aggregator.compute_table1(summary)
+            monthly_data = self._monthly_for(filters[recipient])
+            content = self.data_processor.create_email_content(summary, table1_data, monthly_data)
+            html_content = (
+                render_report_html(summary, table1_data, monthly_data) if Settings.EMAIL_HTML_ENABLED else None
+            )
+
+            msg, recipients = self.email_sender.build_message(
+                Settings.EMAIL_SUBJECT, content, [recipient], html_content=html_content
+            )
+            messages.append((msg, recipients, f"daily-report:{report_date}:{recipient}"))
+        return messages
+
+    def _monthly_for(self, criteria):
+        """자판기/총판 필터만 있는 수신자의 월 누적 매출 (누적 집계가 없거나 불완전하거나 다른 필터면 None)"""
+        if self.running_totals is None or not criteria or not set(criteria) <= {'machine', 'distributor'}:
+            return None
+        month = datetime.now().strftime('%Y-%m')
+        if not self.aggregator.is_month_covered(self.running_totals, month):
+            return None
+        sales, _ = self.running_totals.filtered_month_to_date(
+            month, criteria.get('machine'), criteria.get('distributor')
+        )
+        return [month, format_currency(sales)] if sales else None
+
+    def send(self, df, filters, report_date=None):
+        """맞춤 보고서 발송 (대기열이 있으면 추가만 함), 발송/추가한 메시지 수 반환
+
+        처리를 마친 수신자(데이터가 없어 건너뛴 수신자 포함)는 handled에 기록하므로
+        도중에 예외가 나면 호출하는 쪽에서 나머지 수신자만 골라 대체 발송할 수 있다.
+        """
+        self.handled = []
+        messages = self.build_messages(df, filters, report_date)
+        with_messages = {recipient for _, recipients, _ in messages for recipient in recipients}
+        self.handled.extend(recipient for recipient in filters if recipient not in with_messages)
+
+        if self.email_outbox:
+            count = 0
+            for msg, recipients, dedupe_key in messages:
+                if self.email_outbox.enqueue(msg, recipients, dedupe_key):
+                    count += 1
+                self.handled.extend(recipients)
+        else:
+            count = self.email_sender.send_batch([(msg, recipients) for msg, recipients, _ in messages])
+            self.handled.extend(with_messages)
+
+        self.logger.info(f"맞춤 보고서 {count}/{len(filters)}건 발송 요청 완료")
+        return count
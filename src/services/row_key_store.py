@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import ensure_directory
+
+
+class RowKeyStore:
+    """main 시트에 이미 기록된 행 키를 로컬 SQLite에 보관하는 사이드카 저장소
+
+    행 키/서명, 마지막 행 번호, 시트 리비전(Drive 파일 version)을 저장해
+    시트가 외부에서 수정되지 않았다면 시트를 다시 내려받지 않고 중복을 확인한다.
+    """
+
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, sheet_id, key_spec='', path=None):
+        self.logger = get_logger()
+        self.sheet_id = str(sheet_id)
+        self.key_spec = key_spec or ''
+
+        if path is None:
+            ensure_directory(Settings.STATE_DIR)
+            path = os.path.join(Settings.STATE_DIR, 'row_keys.sqlite3')
+        self.path = path
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS row_keys ("
+            "sheet_id TEXT NOT NULL, key TEXT NOT NULL, signature TEXT NOT NULL, "
+            "row_number INTEGER NOT NULL, PRIMARY KEY (sheet_id, key))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "sheet_id TEXT NOT NULL, name TEXT NOT NULL, value TEXT, "
+            "PRIMARY KEY (sheet_id, name))"
+        )
+        self.conn.commit()
+
+        # 키 컬럼 설정이 바뀌면 저장된 키는 더 이상 유효하지 않음
+        if self.get_meta('key_spec') != self.key_spec:
+            self.reset()
+
+    def get_meta(self, name, default=None):
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE sheet_id = ? AND name = ?",
+            (self.sheet_id, name)
+        ).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, name, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (sheet_id, name, value) VALUES (?, ?, ?)",
+            (self.sheet_id, name, None if value is None else str(value))
+        )
+
+    @property
+    def last_row(self):
+        """마지막으로 확인된 데이터 행 번호 (1부터, 헤더 포함)"""
+        return int(self.get_meta('last_row', 0))
+
+    @property
+    def revision(self):
+        return self.get_meta('revision')
+
+    @property
+    def last_signature(self):
+        value = self.get_meta('last_signature')
+        return tuple(json.loads(value)) if value else None
+
+    @property
+    def formatted_through(self):
+        """H열 서식이 적용된 마지막 행 번호"""
+        return int(self.get_meta('formatted_through', 0))
+
+    def set_formatted_through(self, row):
+        self.set_meta('formatted_through', row)
+        self.conn.commit()
+
+    def is_fresh(self, revision):
+        """저장된 리비전과 현재 시트 리비전이 같은지 확인"""
+        return revision is not None and self.last_row > 0 and self.revision == str(revision)
+
+    def reset(self):
+        """저장된 키와 메타데이터 초기화"""
+        self.conn.execute("DELETE FROM row_keys WHERE sheet_id = ?", (self.sheet_id,))
+        self.conn.execute("DELETE FROM meta WHERE sheet_id = ?", (self.sheet_id,))
+        self.set_meta('key_spec', self.key_spec)
+        self.conn.commit()
+
+    def record(self, entries, last_row, last_signature, revision=None):
+        """행 키 기록
+
+        entries: (key, signature, row_number) 목록
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO row_keys (sheet_id, key, signature, row_number) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (self.sheet_id, json.dumps(list(key), ensure_ascii=False),
+                 json.dumps(list(signature), ensure_ascii=False), row_number)
+                for key, signature, row_number in entries
+            ]
+        )
+        self.set_meta('last_row', last_row)
+        if last_signature is not None:
+            self.set_meta('last_signature', json.dumps(list(last_signature), ensure_ascii=False))
+        self.set_meta('revision', revision)
+        self.conn.commit()
+
+    def set_revision(self, revision):
+        self.set_meta('revision', revision)
+        self.conn.commit()
+
+    def lookup(self, keys):
+        """주어진 키 중 저장소에 있는 키의 서명 반환 (key -> signature)"""
+        encoded = {json.dumps(list(key), ensure_ascii=False): key for key in keys}
+        found = {}
+        names = list(encoded)
+        for i in range(0, len(names), self._LOOKUP_CHUNK):
+            chunk = names[i:i + self._LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, signature FROM row_keys WHERE sheet_id = ? AND key IN ({placeholders})",
+                [self.sheet_id] + chunk
+            ).fetchall()
+            for key, signature in rows:
+                found[encoded[key]] = tuple(json.loads(signature))
+        return found
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,218 @@
+import os
+import sqlite3
+import pandas as pd
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import (
+    ensure_directory, resolve_column_roles, extract_date_from_filename, extract_distributor_from_filename
+)
+from ..utils.summary import parse_number_series
+
+ALL_MACHINES = '*'
+
+
+class RunningTotals:
+    """월별/자판기별 매출 누적값을 유지하는 증분 집계 저장소
+
+    하루치 집계를 적용할 때 같은 (날짜, 총판)으로 이전에 적용한 값을 빼고 새 값을
+    더하므로 같은 날짜를 여러 번 적용해도 결과가 같고, 여러 총판의 같은 날짜 파일은
+    서로의 값을 덮어쓰지 않고 합산된다. 월 누적 조회는 누적 테이블 한 행만 읽으므로
+    이력 길이와 무관하다.
+    """
+
+    def __init__(self, path=None):
+        self.logger = get_logger()
+        if path is None:
+            ensure_directory(Settings.STATE_DIR)
+            path = os.path.join(Settings.STATE_DIR, 'running_totals.sqlite3')
+        self.path = path
+
+        self.conn = sqlite3.connect(self.path)
+        self._migrate_daily_contrib()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_contrib ("
+            "sale_date TEXT NOT NULL, distributor TEXT NOT NULL, machine TEXT NOT NULL, "
+            "sales REAL NOT NULL, items INTEGER NOT NULL, PRIMARY KEY (sale_date, distributor, machine))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS month_totals ("
+            "month TEXT NOT NULL, machine TEXT NOT NULL, sales REAL NOT NULL, "
+            "items INTEGER NOT NULL, PRIMARY KEY (month, machine))"
+        )
+        self.conn.commit()
+
+    def _migrate_daily_contrib(self):
+        """총판 컬럼이 없던 이전 daily_contrib 테이블을 기본 총판 값으로 변환"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(daily_contrib)")]
+        if not columns or 'distributor' in columns:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE daily_contrib RENAME TO daily_contrib_old")
+            self.conn.execute(
+                "CREATE TABLE daily_contrib ("
+                "sale_date TEXT NOT NULL, distributor TEXT NOT NULL, machine TEXT NOT NULL, "
+                "sales REAL NOT NULL, items INTEGER NOT NULL, PRIMARY KEY (sale_date, distributor, machine))"
+            )
+            self.conn.execute(
+                "INSERT INTO daily_contrib (sale_date, distributor, machine, sales, items) "
+                "SELECT sale_date, ?, machine, sales, items FROM daily_contrib_old",
+                (Settings.DISTRIBUTOR_CODE,)
+            )
+            self.conn.execute("DROP TABLE daily_contrib_old")
+        self.logger.info("월 누적 집계 저장소를 총판별 구조로 변환했습니다")
+
+    @staticmethod
+    def daily_breakdown(df, source_file=None):
+        """DataFrame을 날짜/자판기별 매출·건수로 집계 ({날짜: {자판기: {'sales', 'items'}}})"""
+        roles = resolve_column_roles(df.columns)
+
+        if 'timestamp' in roles:
+            dates = pd.to_datetime(df[roles['timestamp']], errors='coerce').dt.strftime('%Y-%m-%d')
+        else:
+            file_date = extract_date_from_filename(os.path.basename(source_file or ''))
+            if not file_date:
+                raise ValueError("날짜 정보를 찾을 수 없습니다")
+            dates = pd.Series(file_date, index=df.index)
+
+        machines = df[roles['machine']].astype(str) if 'machine' in roles else pd.Series('', index=df.index)
+        sales = (
+            parse_number_series(df[roles['amount']]).fillna(0)
+            if 'amount' in roles else pd.Series(0, index=df.index)
+        )
+
+        frame = pd.DataFrame({'date': dates, 'machine': machines, 'sales': sales}).dropna(subset=['date'])
+        grouped = frame.groupby(['date', 'machine']).agg(sales=('sales', 'sum'), items=('sales', 'size'))
+
+        breakdown = {}
+        for (sale_date, machine), row in grouped.iterrows():
+            breakdown.setdefault(sale_date, {})[machine] = {
+                'sales': float(row['sales']),
+                'items': int(row['items'])
+            }
+        return breakdown
+
+    def apply_day(self, sale_date, by_machine, distributor=None, commit=True):
+        """한 총판의 하루치 자판기별 집계 적용 (같은 날짜/총판을 다시 적용하면 이전 값을 대체)"""
+        month = sale_date[:7]
+        distributor = str(distributor or Settings.DISTRIBUTOR_CODE)
+
+        previous = self.conn.execute(
+            "SELECT machine, sales, items FROM daily_contrib WHERE sale_date = ? AND distributor = ?",
+            (sale_date, distributor)
+        ).fetchall()
+        for machine, sales, items in previous:
+            self._add(month, machine, -sales, -items)
+            self._add(month, ALL_MACHINES, -sales, -items)
+        self.conn.execute(
+            "DELETE FROM daily_contrib WHERE sale_date = ? AND distributor = ?", (sale_date, distributor)
+        )
+
+        for machine, totals in by_machine.items():
+            sales, items = float(totals['sales']), int(totals['items'])
+            self.conn.execute(
+                "INSERT INTO daily_contrib (sale_date, distributor, machine, sales, items) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (sale_date, distributor, str(machine), sales, items)
+            )
+            self._add(month, str(machine), sales, items)
+            self._add(month, ALL_MACHINES, sales, items)
+
+        if commit:
+            self.conn.commit()
+
+    def apply_dataframe(self, df, source_file=None, distributor=None):
+        """처리된 DataFrame의 날짜별 집계 적용, 적용한 날짜 목록 반환
+
+        총판은 distributor, 파일명의 총판 코드(Sell_Total2025-06-19_040.xlsx),
+        Settings.DISTRIBUTOR_CODE 순으로 정한다.
+        """
+        distributor = distributor or extract_distributor_from_filename(source_file, Settings.DISTRIBUTOR_CODE)
+        breakdown = self.daily_breakdown(df, source_file)
+        with self.conn:
+            for sale_date, by_machine in breakdown.items():
+                self.apply_day(sale_date, by_machine, distributor, commit=False)
+        self.logger.info(f"월 누적 집계 갱신 (총판 {distributor}): {', '.join(sorted(breakdown))}")
+        return sorted(breakdown)
+
+    def _add(self, month, machine, sales, items):
+        self.conn.execute(
+            "INSERT INTO month_totals (month, machine, sales, items) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (month, machine) DO UPDATE SET "
+            "sales = sales + excluded.sales, items = items + excluded.items",
+            (month, machine, sales, items)
+        )
+
+    def month_to_date(self, month):
+        """월 누적 매출/건수"""
+        row = self.conn.execute(
+            "SELECT sales, items FROM month_totals WHERE month = ? AND machine = ?",
+            (month, ALL_MACHINES)
+        ).fetchone()
+        return row if row else (0, 0)
+
+    def filtered_month_to_date(self, month, machines=None, distributors=None):
+        """자판기/총판 목록으로 거른 월 누적 매출/건수 (목록을 주지 않은 조건은 전체)"""
+        sql = "SELECT COALESCE(SUM(sales), 0), COALESCE(SUM(items), 0) FROM daily_contrib WHERE substr(sale_date, 1, 7) = ?"
+        params = [month]
+        for column, values in (('machine', machines), ('distributor', distributors)):
+            if values:
+                values = [str(value) for value in values]
+                sql += f" AND {column} IN ({', '.join('?' * len(values))})"
+                params.extend(values)
+        return tuple(self.conn.execute(sql, params).fetchone())
+
+    def covered_dates(self, month):
+        """해당 월에 집계가 적용된 날짜 집합"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT sale_date FROM daily_contrib WHERE substr(sale_date, 1, 7) = ?", (month,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def machine_totals(self, month):
+        """월 자판기별 누적 매출/건수 ({자판기: (매출, 건수)})"""
+        rows = self.conn.execute(
+            "SELECT machine, sales, items FROM month_totals WHERE month = ? AND machine != ? "
+            "ORDER BY sales DESC",
+            (month, ALL_MACHINES)
+        ).fetchall()
+        return {machine: (sales, items) for machine, sales, items in rows}
+
+    def rebuild(self, warehouse, months=None):
+        """로컬 매출 저장소에서 누적값을 다시 계산 (months를 주면 해당 월만)"""
+        sql = (
+            "SELECT sale_date, distributor, COALESCE(machine, ''), SUM(COALESCE(amount, 0)), COUNT(*) "
+            "FROM sales WHERE sale_date IS NOT NULL"
+        )
+        params = []
+        if months:
+            sql += f" AND month IN ({','.join('?' * len(months))})"
+            params.extend(months)
+        sql += " GROUP BY sale_date, distributor, COALESCE(machine, '')"
+
+        # {(날짜, 총판): {자판기: 집계}}
+        breakdown = {}
+        for sale_date, distributor, machine, sales, items in warehouse.conn.execute(sql, params):
+            breakdown.setdefault((sale_date, distributor), {})[machine] = {'sales': sales, 'items': items}
+
+        with self.conn:
+            if months:
+                placeholders = ','.join('?' * len(months))
+                self.conn.execute(
+                    f"DELETE FROM daily_contrib WHERE substr(sale_date, 1, 7) IN ({placeholders})", months
+                )
+                self.conn.execute(f"DELETE FROM month_totals WHERE month IN ({placeholders})", months)
+            else:
+                self.conn.execute("DELETE FROM daily_contrib")
+                self.conn.execute("DELETE FROM month_totals")
+
+            for (sale_date, distributor), by_machine in breakdown.items():
+                self.apply_day(sale_date, by_machine, distributor, commit=False)
+
+        days = len({sale_date for sale_date, _ in breakdown})
+        self.logger.info(f"월 누적 집계 재구성 완료: {days}일")
+        return days
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import pandas as pd
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import (
+    ensure_directory, resolve_column_roles, extract_date_from_filename, extract_distributor_from_filename
+)
+from ..utils.summary import parse_number_series
+
+
+class SalesWarehouse:
+    """처리된 매출 데이터를 보관하는 로컬 SQLite 저장소
+
+    Sell_Total 파일을 처리할 때마다 행을 (월, 일자) 인덱스가 있는 sales 테이블에
+    적재한다. 적재할 때 같은 총판의 같은 기간 행을 교체하므로 재실행하거나 백필/일별
+    파일의 기간이 겹쳐도 중복되지 않는다.
+    보고서/월 누적/분석은 시트를 다시 읽지 않고 이 저장소를 조회한다.
+    """
+
+    def __init__(self, path=None):
+        self.logger = get_logger()
+        if path is None:
+            ensure_directory(Settings.STATE_DIR)
+            path = os.path.join(Settings.STATE_DIR, 'sales_warehouse.sqlite3')
+        self.path = path
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sales ("
+            "source_file TEXT NOT NULL, month TEXT, sale_date TEXT, sold_at TEXT, "
+            "machine TEXT, product TEXT, amount REAL, quantity INTEGER, row_json TEXT, distributor TEXT)"
+        )
+        self._migrate_distributor()
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_month ON sales (month, sale_date)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_source ON sales (source_file)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_distributor ON sales (distributor, sale_date)")
+        self.conn.commit()
+
+    def _migrate_distributor(self):
+        """총판 컬럼이 없던 이전 sales 테이블에 컬럼을 추가하고 파일명으로 채움"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(sales)")]
+        if 'distributor' in columns:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE sales ADD COLUMN distributor TEXT")
+            sources = [row[0] for row in self.conn.execute("SELECT DISTINCT source_file FROM sales")]
+            self.conn.executemany(
+                "UPDATE sales SET distributor = ? WHERE source_file = ?",
+                [(extract_distributor_from_filename(source, Settings.DISTRIBUTOR_CODE), source) for source in sources]
+            )
+        self.logger.info("로컬 매출 저장소에 총판 컬럼을 추가했습니다")
+
+    def ingest(self, df, source_file, distributor=None):
+        """처리된 DataFrame 적재, 적재한 행 수 반환
+
+        같은 총판의 (파일에 있는 첫 날짜 ~ 마지막 날짜) 기존 행을 교체한다. 총판은
+        distributor, 파일명의 총판 코드, Settings.DISTRIBUTOR_CODE 순으로 정한다.
+        """
+        source = os.path.basename(source_file)
+        distributor = str(distributor or extract_distributor_from_filename(source, Settings.DISTRIBUTOR_CODE))
+        roles = resolve_column_roles(df.columns)
+        count = len(df)
+
+        if 'timestamp' in roles:
+            timestamps = pd.to_datetime(df[roles['timestamp']], errors='coerce')
+            sold_at = timestamps.dt.strftime('%Y-%m-%d %H:%M:%S')
+            sale_date = timestamps.dt.strftime('%Y-%m-%d')
+        else:
+            # 일시 컬럼이 없으면 파일명의 날짜 사용
+            file_date = extract_date_from_filename(source)
+            sold_at = pd.Series([None] * count, index=df.index)
+            sale_date = pd.Series([file_date] * count, index=df.index)
+        month = sale_date.str.slice(0, 7)
+
+        def column(role, converter=None):
+            if role not in roles:
+                return [None] * count
+            values = df[roles[role]]
+            if converter is not None:
+                values = converter(values)
+            return values.astype(object).where(values.notna(), None).tolist()
+
+        amounts = column('amount', parse_number_series)
+        quantities = column('quantity', parse_number_series)
+        machines = column('machine', lambda s: s.astype(str))
+        products = column('product', lambda s: s.astype(str))
+        raw_rows = df.astype(object).where(df.notna(), None).values.tolist()
+
+        dates = sale_date.dropna()
+        records = zip(
+            [source] * count,
+            month.where(month.notna(), None).tolist(),
+            sale_date.where(sale_date.notna(), None).tolist(),
+            sold_at.where(sold_at.notna(), None).tolist(),
+            machines,
+            products,
+            amounts,
+            [None if q is None else int(q) for q in quantities],
+            [json.dumps(row, ensure_ascii=False, default=str) for row in raw_rows],
+            [distributor] * count
+        )
+
+        with self.conn:
+            if not dates.empty:
+                self.conn.execute(
+                    "DELETE FROM sales WHERE distributor = ? AND sale_date BETWEEN ? AND ?",
+                    (distributor, dates.min(), dates.max())
+                )
+            # 날짜를 알 수 없는 행은 같은 파일에서 적재한 행만 교체
+            self.conn.execute("DELETE FROM sales WHERE source_file = ? AND sale_date IS NULL", (source,))
+            self.conn.executemany(
+                "INSERT INTO sales (source_file, month, sale_date, sold_at, machine, product, "
+                "amount, quantity, row_json, distributor) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+
+        period = f"{dates.min()} ~ {dates.max()}" if not dates.empty else "날짜 없음"
+        self.logger.info(f"로컬 매출 저장소 적재 완료: {source} (총판 {distributor}, {period}, {count}행)")
+        return count
+
+    def query(self, sql, params=()):
+        """SQL 조회 결과를 DataFrame으로 반환"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def monthly_totals(self):
+        """월별 매출/건수"""
+        return self.query(
+            "SELECT month, SUM(amount) AS sales, COUNT(*) AS items, SUM(quantity) AS quantity "
+            "FROM sales WHERE month IS NOT NULL GROUP BY month ORDER BY month"
+        )
+
+    def daily_totals(self, month):
+        """해당 월의 일별 매출/건수"""
+        return self.query(
+            "SELECT sale_date, SUM(amount) AS sales, COUNT(*) AS items "
+            "FROM sales WHERE month = ? GROUP BY sale_date ORDER BY sale_date",
+            (month,)
+        )
+
+    def machine_totals(self, start_date, end_date):
+        """기간 내 자판기별 매출/건수"""
+        return self.query(
+            "SELECT machine, SUM(amount) AS sales, COUNT(*) AS items "
+            "FROM sales WHERE sale_date BETWEEN ? AND ? GROUP BY machine ORDER BY sales DESC",
+            (start_date, end_date)
+        )
+
+    def month_to_date(self, month, until_date=None):
+        """월 누적 매출/건수 (until_date까지)"""
+        sql = "SELECT COALESCE(SUM(amount), 0), COUNT(*) FROM sales WHERE month = ?"
+        params = [month]
+        if until_date:
+            sql += " AND sale_date <= ?"
+            params.append(until_date)
+        sales, items = self.conn.execute(sql, params).fetchone()
+        return sales, items
+
+    def covered_dates(self, month):
+        """해당 월에 적재된 날짜 집합"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT sale_date FROM sales WHERE month = ? AND sale_date IS NOT NULL", (month,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+from ..utils.helpers import ensure_directory
+
+
+class SessionStore:
+    """웹사이트 로그인 쿠키를 암호화해 디스크에 보관하는 저장소
+
+    SESSION_STORE_ENABLED가 켜져 있고 SESSION_STORE_KEY(Fernet 키)가 설정된 경우에만
+    동작한다. 키는 `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`
+    로 생성할 수 있다.
+    """
+
+    def __init__(self, path=None):
+        self.logger = get_logger()
+        if path is None:
+            path = os.path.join(Settings.STATE_DIR, 'session.bin')
+        self.path = path
+        self._fernet = None
+
+    @staticmethod
+    def is_enabled():
+        return Settings.SESSION_STORE_ENABLED and bool(Settings.SESSION_STORE_KEY)
+
+    def _get_fernet(self):
+        if self._fernet is None:
+            from cryptography.fernet import Fernet
+            self._fernet = Fernet(Settings.SESSION_STORE_KEY.encode())
+        return self._fernet
+
+    def load(self):
+        """저장된 쿠키 목록 반환 (없거나 복호화 실패 시 None)"""
+        if not self.is_enabled() or not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                token = f.read()
+            data = self._get_fernet().decrypt(token, ttl=Settings.SESSION_STORE_TTL)
+            return json.loads(data.decode('utf-8'))
+        except Exception as e:
+            self.logger.warning(f"저장된 세션 불러오기 실패: {str(e)}")
+            self.clear()
+            return None
+
+    def save(self, cookies):
+        """쿠키 목록을 암호화해 저장"""
+        if not self.is_enabled():
+            return False
+
+        try:
+            ensure_directory(os.path.dirname(self.path) or '.')
+            token = self._get_fernet().encrypt(json.dumps(cookies).encode('utf-8'))
+
+            # 소유자만 읽을 수 있도록 생성 후 원자적으로 교체 (동시 저장 시 임시 파일이 겹치지 않게 스레드별 이름)
+            temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(token)
+            os.replace(temp_path, self.path)
+
+            self.logger.info("로그인 세션 저장 완료")
+            return True
+        except Exception as e:
+            self.logger.warning(f"로그인 세션 저장 실패: {str(e)}")
+            return False
+
+    def clear(self):
+        """저장된 세션 삭제 (이미 없으면 무시)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,53 @@
+import os
+import threading
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+# gspread(스프레드시트/드라이브) 인증 범위 (서식 batchUpdate도 gspread로 보냄)
+SCOPES = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive',
+]
+
+_lock = threading.Lock()
+_credentials = None
+_client = None
+
+
+def get_credentials_path():
+    """프로젝트 루트 기준 credentials 파일 경로"""
+    return os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        'credentials',
+        'google_credentials.json'
+    )
+
+
+def get_credentials():
+    """서비스 계정 인증 정보 (프로세스당 한 번만 읽음)"""
+    global _credentials
+    with _lock:
+        if _credentials is None:
+            credentials_path = get_credentials_path()
+            if not os.path.exists(credentials_path):
+                raise FileNotFoundError(f"Credentials 파일을 찾을 수 없습니다: {credentials_path}")
+            _credentials = ServiceAccountCredentials.from_json_keyfile_name(credentials_path, SCOPES)
+        return _credentials
+
+
+def get_client():
+    """공유 gspread 클라이언트 (하나의 HTTP 세션으로 연결 재사용)"""
+    global _client
+    credentials = get_credentials()
+    with _lock:
+        if _client is None:
+            _client = gspread.authorize(credentials)
+        return _client
+
+
+def reset():
+    """캐시된 인증 정보/클라이언트 초기화"""
+    global _credentials, _client
+    with _lock:
+        _credentials = None
+        _client = None
@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+import requests
+from ..config.settings import Settings
+from ..utils.logger import get_logger
+
+# 재시도 대상 HTTP 상태 (할당량 초과, 서버 오류)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 멱등이 아닌 쓰기(append 등)를 바로 재시도해도 되는 상태 (요청이 처리되지 않았음이 확실)
+SAFE_RETRY_STATUSES = {429}
+NETWORK_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class TokenBucket:
+    """분당 요청 수 제한용 토큰 버킷"""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기하고 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+def get_status_code(error):
+    """gspread APIError / googleapiclient HttpError / requests 예외에서 HTTP 상태 추출"""
+    response = getattr(error, 'response', None)
+    if response is not None and getattr(response, 'status_code', None) is not None:
+        return response.status_code
+    resp = getattr(error, 'resp', None)
+    if resp is not None and getattr(resp, 'status', None) is not None:
+        return int(resp.status)
+    code = getattr(error, 'code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_uncertain_write_error(error):
+    """요청이 서버에 반영되었는지 알 수 없는 실패 (서버 오류, 연결 끊김, 시간 초과)"""
+    status = get_status_code(error)
+    return (status in RETRY_STATUSES and status not in SAFE_RETRY_STATUSES) or isinstance(error, NETWORK_ERRORS)
+
+
+class SheetsRequestScheduler:
+    """Google Sheets 요청 스케줄러
+
+    읽기/쓰기 분당 할당량에 맞춘 토큰 버킷으로 요청 속도를 조절하고, 429/5xx 응답은
+    지터가 있는 지수 백오프로 재시도한다. 멱등이 아닌 쓰기(write_once)는 429만
+    재시도하고 나머지 실패는 호출한 쪽에서 반영 여부를 확인하도록 그대로 올린다.
+    batchUpdate 요청은 큐에 모았다가 flush()에서 한 번에 보낸다.
+    호출/재시도/대기 시간 지표를 metrics에 기록한다.
+    """
+
+    def __init__(self, read_per_minute=None, write_per_minute=None, max_retries=None,
+                 base_delay=None, max_delay=None, sleep=time.sleep):
+        self.logger = get_logger()
+        self.read_bucket = TokenBucket(read_per_minute or Settings.SHEETS_READ_PER_MINUTE, sleep=sleep)
+        self.write_bucket = TokenBucket(write_per_minute or Settings.SHEETS_WRITE_PER_MINUTE, sleep=sleep)
+        self.max_retries = max_retries if max_retries is not None else Settings.SHEETS_MAX_RETRIES
+        self.base_delay = base_delay if base_delay is not None else Settings.SHEETS_BACKOFF_BASE
+        self.max_delay = max_delay if max_delay is not None else Settings.SHEETS_BACKOFF_MAX
+        self.sleep = sleep
+        self._pending = []
+        self._lock = threading.Lock()
+        self.metrics = {
+            'reads': 0,
+            'writes': 0,
+            'retries': 0,
+            'failures': 0,
+            'throttled_seconds': 0.0,
+        }
+
+    def read(self, fn, *args, **kwargs):
+        return self.call('read', fn, *args, **kwargs)
+
+    def write(self, fn, *args, **kwargs):
+        return self.call('write', fn, *args, **kwargs)
+
+    def write_once(self, fn, *args, **kwargs):
+        """멱등이 아닌 쓰기 (처리되지 않았음이 확실한 429만 재시도)"""
+        return self._call('write', fn, args, kwargs, idempotent=False)
+
+    def call(self, kind, fn, *args, **kwargs):
+        """할당량 제한과 재시도를 적용해 fn 호출"""
+        return self._call(kind, fn, args, kwargs)
+
+    def _call(self, kind, fn, args, kwargs, idempotent=True):
+        bucket = self.write_bucket if kind == 'write' else self.read_bucket
+
+        for attempt in range(self.max_retries + 1):
+            waited = bucket.acquire()
+            self._add_metric('throttled_seconds', waited)
+            self._add_metric(f"{kind}s", 1)
+
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                status = get_status_code(e)
+                if idempotent:
+                    retryable = status in RETRY_STATUSES or isinstance(e, NETWORK_ERRORS)
+                else:
+                    retryable = status in SAFE_RETRY_STATUSES
+                if not retryable or attempt >= self.max_retries:
+                    self._add_metric('failures', 1)
+                    raise
+
+                self.backoff(attempt, f"상태: {status}")
+
+    def backoff(self, attempt, reason):
+        """attempt번째(0부터) 재시도 전 지터가 있는 지수 백오프 대기"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay *= 0.5 + random.random() / 2
+        self.logger.warning(
+            f"Sheets 요청 재시도 {attempt + 1}/{self.max_retries} ({reason}, {delay:.1f}초 대기)"
+        )
+        self._add_metric('retries', 1)
+        self._add_metric('throttled_seconds', delay)
+        self.sleep(delay)
+
+    def queue_batch_request(self, request):
+        """batchUpdate 요청을 큐에 추가 (flush()에서 한 번에 전송)"""
+        with self._lock:
+            self._pending.append(request)
+
+    def flush(self, spreadsheet):
+        """큐에 모인 batchUpdate 요청을 하나의 요청으로 전송"""
+        with self._lock:
+            requests_to_send, self._pending = self._pending, []
+        if not requests_to_send:
+            return None
+        return self.write(spreadsheet.batch_update, {"requests": requests_to_send})
+
+    def _add_metric(self, name, value):
+        with self._lock:
+            self.metrics[name] += value
+
+    def get_metrics(self):
+        with self._lock:
+            return dict(self.metrics)
+
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 공용 스케줄러 (할당량은 프로젝트/계정 단위로 공유됨)"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = SheetsRequestScheduler()
+        return _shared_scheduler
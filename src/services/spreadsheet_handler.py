@@ -4,48 +4,43 @@ import pandas as pd
 from datetime import datetime
 from ..config.settings import Settings
 from ..utils.logger import get_logger
-from ..utils.helpers import is_duplicate_data, get_current_month
-import os
-from oauth2client.service_account import ServiceAccountCredentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from ..utils.helpers import get_current_month
+from ..utils.dedupe import RowKeyIndex, parse_key_columns
+from .row_key_store import RowKeyStore
+from . import sheets_client
+from .sheets_scheduler import get_scheduler, get_status_code, is_uncertain_write_error
+
+DRIVE_FILES_API_URL = 'https://www.googleapis.com/drive/v3/files'
 
 class SpreadsheetHandler:
-    def __init__(self):
+    def __init__(self, scheduler=None, client=None):
         self.logger = get_logger()
+        # 모든 Sheets 요청은 할당량/재시도 스케줄러를 거침
+        self.scheduler = scheduler or get_scheduler()
+        # gspread 클라이언트 (지정하지 않으면 공유 클라이언트, 테스트와 벤치마크에서는 tests/support/fake_sheets.FakeClient)
+        self.client = client
         self.spreadsheet = None
         self.main_sheet = None
         self.table1_sheet = None
         self.table2_sheet = None
+        self.last_append_stats = None
+        self.row_key_store = None
+        self._worksheets = {}
+        # 워크시트별 H열 서식이 적용된 마지막 행
+        self._formatted_through = {}
     
     def open_spreadsheet(self):
         """구글 스프레드시트 열기"""
         try:
-            # API 인증 정보 설정
-            scope = ['https://spreadsheets.google.com/feeds',
-                    'https://www.googleapis.com/auth/drive']
-            
-            # 프로젝트 루트 기준으로 credentials 파일 경로 설정
-            credentials_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                'credentials',
-                'google_credentials.json'
-            )
-            
-            if not os.path.exists(credentials_path):
-                raise FileNotFoundError(f"Credentials 파일을 찾을 수 없습니다: {credentials_path}")
-            
-            credentials = ServiceAccountCredentials.from_json_keyfile_name(
-                credentials_path, scope)
-            
-            # gspread 클라이언트 생성
-            gc = gspread.authorize(credentials)
+            # 공유 gspread 클라이언트로 스프레드시트 열기 (ID 사용)
+            client = self.client or sheets_client.get_client()
+            self.spreadsheet = self.scheduler.read(client.open_by_key, Settings.SPREADSHEET_ID)
             
-            # 스프레드시트 열기 (ID 사용)
-            self.spreadsheet = gc.open_by_key(Settings.SPREADSHEET_ID)
-            self.main_sheet = self.spreadsheet.worksheet('main')
-            self.table1_sheet = self.spreadsheet.worksheet('table1')
-            self.table2_sheet = self.spreadsheet.worksheet('table2')
+            # 워크시트 목록을 한 번만 조회해 이름별로 보관
+            self._worksheets = {ws.title: ws for ws in self.scheduler.read(self.spreadsheet.worksheets)}
+            self.main_sheet = self._get_worksheet(Settings.MAIN_SHEET)
+            self.table1_sheet = self._get_worksheet(Settings.TABLE1_SHEET)
+            self.table2_sheet = self._get_worksheet(Settings.TABLE2_SHEET)
             
             self.logger.info("스프레드시트 연결 성공")
             return True
@@ -54,6 +49,14 @@ class SpreadsheetHandler:
             self.logger.error(f"스프레드시트 연결 실패: {str(e)}")
             return False
     
+    def _get_worksheet(self, name):
+        """이름으로 워크시트 조회 (메타데이터 요청 없이 캐시 사용)"""
+        worksheet = self._worksheets.get(name)
+        if worksheet is None:
+            worksheet = self.scheduler.read(self.spreadsheet.worksheet, name)
+            self._worksheets[name] = worksheet
+        return worksheet
+    
     def get_table1_data(self):
         """table1 시트의 A1:C20 데이터 추출"""
         try:
@@ -61,7 +64,7 @@ class SpreadsheetHandler:
                 raise ValueError("table1 시트가 초기화되지 않았습니다.")
             
             # A1:C20 범위의 데이터 가져오기
-            data = self.table1_sheet.get('A1:C20')
+            data = self.scheduler.read(self.table1_sheet.get, 'A1:C20')
             return data
         
         except Exception as e:
@@ -78,7 +81,7 @@ class SpreadsheetHandler:
             current_month = datetime.now().strftime('%Y-%m')
             
             # 모든 데이터 가져오기
-            all_data = self.table2_sheet.get_all_values()
+            all_data = self.scheduler.read(self.table2_sheet.get_all_values)
             if len(all_data) <= 1:  # 헤더만 있는 경우
                 return None
             
@@ -96,8 +99,8 @@ class SpreadsheetHandler:
     def get_main_sheet_data(self):
         """main 시트의 모든 데이터 가져오기"""
         try:
-            worksheet = self.spreadsheet.worksheet(Settings.MAIN_SHEET)
-            data = worksheet.get_all_values()
+            worksheet = self._get_worksheet(Settings.MAIN_SHEET)
+            data = self.scheduler.read(worksheet.get_all_values)
             self.logger.info(f"main 시트 데이터 로드 완료: {len(data)}행")
             return data
         except Exception as e:
@@ -106,114 +109,244 @@ class SpreadsheetHandler:
     
     def append_to_main_sheet(self, data):
         """main 시트에 데이터 추가 (중복 방지)"""
+        return self.append_rows_to_main_sheet([data]) > 0
+    
+    def append_rows_to_main_sheet(self, rows):
+        """main 시트에 여러 행을 한 번에 추가 (중복 방지)
+        
+        로컬에서 중복을 제거한 뒤 새 행 전체를 append_rows 요청 하나로 기록하고
+        H열 서식도 batchUpdate 한 번으로 적용한다. 행 키 캐시가 켜져 있으면
+        시트 전체 대신 로컬 캐시로 중복을 확인한다. 추가된 행 수를 반환한다.
+        """
         try:
-            worksheet = self.spreadsheet.worksheet(Settings.MAIN_SHEET)
-            existing_data = worksheet.get_all_values()
+            if not rows:
+                return 0
             
-            # 중복 확인
-            if is_duplicate_data(data, existing_data):
-                self.logger.warning("중복 데이터 발견. 추가하지 않습니다.")
-                return False
+            worksheet = self._get_worksheet(Settings.MAIN_SHEET)
+            index = RowKeyIndex(parse_key_columns(Settings.DEDUPE_KEY_COLUMNS))
             
-            # 데이터 추가
-            worksheet.append_row(data)
-            self.logger.info("main 시트에 데이터 추가 완료")
+            store = self._get_row_key_store(worksheet)
+            if store is not None:
+                # 캐시 동기화 후 후보 행의 키만 조회
+                last_row = self._sync_row_key_store(store, worksheet, index)
+                found = store.lookup({index.make_key(row) for row in rows})
+                for key, signature in found.items():
+                    index.add_signature(key, signature)
+            else:
+                existing_data = self.scheduler.read(worksheet.get_all_values)
+                index.add_existing(existing_data[1:])
+                last_row = len(existing_data)
             
-            # H열 날짜+시간 서식 설정
-            self._format_date_time_column(worksheet)
+            # 로컬 중복 확인 (복합 키 인덱스를 한 번만 생성)
+            new_rows = index.filter_new(rows)
+            self.last_append_stats = index.stats()
             
-            return True
+            if index.skipped:
+                self.logger.warning(f"중복 데이터 {index.skipped}행 발견. 추가하지 않습니다.")
+            if index.conflicting:
+                self.logger.warning(
+                    f"키는 같지만 내용이 다른 충돌 데이터 {index.conflicting}행 발견. 추가하지 않습니다."
+                )
+            
+            if not new_rows:
+                return 0
+            
+            # 데이터 일괄 추가 (반영 여부가 불확실한 실패는 시트 끝을 확인한 뒤 빠진 행만 다시 추가)
+            appended = self._append_verified(worksheet, index, last_row, new_rows)
+            # 재확인한 시트 내용 기준으로 실제 반영된 행 수 계산 (다른 쓰기로 끼어든 행 제외)
+            new_keys = {index.make_key(row) for row in new_rows}
+            added_count = len({index.make_key(row) for row in appended if row} & new_keys)
+            self.logger.info(f"main 시트에 데이터 {added_count}행 추가 완료")
+            end_row = last_row + len(appended)
+            
+            # H열 날짜+시간 서식 설정 (이미 서식이 적용된 범위면 요청 없음)
+            self._ensure_date_time_format(worksheet, store, end_row)
+            
+            if store is not None:
+                entries = [
+                    (index.make_key(row), index.make_signature(row), last_row + i + 1)
+                    for i, row in enumerate(appended)
+                    if row
+                ]
+                # 직접 기록한 변경까지 반영된 리비전을 저장
+                store.record(
+                    entries,
+                    end_row,
+                    index.make_signature(appended[-1]),
+                    self._fetch_sheet_revision()
+                )
+            
+            return added_count
             
         except Exception as e:
             self.logger.error(f"main 시트 데이터 추가 실패: {str(e)}")
             raise
     
-    def _format_date_time_column(self, worksheet):
-        """H열 날짜+시간 서식 설정"""
+    def _append_verified(self, worksheet, index, last_row, new_rows):
+        """new_rows를 한 번만 추가하고 last_row 다음에 있는 행 목록 반환
+        
+        append_rows는 멱등이 아니므로 스케줄러는 429만 재시도한다. 서버 오류나 시간 초과처럼
+        요청이 반영되었는지 알 수 없는 실패는 last_row 다음 행을 다시 읽어 행 키로 확인하고,
+        시트에 없는 행만 다시 추가한다.
+        """
+        pending = new_rows
+        uncertain = False
+        for attempt in range(self.scheduler.max_retries + 1):
+            try:
+                self.scheduler.write_once(worksheet.append_rows, pending)
+                break
+            except Exception as e:
+                if not is_uncertain_write_error(e) or attempt >= self.scheduler.max_retries:
+                    raise
+                uncertain = True
+                tail = self.scheduler.read(worksheet.get, f'A{last_row + 1}:ZZ')
+                written = {index.make_key(row) for row in tail if row}
+                pending = [row for row in pending if index.make_key(row) not in written]
+                self.logger.warning(
+                    f"main 시트 추가 결과 확인 (상태: {get_status_code(e)}): "
+                    f"{len(new_rows) - len(pending)}행 반영됨, {len(pending)}행 남음"
+                )
+                if not pending:
+                    break
+                self.scheduler.backoff(attempt, "main 시트 추가 미반영 행")
+        
+        if not uncertain:
+            return new_rows
+        # 재시도 중 다른 쓰기가 끼어들었을 수 있으므로 실제 시트 내용을 사용
+        return self.scheduler.read(worksheet.get, f'A{last_row + 1}:ZZ')
+    
+    def _get_row_key_store(self, worksheet):
+        """행 키 캐시 열기 (비활성화되었거나 열 수 없으면 None)"""
+        if not Settings.ROW_KEY_CACHE_ENABLED:
+            return None
+        
+        if self.row_key_store is None:
+            try:
+                self.row_key_store = RowKeyStore(
+                    f"{Settings.SPREADSHEET_ID}:{worksheet.id}",
+                    Settings.DEDUPE_KEY_COLUMNS
+                )
+            except Exception as e:
+                self.logger.warning(f"행 키 캐시 열기 실패, 시트 전체 조회로 대체: {str(e)}")
+                return None
+        
+        return self.row_key_store
+    
+    def _sync_row_key_store(self, store, worksheet, index):
+        """행 키 캐시를 시트와 동기화하고 마지막 행 번호 반환
+        
+        리비전이 같으면 시트를 읽지 않고, 달라졌으면 마지막으로 알고 있던 행부터
+        끝까지만 읽는다. 그 행이 캐시와 다르면(중간 행 삭제 등) 전체를 다시 읽는다.
+        """
+        revision = self._fetch_sheet_revision()
+        if store.is_fresh(revision):
+            self.logger.info("행 키 캐시 최신 상태 - main 시트 조회 생략")
+            return store.last_row
+        
+        last_row = store.last_row
+        last_signature = store.last_signature
+        if last_row > 0 and last_signature is not None:
+            tail = self.scheduler.read(worksheet.get, f'A{last_row}:ZZ')
+            if tail and index.make_signature(tail[0]) == last_signature:
+                entries = [
+                    (index.make_key(row), index.make_signature(row), last_row + i)
+                    for i, row in enumerate(tail[1:], start=1)
+                    if row
+                ]
+                new_last_row = last_row + len(tail) - 1
+                store.record(entries, new_last_row, index.make_signature(tail[-1]), revision)
+                self.logger.info(f"행 키 캐시 갱신: main 시트 {len(tail) - 1}행 추가 확인")
+                return new_last_row
+        
+        # 전체 재동기화
+        data = self.scheduler.read(worksheet.get_all_values)
+        store.reset()
+        entries = [
+            (index.make_key(row), index.make_signature(row), row_number)
+            for row_number, row in enumerate(data[1:], start=2)
+            if row
+        ]
+        store.record(
+            entries,
+            len(data),
+            index.make_signature(data[-1]) if data else None,
+            revision
+        )
+        self.logger.info(f"행 키 캐시 재구성: main 시트 {len(data)}행")
+        return len(data)
+    
+    def _fetch_sheet_revision(self):
+        """스프레드시트 리비전(Drive 파일 version) 조회, 실패하면 None"""
         try:
-            # 현재 데이터가 있는 행 수 확인
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:  # 헤더만 있는 경우
-                return
-            
-            # H열의 마지막 행에 날짜+시간 서식 적용
-            last_row = len(all_values)
-            h_cell = f'H{last_row}'
-            
-            # H열이 날짜+시간 데이터인지 확인
-            h_value = worksheet.acell(h_cell).value
-            if h_value:
-                try:
-                    # gspread의 format 메서드 사용
-                    worksheet.format(h_cell, {
-                        "numberFormat": {
-                            "type": "DATE_TIME",
-                            "pattern": "yyyy-mm-dd hh:mm:ss"
-                        }
-                    })
-                    self.logger.info(f"H열 서식 설정 완료: {h_cell}")
-                except Exception as format_error:
-                    self.logger.warning(f"gspread format 메서드 실패: {str(format_error)}")
-                    
-                    # 대안: Google Sheets API 직접 사용
-                    try:
-                        from googleapiclient.discovery import build
-                        
-                        # credentials 파일 경로
-                        credentials_path = os.path.join(
-                            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                            'credentials',
-                            'google_credentials.json'
-                        )
-                        
-                        # Google Sheets API 서비스 생성
-                        credentials = ServiceAccountCredentials.from_json_keyfile_name(
-                            credentials_path, 
-                            ['https://www.googleapis.com/auth/spreadsheets']
-                        )
-                        service = build('sheets', 'v4', credentials=credentials)
-                        
-                        # 스프레드시트 ID 추출 (URL에서)
-                        spreadsheet_id = Settings.SPREADSHEET_ID
-                        
-                        # H열 전체에 날짜+시간 서식 적용
-                        request = {
-                            "requests": [
-                                {
-                                    "repeatCell": {
-                                        "range": {
-                                            "sheetId": 0,  # 첫 번째 시트 (main)
-                                            "startRowIndex": 0,
-                                            "endRowIndex": 1000,  # 충분히 큰 범위
-                                            "startColumnIndex": 7,  # H열 (0부터 시작하므로 7)
-                                            "endColumnIndex": 8
-                                        },
-                                        "cell": {
-                                            "userEnteredFormat": {
-                                                "numberFormat": {
-                                                    "type": "DATE_TIME",
-                                                    "pattern": "yyyy-mm-dd hh:mm:ss"
-                                                }
-                                            }
-                                        },
-                                        "fields": "userEnteredFormat(numberFormat)"
-                                    }
-                                }
-                            ]
+            response = self.scheduler.read(
+                self.spreadsheet.client.request,
+                'get',
+                f"{DRIVE_FILES_API_URL}/{self.spreadsheet.id}",
+                params={'fields': 'version'}
+            )
+            return response.json().get('version')
+        except Exception as e:
+            self.logger.warning(f"스프레드시트 리비전 조회 실패: {str(e)}")
+            return None
+    
+    def _ensure_date_time_format(self, worksheet, store, end_row):
+        """H열 날짜+시간 서식을 end_row(1부터, 포함)까지 보장
+        
+        서식을 적용한 마지막 행을 기록해 두고, 그 안쪽에 추가된 행은 요청 없이 넘어간다.
+        범위를 벗어나면 시트 행 수를 여유 행(Settings.DATE_FORMAT_HEADROOM_ROWS)까지 늘리고 그 끝까지
+        서식을 한 번의 batchUpdate로 적용하므로 평상시 실행에서는 서식 요청이 없다.
+        """
+        formatted_through = self._formatted_through.get(worksheet.id)
+        if formatted_through is None:
+            formatted_through = store.formatted_through if store is not None else 0
+        if end_row <= formatted_through:
+            return
+        
+        try:
+            grid_rows = max(worksheet.row_count, end_row)
+            target_rows = end_row + Settings.DATE_FORMAT_HEADROOM_ROWS
+            
+            if grid_rows < target_rows:
+                # 시트 행 수를 미리 늘려 이후 추가되는 행도 서식 범위 안에 들도록 함
+                # (늘릴 양이 아닌 최종 행 수를 지정하므로 응답을 잃고 재시도해도 두 번 늘지 않음)
+                self.scheduler.queue_batch_request({
+                    "updateSheetProperties": {
+                        "properties": {
+                            "sheetId": worksheet.id,
+                            "gridProperties": {"rowCount": target_rows}
+                        },
+                        "fields": "gridProperties.rowCount"
+                    }
+                })
+                grid_rows = target_rows
+            
+            start_row_index = max(formatted_through, 1)  # 헤더 제외
+            self.scheduler.queue_batch_request({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": worksheet.id,
+                        "startRowIndex": start_row_index,
+                        "endRowIndex": grid_rows,
+                        "startColumnIndex": 7,  # H열 (0부터 시작하므로 7)
+                        "endColumnIndex": 8
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "numberFormat": {
+                                "type": "DATE_TIME",
+                                "pattern": "yyyy-mm-dd hh:mm:ss"
+                            }
                         }
-                        
-                        # 서식 적용
-                        service.spreadsheets().batchUpdate(
-                            spreadsheetId=spreadsheet_id,
-                            body=request
-                        ).execute()
-                        
-                        self.logger.info(f"H열 전체 서식 설정 완료 (Google Sheets API 사용)")
-                        
-                    except Exception as api_error:
-                        self.logger.error(f"Google Sheets API 서식 설정 실패: {str(api_error)}")
-                        # 최종 대안: 수동으로 날짜+시간 형식 확인
-                        self.logger.info(f"H열 날짜+시간 데이터 확인: {h_cell} = {h_value}")
+                    },
+                    "fields": "userEnteredFormat(numberFormat)"
+                }
+            })
+            self.scheduler.flush(self.spreadsheet)
+            
+            self._formatted_through[worksheet.id] = grid_rows
+            if store is not None:
+                store.set_formatted_through(grid_rows)
+            self.logger.info(f"H열 서식 설정 완료: H{start_row_index + 1}:H{grid_rows}")
             
         except Exception as e:
             self.logger.warning(f"H열 서식 설정 실패: {str(e)}")
@@ -222,12 +355,12 @@ class SpreadsheetHandler:
     def create_dataframe_from_sheet(self, sheet_name, range_name=None):
         """시트 데이터를 DataFrame으로 변환"""
         try:
-            worksheet = self.spreadsheet.worksheet(sheet_name)
+            worksheet = self._get_worksheet(sheet_name)
             
             if range_name:
-                data = worksheet.get(range_name)
+                data = self.scheduler.read(worksheet.get, range_name)
             else:
-                data = worksheet.get_all_values()
+                data = self.scheduler.read(worksheet.get_all_values)
             
             if not data:
                 return pd.DataFrame()
@@ -243,8 +376,8 @@ class SpreadsheetHandler:
     def update_cell(self, sheet_name, cell, value):
         """특정 셀 업데이트"""
         try:
-            worksheet = self.spreadsheet.worksheet(sheet_name)
-            worksheet.update(cell, value)
+            worksheet = self._get_worksheet(sheet_name)
+            self.scheduler.write(worksheet.update, cell, value)
             self.logger.info(f"{sheet_name} 시트 {cell} 셀 업데이트 완료")
         except Exception as e:
             self.logger.error(f"셀 업데이트 실패: {str(e)}")
@@ -1,5 +1,9 @@
 import os
+import re
+import shutil
+import tempfile
 import time
+import requests
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -11,14 +15,59 @@ from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from ..config.settings import Settings
 from ..utils.logger import get_logger
-from ..utils.helpers import ensure_directory, get_latest_file
+from ..utils.helpers import ensure_directory, get_latest_file, wait_for_download, tag_distributor_file
+from .session_store import SessionStore
+
+# 페이지의 XHR/fetch 요청 수를 세는 감시 스크립트 (한 번만 설치, 현재까지 보낸 요청 수 반환)
+AJAX_MONITOR_SCRIPT = """
+if (!window.__ajaxMonitor) {
+    var monitor = window.__ajaxMonitor = {sent: 0, done: 0};
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        monitor.sent++;
+        this.addEventListener('loadend', function () { monitor.done++; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            monitor.sent++;
+            return fetch.apply(this, arguments).finally(function () { monitor.done++; });
+        };
+    }
+}
+return window.__ajaxMonitor.sent;
+"""
+
+# 검색 완료 판단용 페이지 상태 (arguments: 결과 선택자, 결과 없음 표시 선택자)
+SEARCH_STATE_SCRIPT = """
+var monitor = window.__ajaxMonitor;
+var results = document.querySelector(arguments[0]);
+var empty = arguments[1] ? document.querySelector(arguments[1]) : null;
+return {
+    idle: document.readyState === 'complete' &&
+        (typeof window.jQuery === 'undefined' || window.jQuery.active === 0),
+    sent: monitor ? monitor.sent : null,
+    done: monitor ? monitor.done : null,
+    results: results ? results.innerHTML : '',
+    empty: !!(empty && empty.offsetParent !== null)
+};
+"""
 
 class WebScraper:
-    def __init__(self):
+    def __init__(self, profile=None, download_dir=None):
         self.logger = get_logger()
         self.driver = None
-        self.download_dir = os.path.abspath(Settings.DOWNLOAD_DIR)
+        # Chrome 프로필 모드 ('default' 또는 'lean')
+        self.profile = profile or Settings.CHROME_PROFILE
+        self.user_data_dir = None
+        self.download_dir = os.path.abspath(download_dir or Settings.DOWNLOAD_DIR)
         ensure_directory(self.download_dir)
+        # 단계별 실제 대기 시간 (초)
+        self.step_timings = {}
+        self.logged_in = False
+        self.http_session = None
+        self.session_store = SessionStore()
     
     def setup_driver(self):
         """Chrome 드라이버 설정"""
@@ -37,17 +86,85 @@ class WebScraper:
             "download.directory_upgrade": True,
             "safebrowsing.enabled": True
         }
+        if self.profile == 'lean':
+            self._apply_lean_profile(chrome_options, prefs)
+        
         chrome_options.add_experimental_option("prefs", prefs)
         
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
-            self.logger.info("Chrome 드라이버 초기화 완료")
+            if self.profile == 'lean' and Settings.LEAN_BLOCKED_URLS:
+                # 폰트/분석/광고 요청 차단
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Settings.LEAN_BLOCKED_URLS})
+            self.logger.info(f"Chrome 드라이버 초기화 완료 (프로필: {self.profile})")
         except Exception as e:
             self.logger.error(f"Chrome 드라이버 초기화 실패: {str(e)}")
             raise
     
+    def restore_session(self):
+        """저장된 세션 쿠키 복원 후 인증된 페이지로 유효성 확인
+        
+        저장 파일이 없거나 손상되었거나 키가 맞지 않는 등 어떤 이유로든 불러오지 못하면
+        저장된 세션이 없는 것으로 보고 False를 반환한다(일반 로그인으로 진행).
+        """
+        try:
+            cookies = self.session_store.load()
+            if not cookies:
+                return False
+            
+            # 쿠키를 설정하려면 해당 도메인 페이지에 먼저 접속해야 함
+            self.driver.get(Settings.WEBSITE_URL)
+            self.driver.delete_all_cookies()
+            for cookie in cookies:
+                self.driver.add_cookie(cookie)
+            
+            self.driver.get(Settings.SESSION_PROBE_URL or Settings.WEBSITE_URL)
+            WebDriverWait(self.driver, 10).until(
+                lambda driver: driver.execute_script("return document.readyState") == 'complete'
+            )
+            
+            # 로그인 폼이 다시 보이면 세션 만료
+            if self.driver.find_elements(By.NAME, "email"):
+                self.logger.info("저장된 세션 만료 - 다시 로그인합니다")
+                self.session_store.clear()
+                return False
+            
+            self.logged_in = True
+            self.logger.info("저장된 세션으로 로그인 생략")
+            return True
+            
+        except Exception as e:
+            self.logger.warning(f"세션 복원 실패: {str(e)}")
+            return False
+    
+    def _apply_lean_profile(self, chrome_options, prefs):
+        """메모리/네트워크 사용을 줄인 경량 Chrome 옵션 적용"""
+        chrome_options.page_load_strategy = 'eager'
+        for argument in (
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--blink-settings=imagesEnabled=false",
+        ):
+            chrome_options.add_argument(argument)
+        
+        # 사용자 데이터 디렉토리는 tmpfs(/dev/shm)에 생성
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        self.user_data_dir = tempfile.mkdtemp(prefix='chrome-profile-', dir=shm_dir)
+        chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
+        
+        prefs["profile.managed_default_content_settings.images"] = 2
+    
     def login(self):
         """TOYGO 웹사이트 로그인"""
+        if SessionStore.is_enabled() and self.restore_session():
+            return
+        
         try:
             self.logger.info(f"TOYGO 웹사이트 로그인 시작: {Settings.WEBSITE_URL}")
             self.driver.get(Settings.WEBSITE_URL)
@@ -86,6 +203,8 @@ class WebScraper:
                     self.logger.info("로그인 성공 - 대시보드 페이지로 이동")
                 else:
                     self.logger.info(f"로그인 성공 - 현재 페이지: {current_url}")
+                self.logged_in = True
+                self.session_store.save(self.driver.get_cookies())
                 
             except TimeoutException:
                 # 로그인 에러 메시지 확인
@@ -115,7 +234,7 @@ class WebScraper:
         """매출 관리 페이지로 이동"""
         try:
             self.logger.info("매출 관리 페이지로 이동 시작")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, Settings.NAVIGATE_TIMEOUT)
             
             # 매출 관리 버튼 찾기 및 클릭
             sales_management_link = wait.until(
@@ -124,18 +243,21 @@ class WebScraper:
             sales_management_link.click()
             self.logger.info("매출 관리 버튼 클릭")
             
-            # 페이지 로딩 대기
-            time.sleep(3)
+            # 페이지 로딩 대기 (총판 드롭다운이 나타나고 요청이 끝날 때까지)
+            started = time.monotonic()
+            wait.until(EC.presence_of_element_located((By.ID, "group_first")))
+            self._wait_for_page_idle(Settings.NAVIGATE_TIMEOUT)
+            self._record_wait('navigate', started)
             
         except Exception as e:
             self.logger.error(f"매출 관리 페이지 이동 실패: {str(e)}")
             raise
     
-    def select_distributor(self):
-        """총판 선택 - 로컬러 선택"""
+    def select_distributor(self, distributor_code=None):
+        """총판 선택 - 기본값은 로컬러"""
         try:
             self.logger.info("총판 선택 시작")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, Settings.DISTRIBUTOR_TIMEOUT)
             
             # 총판 드롭다운 찾기
             distributor_select = wait.until(
@@ -145,11 +267,14 @@ class WebScraper:
             # Select 객체 생성
             select = Select(distributor_select)
             
-            # 로컬러 선택 (value="040")
-            select.select_by_value("040")
-            self.logger.info("로컬러 선택 완료")
+            # 총판 선택 (로컬러: value="040")
+            select.select_by_value(distributor_code or Settings.DISTRIBUTOR_CODE)
+            self.logger.info(f"총판 선택 완료: {distributor_code or Settings.DISTRIBUTOR_CODE}")
             
-            time.sleep(2)  # 선택 후 대기
+            # 선택 후 하위 드롭다운 갱신 요청이 끝날 때까지 대기
+            started = time.monotonic()
+            self._wait_for_page_idle(Settings.DISTRIBUTOR_TIMEOUT)
+            self._record_wait('select_distributor', started)
             
         except Exception as e:
             self.logger.error(f"총판 선택 실패: {str(e)}")
@@ -159,7 +284,7 @@ class WebScraper:
         """조회 기간 설정"""
         try:
             self.logger.info("조회 기간 설정 시작")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, Settings.DATE_RANGE_TIMEOUT)
             
             # 기본값: 어제 날짜
             if start_date is None:
@@ -181,7 +306,11 @@ class WebScraper:
             end_date_input.send_keys(end_date)
             self.logger.info(f"종료일 설정: {end_date}")
             
-            time.sleep(1)  # 입력 후 대기
+            # 입력값이 반영될 때까지 대기
+            started = time.monotonic()
+            wait.until(EC.text_to_be_present_in_element_value((By.ID, "dash-date1"), start_date))
+            wait.until(EC.text_to_be_present_in_element_value((By.ID, "dash-date2"), end_date))
+            self._record_wait('set_date_range', started)
             
         except Exception as e:
             self.logger.error(f"조회 기간 설정 실패: {str(e)}")
@@ -191,17 +320,25 @@ class WebScraper:
         """검색 버튼 클릭"""
         try:
             self.logger.info("검색 버튼 클릭 시작")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, Settings.SEARCH_TIMEOUT)
             
             # 검색 버튼 찾기 및 클릭
             search_button = wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(@onclick, 'searchTotal()')]"))
             )
+            baseline_requests = self.driver.execute_script(AJAX_MONITOR_SCRIPT)
+            previous = self._get_search_state()
             search_button.click()
             self.logger.info("검색 버튼 클릭")
             
-            # 검색 결과 로딩 대기
-            time.sleep(5)
+            # 검색 완료 대기 (결과 테이블 갱신, 결과 없음 표시, 또는 검색 요청 완료 후 결과 안정)
+            started = time.monotonic()
+            is_complete = self._search_completion(baseline_requests, previous)
+            try:
+                WebDriverWait(self.driver, Settings.SEARCH_TIMEOUT).until(lambda driver: is_complete())
+            except TimeoutException:
+                self.logger.warning("검색 완료를 확인하지 못했습니다")
+            self._record_wait('search', started)
             
         except Exception as e:
             self.logger.error(f"검색 버튼 클릭 실패: {str(e)}")
@@ -211,7 +348,7 @@ class WebScraper:
         """Excel 파일 다운로드"""
         try:
             self.logger.info("Excel 파일 다운로드 시작")
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, Settings.DOWNLOAD_MENU_TIMEOUT)
             
             # 다운로드 전 파일 목록 저장
             before_files = set(os.listdir(self.download_dir))
@@ -223,43 +360,198 @@ class WebScraper:
             download_icon.click()
             self.logger.info("다운로드 아이콘 클릭")
             
-            time.sleep(2)
-            
-            # Excel 드롭다운 메뉴 찾기 및 클릭
+            # Excel 드롭다운 메뉴가 클릭 가능해질 때까지 대기 후 클릭
+            started = time.monotonic()
             excel_menu = wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//i[contains(@class, 'fa-file-text')]"))
             )
+            self._record_wait('download_menu', started)
             excel_menu.click()
             self.logger.info("Excel 메뉴 클릭")
             
-            # 다운로드 완료 대기
-            time.sleep(10)
-            
-            # 다운로드 후 파일 목록 확인
-            after_files = set(os.listdir(self.download_dir))
-            new_files = after_files - before_files
-            
-            if new_files:
-                downloaded_file = os.path.join(self.download_dir, list(new_files)[0])
-                self.logger.info(f"Excel 파일 다운로드 완료: {downloaded_file}")
-                return downloaded_file
-            else:
+            # 다운로드 완료 대기 (완료된 파일이 나타나면 바로 반환)
+            started = time.monotonic()
+            try:
+                downloaded_file = wait_for_download(
+                    self.download_dir, before_files, timeout=Settings.DOWNLOAD_TIMEOUT
+                )
+            except TimeoutError:
                 raise Exception("다운로드된 Excel 파일을 찾을 수 없습니다")
+            self._record_wait('download', started)
+            
+            self.logger.info(f"Excel 파일 다운로드 완료: {downloaded_file}")
+            return downloaded_file
                 
         except Exception as e:
             self.logger.error(f"Excel 파일 다운로드 실패: {str(e)}")
             raise
     
-    def download_file(self, download_url=None, start_date=None, end_date=None):
-        """전체 다운로드 프로세스 실행"""
+    def _is_page_idle(self):
+        """문서 로딩과 jQuery AJAX 요청이 모두 끝났는지 확인"""
+        return self.driver.execute_script(
+            "return document.readyState === 'complete' && "
+            "(typeof window.jQuery === 'undefined' || window.jQuery.active === 0);"
+        )
+    
+    def _wait_for_page_idle(self, timeout):
+        """페이지 네트워크 요청이 끝날 때까지 대기"""
+        WebDriverWait(self.driver, timeout).until(lambda driver: self._is_page_idle())
+    
+    def _get_search_state(self):
+        """검색 완료 판단용 페이지 상태 (idle, sent, done, results, empty)"""
+        return self.driver.execute_script(
+            SEARCH_STATE_SCRIPT, Settings.SEARCH_RESULT_SELECTOR, Settings.SEARCH_EMPTY_SELECTOR
+        )
+    
+    def _search_completion(self, baseline_requests, previous):
+        """검색 완료 여부를 반환하는 조건 함수 생성
+        
+        요청이 모두 끝난 상태에서 다음 중 하나면 완료로 본다.
+        - 결과 테이블 내용이 바뀜
+        - 클릭 전에는 없던 결과 없음 표시가 나타남
+        - 클릭 후 보낸 요청이 모두 끝났고 결과가 SEARCH_SETTLE_SECONDS 동안 그대로임 (매출 없는 날)
+        - 페이지가 새로 로드됨 (요청 감시 스크립트가 사라짐)
+        """
+        settled_since = [None]
+        
+        def is_complete():
+            state = self._get_search_state()
+            in_flight = state['sent'] is not None and state['done'] < state['sent']
+            if not state['idle'] or in_flight:
+                settled_since[0] = None
+                return False
+            if state['sent'] is None:
+                return True
+            if state['results'] != previous['results']:
+                return True
+            if state['empty'] and not previous['empty']:
+                return True
+            if state['sent'] > baseline_requests and state['done'] >= state['sent']:
+                now = time.monotonic()
+                if settled_since[0] is None:
+                    settled_since[0] = now
+                return now - settled_since[0] >= Settings.SEARCH_SETTLE_SECONDS
+            return False
+        
+        return is_complete
+    
+    def _record_wait(self, step, started):
+        """단계별 실제 대기 시간 기록"""
+        elapsed = time.monotonic() - started
+        self.step_timings[step] = elapsed
+        self.logger.info(f"{step} 대기 시간: {elapsed:.2f}초")
+    
+    def set_download_dir(self, download_dir):
+        """다운로드 폴더 변경 (실행 중인 드라이버에도 적용)"""
+        self.download_dir = os.path.abspath(download_dir)
+        ensure_directory(self.download_dir)
+        if self.driver:
+            self.driver.execute_cdp_cmd(
+                'Page.setDownloadBehavior',
+                {'behavior': 'allow', 'downloadPath': self.download_dir}
+            )
+    
+    def capture_http_credentials(self):
+        """로그인된 브라우저의 (User-Agent, 쿠키 목록) 반환
+        
+        드라이버는 스레드 안전하지 않으므로 동시 다운로드 전에 한 번만 호출하고,
+        작업 스레드는 이 값으로 build_http_session을 호출해 각자 세션을 만든다.
+        """
+        return self.driver.execute_script("return navigator.userAgent;"), self.driver.get_cookies()
+    
+    @staticmethod
+    def build_http_session(user_agent, cookies):
+        """User-Agent와 쿠키 목록으로 requests 세션 생성 (드라이버를 사용하지 않음)"""
+        session = requests.Session()
+        session.headers['User-Agent'] = user_agent
+        for cookie in cookies:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        return session
+    
+    def create_http_session(self):
+        """로그인된 브라우저의 쿠키로 requests 세션 생성"""
+        return self.build_http_session(*self.capture_http_credentials())
+    
+    def fetch_export_via_http(self, start_date, end_date, distributor_code=None, download_dir=None, session=None):
+        """Selenium 없이 엑셀 내보내기 URL을 직접 호출해 파일 다운로드
+        
+        Settings.EXPORT_URL 템플릿의 {start_date}, {end_date}, {distributor}를 채워
+        요청하며, 응답이 엑셀 파일이 아니면(세션 만료로 로그인 페이지가 온 경우 등)
+        예외를 발생시킨다. download_dir을 주면 그 폴더에 저장한다(동시 다운로드용).
+        session을 주면 그 세션으로 요청하고 드라이버와 self.http_session은 건드리지 않는다
+        (작업 스레드에서 호출할 때 사용).
+        """
+        if session is None:
+            if self.http_session is None:
+                self.http_session = self.create_http_session()
+            session = self.http_session
+        
+        url = Settings.EXPORT_URL.format(
+            start_date=start_date,
+            end_date=end_date,
+            distributor=distributor_code or Settings.DISTRIBUTOR_CODE
+        )
+        started = time.monotonic()
+        response = session.get(url, timeout=Settings.DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        
+        # xlsx(zip) 또는 xls(OLE) 시그니처 확인
+        if not response.content.startswith((b'PK', b'\xd0\xcf\x11\xe0')):
+            if session is self.http_session:
+                # 다음 호출에서 브라우저 쿠키로 세션을 다시 만들도록 초기화
+                self.http_session.close()
+                self.http_session = None
+            raise Exception("내보내기 응답이 엑셀 파일이 아닙니다")
+        
+        filename = None
+        match = re.search(r'filename="?([^";]+)"?', response.headers.get('Content-Disposition', ''))
+        if match:
+            filename = os.path.basename(match.group(1))
+        if not filename:
+            filename = f"Sell_Total{start_date}.xlsx"
+        
+        # 임시 파일에 기록한 뒤 이름 변경 (다운로드 감시와 같은 규칙)
+        file_path = os.path.join(download_dir or self.download_dir, filename)
+        with open(f"{file_path}.part", 'wb') as f:
+            f.write(response.content)
+        os.replace(f"{file_path}.part", file_path)
+        
+        self.step_timings['http_export'] = time.monotonic() - started
+        self.logger.info(f"HTTP 내보내기 다운로드 완료: {file_path}")
+        return file_path
+    
+    def _try_http_export(self, start_date, end_date, distributor_code=None):
+        """HTTP 직접 내보내기 시도, 설정되지 않았거나 실패하면 None"""
+        if not Settings.EXPORT_URL:
+            return None
+        
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        try:
+            return self.fetch_export_via_http(
+                start_date or yesterday, end_date or yesterday, distributor_code
+            )
+        except Exception as e:
+            self.logger.warning(f"HTTP 내보내기 실패, 브라우저 다운로드로 대체: {str(e)}")
+            return None
+    
+    def download_file(self, download_url=None, start_date=None, end_date=None, distributor_code=None):
+        """전체 다운로드 프로세스 실행 (distributor_code를 주지 않으면 Settings.DISTRIBUTOR_CODE)"""
         try:
             self.logger.info("매출 데이터 다운로드 프로세스 시작")
             
+            # 0. HTTP 직접 내보내기 (설정된 경우, 실패하면 클릭 방식으로 진행)
+            downloaded_file = self._try_http_export(start_date, end_date, distributor_code)
+            if downloaded_file:
+                return downloaded_file
+            
             # 1. 매출 관리 페이지로 이동
             self.navigate_to_sales_management()
             
             # 2. 총판 선택 (로컬러)
-            self.select_distributor()
+            self.select_distributor(distributor_code)
             
             # 3. 조회 기간 설정
             self.set_date_range(start_date, end_date)
@@ -276,15 +568,82 @@ class WebScraper:
             self.logger.error(f"다운로드 프로세스 실패: {str(e)}")
             raise
     
+    def download_range(self, date_ranges, distributor_codes=None):
+        """한 번의 로그인으로 여러 기간, 여러 총판의 파일을 순서대로 다운로드
+        
+        date_ranges는 (시작일, 종료일) 목록 또는 날짜 문자열 목록이며, 기간마다
+        distributor_codes(기본값 Settings.DISTRIBUTOR_CODES)의 총판을 차례로 받아
+        다운로드가 끝날 때마다 (시작일, 종료일, 총판 코드, 파일 경로)를 yield한다.
+        총판이 여러 개면 DistributorCollector와 같은 규칙으로 파일명에 총판 코드를 붙인다.
+        실패한 기간/총판은 파일 경로가 None으로 전달되고 다음 작업을 계속 진행한다.
+        """
+        codes = list(distributor_codes or Settings.DISTRIBUTOR_CODES)
+        multiple = len(codes) > 1
+        if not self.logged_in:
+            self.login()
+        
+        for date_range in date_ranges:
+            if isinstance(date_range, str):
+                start_date, end_date = date_range, date_range
+            else:
+                start_date, end_date = date_range
+            
+            for code in codes:
+                try:
+                    self.logger.info(f"기간 다운로드 시작: {start_date} ~ {end_date} (총판 {code})")
+                    
+                    downloaded_file = self._try_http_export(start_date, end_date, code)
+                    if not downloaded_file:
+                        # 이미 매출 관리 페이지에 있으면 이동 생략
+                        if not self.driver.find_elements(By.ID, "group_first"):
+                            self.navigate_to_sales_management()
+                        
+                        self.select_distributor(code)
+                        self.set_date_range(start_date, end_date)
+                        self.click_search_button()
+                        downloaded_file = self.download_excel_file()
+                    
+                    if multiple:
+                        downloaded_file = tag_distributor_file(downloaded_file, code)
+                    
+                except Exception as e:
+                    self.logger.error(f"기간 다운로드 실패 ({start_date} ~ {end_date}, 총판 {code}): {str(e)}")
+                    downloaded_file = None
+                
+                yield start_date, end_date, code, downloaded_file
+    
+    def is_healthy(self):
+        """드라이버가 응답하는지 확인"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.execute_script("return 1;")
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+    
+    def ensure_logged_in(self):
+        """로그인 폼이 보이면(세션 만료) 다시 로그인"""
+        if not self.logged_in or self.driver.find_elements(By.NAME, "email"):
+            self.logged_in = False
+            self.login()
+    
     def get_latest_downloaded_file(self):
         """가장 최근 다운로드된 파일 반환"""
         return get_latest_file(self.download_dir)
     
     def close(self):
         """드라이버 종료"""
+        if self.http_session:
+            self.http_session.close()
+            self.http_session = None
         if self.driver:
             self.driver.quit()
+            self.driver = None
             self.logger.info("Chrome 드라이버 종료")
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
     
     def __enter__(self):
         """컨텍스트 매니저 진입"""
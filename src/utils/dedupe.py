@@ -0,0 +1,151 @@
+import math
+import re
+from datetime import datetime, date
+
+_NUMBER_PATTERN = re.compile(r'^-?[\d,]+(\.\d+)?$')
+
+
+def normalize_cell_value(value):
+    """시트 값과 DataFrame 값을 같은 문자열로 맞추기 위한 정규화"""
+    if value is None:
+        return ''
+
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+
+    text = str(value).strip()
+    if text.lower() in ('nan', 'nat', 'none'):
+        return ''
+
+    # 시트에서 "1,000" 처럼 서식이 적용된 숫자는 쉼표 제거
+    if _NUMBER_PATTERN.match(text):
+        text = text.replace(',', '')
+        if '.' in text:
+            number = float(text)
+            return str(int(number)) if number.is_integer() else repr(number)
+
+    return text
+
+
+def parse_key_columns(spec):
+    """키 컬럼 설정 문자열("A,C,H" 또는 "0,2,7")을 0부터 시작하는 인덱스 목록으로 변환
+
+    빈 문자열이면 None을 반환하며, 이 경우 행 전체를 키로 사용한다.
+    """
+    if not spec:
+        return None
+
+    indices = []
+    for token in str(spec).split(','):
+        token = token.strip().upper()
+        if not token:
+            continue
+        if token.isdigit():
+            indices.append(int(token))
+        elif token.isalpha():
+            index = 0
+            for char in token:
+                index = index * 26 + (ord(char) - ord('A') + 1)
+            indices.append(index - 1)
+        else:
+            raise ValueError(f"잘못된 키 컬럼 설정: {token}")
+
+    return indices or None
+
+
+class RowKeyIndex:
+    """복합 키 기반 중복 확인 인덱스
+
+    기존 행을 한 번만 읽어 키 -> 행 서명 딕셔너리를 만들고, 이후 여러 후보 행을
+    O(1)로 확인한다. 키가 같고 행 내용도 같으면 중복(skipped), 키는 같지만
+    나머지 값이 다르면 충돌(conflicting)로 집계하며 어느 쪽도 추가하지 않는다.
+    """
+
+    def __init__(self, key_columns=None):
+        self.key_columns = key_columns
+        self._signatures = {}
+        self.inserted = 0
+        self.skipped = 0
+        self.conflicting = 0
+
+    @classmethod
+    def from_rows(cls, rows, key_columns=None, has_header=True):
+        """기존 시트 데이터로 인덱스 생성"""
+        index = cls(key_columns)
+        index.add_existing(rows[1:] if has_header and rows else rows)
+        return index
+
+    def make_key(self, row):
+        """행에서 복합 키 생성"""
+        if self.key_columns is None:
+            return self.make_signature(row)
+        return tuple(
+            normalize_cell_value(row[i]) if i < len(row) else ''
+            for i in self.key_columns
+        )
+
+    @staticmethod
+    def make_signature(row):
+        """행 전체 내용 서명 (뒤쪽 빈 칸은 무시)"""
+        values = [normalize_cell_value(value) for value in row]
+        while values and values[-1] == '':
+            values.pop()
+        return tuple(values)
+
+    def add_existing(self, rows):
+        """이미 기록된 행을 인덱스에 등록 (통계에는 반영하지 않음)"""
+        for row in rows:
+            if row and any(normalize_cell_value(value) for value in row):
+                self._signatures[self.make_key(row)] = self.make_signature(row)
+
+    def add_signature(self, key, signature):
+        """미리 계산된 키/서명을 등록"""
+        self._signatures[key] = signature
+
+    def check(self, row):
+        """후보 행 상태 확인: 'new', 'duplicate', 'conflict'"""
+        key = self.make_key(row)
+        if key not in self._signatures:
+            return 'new'
+        if self._signatures[key] == self.make_signature(row):
+            return 'duplicate'
+        return 'conflict'
+
+    def __contains__(self, row):
+        return self.make_key(row) in self._signatures
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def filter_new(self, rows):
+        """후보 행 중 새 행만 반환하고 인덱스에 등록 (같은 배치 내 중복도 제거)"""
+        new_rows = []
+        for row in rows:
+            status = self.check(row)
+            if status == 'new':
+                self._signatures[self.make_key(row)] = self.make_signature(row)
+                new_rows.append(row)
+                self.inserted += 1
+            elif status == 'duplicate':
+                self.skipped += 1
+            else:
+                self.conflicting += 1
+        return new_rows
+
+    def stats(self):
+        """추가/중복/충돌 행 수"""
+        return {
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'conflicting': self.conflicting
+        }
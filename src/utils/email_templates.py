@@ -0,0 +1,45 @@
+import os
+import threading
+from datetime import datetime
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+from ..config.settings import Settings
+from .helpers import ensure_directory, get_yesterday_range
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+REPORT_TEMPLATE = 'email_template.html'
+
+_environment = None
+_lock = threading.Lock()
+
+
+def get_environment():
+    """프로세스 공용 Jinja2 환경 (템플릿 컴파일 결과는 메모리와 STATE_DIR 바이트코드 캐시에 보관)"""
+    global _environment
+    with _lock:
+        if _environment is None:
+            cache_dir = os.path.join(Settings.STATE_DIR, 'jinja_cache')
+            ensure_directory(cache_dir)
+            _environment = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                bytecode_cache=FileSystemBytecodeCache(cache_dir),
+                autoescape=select_autoescape(['html', 'xml']),
+                auto_reload=False
+            )
+        return _environment
+
+
+def render_report_html(summary_data, table1_data, monthly_data):
+    """HTML 보고서 렌더링 (기간은 요약의 시작/끝, 없으면 어제)"""
+    start_time, end_time = summary_data.get('start'), summary_data.get('end')
+    if start_time is None or end_time is None:
+        start_time, end_time = get_yesterday_range()
+
+    template = get_environment().get_template(REPORT_TEMPLATE)
+    return template.render(
+        generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        period=f"{start_time.strftime('%Y-%m-%d %H:%M')} ~ {end_time.strftime('%Y-%m-%d %H:%M')}",
+        total_sales=f"{summary_data.get('total_sales', 0):,}원",
+        total_items=f"{summary_data.get('total_items', 0)}개",
+        monthly_data=monthly_data,
+        table_data=table1_data
+    )
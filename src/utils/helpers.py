@@ -1,8 +1,12 @@
 import os
 import glob
+import time
 from datetime import datetime, timedelta
 import pandas as pd
 import re
+from functools import lru_cache
+from .dedupe import RowKeyIndex
+from .logger import get_logger
 
 def ensure_directory(directory):
     """디렉토리가 존재하지 않으면 생성"""
@@ -35,75 +39,256 @@ def get_yesterday_range():
     end_time = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
     return start_time, end_time
 
+def build_date_chunks(start_date, end_date, chunk_days=1):
+    """날짜 범위를 chunk_days일 단위 (시작일, 종료일) 문자열 목록으로 분할"""
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d")
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, "%Y-%m-%d")
+    if end_date < start_date:
+        raise ValueError(f"종료일이 시작일보다 빠릅니다: {start_date:%Y-%m-%d} ~ {end_date:%Y-%m-%d}")
+    
+    chunks = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        chunks.append((chunk_start.strftime("%Y-%m-%d"), chunk_end.strftime("%Y-%m-%d")))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
 def get_current_month():
     """현재 월 반환 (YYYY-MM 형식)"""
     return datetime.now().strftime("%Y-%m")
 
-def is_duplicate_data(data, existing_data):
-    """중복 데이터인지 확인"""
+def is_duplicate_data(data, existing_data, key_columns=None):
+    """중복 데이터인지 확인
+    
+    key_columns(0부터 시작하는 컬럼 인덱스 목록)로 복합 키를 만들어 비교하며,
+    지정하지 않으면 행 전체를 키로 사용한다. 여러 행을 확인할 때는
+    RowKeyIndex를 한 번 만들어 재사용하는 것이 좋다.
+    """
     if not existing_data or len(existing_data) == 0:
         return False
     
-    # 첫 번째 행이 헤더인 경우 제외
-    if len(existing_data) > 1:
-        existing_data = existing_data[1:]
+    index = RowKeyIndex.from_rows(existing_data, key_columns)
+    return index.check(data) != 'new'
+
+# 컬럼 역할별 키워드 (앞쪽 역할이 우선)
+COLUMN_ROLE_KEYWORDS = {
+    'amount': ['매출', '금액', '가격', 'sales', 'amount', 'price'],
+    'quantity': ['수량', '개수', 'qty', 'quantity'],
+    'timestamp': ['날짜', '일시', 'date', '시간', 'time'],
+    'machine': ['자판기', '기기', '장비', '단말', 'machine', 'device', 'terminal'],
+    'product': ['상품', '제품', '품목', 'product', 'item', 'goods'],
+    'distributor': ['총판', 'distributor'],
+}
+
+EXCEL_CHUNK_SIZE = 5000
+
+# 파싱 결과(컬럼 정리/타입)가 바뀌면 올려서 파싱 캐시를 무효화
+PARSER_VERSION = 2
+
+@lru_cache(maxsize=64)
+def _resolve_column_roles(columns):
+    roles = {}
+    used = set()
+    for role, keywords in COLUMN_ROLE_KEYWORDS.items():
+        for col in columns:
+            if col in used:
+                continue
+            if any(keyword in str(col).lower() for keyword in keywords):
+                roles[role] = col
+                used.add(col)
+                break
+    return roles
+
+def resolve_column_roles(columns):
+    """컬럼명 목록에서 역할(amount, quantity, timestamp 등)별 컬럼 찾기 (컬럼 구성별로 캐시)"""
+    return dict(_resolve_column_roles(tuple(columns)))
+
+def _has_unparsed(original, parsed):
+    """원래 값이 있는데 변환 결과가 비어 있는 칸이 있는지 확인"""
+    present = original.notna() & ~original.map(_is_empty_cell)
+    return bool((present & parsed.isna()).any())
+
+def _parse_numeric(series):
+    """숫자 컬럼 변환 ("1,500" 같은 천 단위 구분 문자열 포함), 숫자가 아닌 값이 있으면 None"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = series.map(lambda value: value.replace(',', '').strip() if isinstance(value, str) else value)
+    parsed = pd.to_numeric(cleaned, errors='coerce')
+    return None if _has_unparsed(series, parsed) else parsed
+
+def apply_column_schema(df):
+    """역할별 컬럼 타입 적용 (금액: float, 수량: Int64, 일시: datetime)
     
-    # 날짜 기준으로 중복 확인 (첫 번째 컬럼이 날짜라고 가정)
-    data_date = data[0] if data else None
+    변환할 수 없는 값이 하나라도 있는 컬럼은 값을 잃지 않도록 원래 값 그대로 둔다.
+    """
+    roles = resolve_column_roles(df.columns)
+    if 'amount' in roles:
+        amounts = _parse_numeric(df[roles['amount']])
+        if amounts is not None:
+            df[roles['amount']] = amounts.astype('float64')
+    if 'quantity' in roles:
+        quantities = _parse_numeric(df[roles['quantity']])
+        if quantities is not None:
+            df[roles['quantity']] = quantities.round().astype('Int64')
+    if 'timestamp' in roles:
+        original = df[roles['timestamp']]
+        timestamps = pd.to_datetime(original, errors='coerce')
+        if not _has_unparsed(original, timestamps):
+            df[roles['timestamp']] = timestamps
+    return df
+
+def _is_empty_cell(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def _iter_excel_rows(file_path):
+    """엑셀 첫 시트의 행을 값 튜플로 순회 (python-calamine이 있으면 사용)"""
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
     
-    for row in existing_data:
-        if row and len(row) > 0 and row[0] == data_date:
-            return True
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_path(file_path)
+        for row in workbook.get_sheet_by_index(0).to_python(skip_empty_area=False):
+            yield tuple(None if value == '' else value for value in row)
+        return
     
-    return False
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
 
-def parse_excel_file(file_path):
-    """Excel 파일을 pandas DataFrame으로 읽기"""
+def iter_excel_chunks(file_path, chunk_size=EXCEL_CHUNK_SIZE):
+    """엑셀 파일을 chunk_size행 단위 DataFrame으로 스트리밍 읽기
+    
+    첫 번째 비어 있지 않은 행을 헤더로 사용하고, 헤더가 빈 열과 값이 모두 빈 행은
+    읽는 단계에서 제외한다. 청크는 원래 값 그대로 반환하므로 컬럼 타입은 청크 경계에
+    따라 달라지지 않도록 합친 뒤 apply_column_schema로 한 번에 적용해야 한다.
+    """
+    rows = _iter_excel_rows(file_path)
+    
+    header = None
+    for row in rows:
+        if not all(_is_empty_cell(value) for value in row):
+            header = row
+            break
+    if header is None:
+        return
+    
+    # 헤더가 있는 열만 사용하고 중복 컬럼명은 pandas와 같이 .1, .2 를 붙임
+    keep = [i for i, value in enumerate(header) if not _is_empty_cell(value)]
+    columns = []
+    seen = {}
+    for i in keep:
+        name = str(header[i]).strip()
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    
+    chunk = []
+    emitted = False
+    for row in rows:
+        values = [row[i] if i < len(row) else None for i in keep]
+        if all(_is_empty_cell(value) for value in values):
+            continue
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            yield pd.DataFrame(chunk, columns=columns)
+            emitted = True
+            chunk = []
+    
+    if chunk or not emitted:
+        yield pd.DataFrame(chunk, columns=columns)
+
+def parse_excel_file(file_path, streaming=True):
+    """Excel 파일을 pandas DataFrame으로 읽기
+    
+    .xlsx는 스트리밍 리더로 읽고 값이 모두 빈 열을 제거한다. 스트리밍 읽기에
+    실패하면 기존 pd.read_excel 방식으로 대체한다.
+    """
     try:
         # 파일 확장자 확인
         if file_path.endswith('.xlsx'):
-            return pd.read_excel(file_path, engine='openpyxl')
+            if streaming:
+                try:
+                    chunks = list(iter_excel_chunks(file_path))
+                    if chunks:
+                        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+                        # 컬럼 타입은 전체 행을 보고 한 번만 결정
+                        df = apply_column_schema(df)
+                        return df.loc[:, df.notna().any(axis=0)] if len(df) else df
+                except Exception as e:
+                    # 스트리밍 읽기 실패 시 기존 전체 읽기 방식으로 대체
+                    get_logger().warning(f"스트리밍 엑셀 읽기 실패, pd.read_excel로 대체: {file_path} ({str(e)})")
+            return apply_column_schema(pd.read_excel(file_path, engine='openpyxl'))
         elif file_path.endswith('.xls'):
-            return pd.read_excel(file_path, engine='xlrd')
+            return apply_column_schema(pd.read_excel(file_path, engine='xlrd'))
         elif file_path.endswith('.csv'):
-            return pd.read_csv(file_path, encoding='utf-8')
+            return apply_column_schema(pd.read_csv(file_path, encoding='utf-8'))
         else:
             raise ValueError(f"지원하지 않는 파일 형식: {file_path}")
     except Exception as e:
         raise Exception(f"파일 읽기 실패: {str(e)}")
 
 def create_summary_data(df, date_column=None):
-    """DataFrame에서 요약 데이터 생성"""
-    if df.empty:
-        return {
-            'total_sales': 0,
-            'total_items': 0,
-            'period': "데이터 없음"
-        }
+    """DataFrame에서 요약 데이터 생성 (summary.compute_summary 사용)"""
+    from .summary import compute_summary
     
-    # 매출 컬럼 찾기 (금액 관련 컬럼)
-    sales_columns = [col for col in df.columns if any(keyword in col.lower() for keyword in ['매출', '금액', '가격', 'sales', 'amount', 'price'])]
-    
-    if sales_columns:
-        total_sales = df[sales_columns[0]].sum()
-    else:
-        total_sales = 0
+    roles = None
+    if date_column and date_column in df.columns:
+        roles = resolve_column_roles(df.columns)
+        roles['timestamp'] = date_column
+    return compute_summary(df, roles)
+
+PARTIAL_DOWNLOAD_SUFFIXES = ('.crdownload', '.part', '.tmp')
+
+def wait_for_download(directory, before_files, timeout=60, poll_interval=0.2,
+                      max_poll_interval=1.0, stable_checks=2):
+    """다운로드 완료 대기
     
-    total_items = len(df)
+    before_files 이후 새로 생긴 파일 중 임시 파일(.crdownload 등)이 아니고
+    크기가 stable_checks회 연속 변하지 않은 파일이 나타나면 바로 경로를 반환한다.
+    폴링 간격은 max_poll_interval까지 점점 늘어나며, timeout 초 안에 완료되지
+    않으면 TimeoutError를 발생시킨다.
+    """
+    deadline = time.monotonic() + timeout
+    interval = poll_interval
+    sizes = {}
     
-    # 기간 정보
-    if date_column and date_column in df.columns:
-        start_date = df[date_column].min()
-        end_date = df[date_column].max()
-        period = f"{start_date} ~ {end_date}"
-    else:
-        period = "기간 정보 없음"
-    
-    return {
-        'total_sales': total_sales,
-        'total_items': total_items,
-        'period': period
-    }
+    while True:
+        new_files = set(os.listdir(directory)) - set(before_files)
+        in_progress = any(name.endswith(PARTIAL_DOWNLOAD_SUFFIXES) for name in new_files)
+        
+        for name in sorted(new_files):
+            if name.endswith(PARTIAL_DOWNLOAD_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            
+            previous_size, count = sizes.get(name, (None, 0))
+            count = count + 1 if size == previous_size and size > 0 else 0
+            sizes[name] = (size, count)
+            
+            # 같은 이름의 임시 파일이 남아 있으면 아직 기록 중
+            if count >= stable_checks - 1 and not (in_progress and f"{name}.crdownload" in new_files):
+                return path
+        
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{timeout}초 안에 다운로드가 완료되지 않았습니다: {directory}")
+        
+        time.sleep(interval)
+        interval = min(interval * 2, max_poll_interval)
 
 def get_latest_sales_file(directory, date=None):
     """특정 날짜의 매출 파일 또는 최신 파일 찾기"""
@@ -123,8 +308,35 @@ def get_latest_sales_file(directory, date=None):
 
 def extract_date_from_filename(filename):
     """파일명에서 날짜 추출"""
-    # Sell_Total2025-06-19.xlsx 패턴에서 날짜 추출
-    match = re.search(r'Sell_Total(\d{4}-\d{2}-\d{2})\.xlsx', filename)
+    # Sell_Total2025-06-19.xlsx (총판별 파일은 Sell_Total2025-06-19_040.xlsx) 패턴에서 날짜 추출
+    match = re.search(r'Sell_Total(\d{4}-\d{2}-\d{2})(?:_[^.]+)?\.xlsx', filename)
+    if match:
+        return match.group(1)
+    return None
+
+def get_report_date(file_paths=()):
+    """보고서 기준 날짜 (YYYY-MM-DD, 다운로드 파일명의 날짜, 없으면 어제)"""
+    for file_path in file_paths:
+        file_date = extract_date_from_filename(os.path.basename(file_path or ''))
+        if file_date:
+            return file_date
+    return get_yesterday_range()[0].strftime('%Y-%m-%d')
+
+def extract_distributor_from_filename(filename, default=None):
+    """파일명에서 총판 코드 추출 (Sell_Total2025-06-19_040.xlsx -> '040', 코드가 없으면 default)"""
+    match = re.search(r'Sell_Total\d{4}-\d{2}-\d{2}_([^.]+)\.xlsx', os.path.basename(filename or ''))
     if match:
         return match.group(1)
-    return None 
\ No newline at end of file
+    return default
+
+def tag_distributor_file(file_path, code, directory=None):
+    """다운로드 파일명에 총판 코드를 붙여 이동 (Sell_Total2025-06-19.xlsx -> Sell_Total2025-06-19_040.xlsx)
+
+    directory를 주면 그 폴더로, 없으면 같은 폴더에서 이름만 바꾼다. 파일이 없으면 None.
+    """
+    if not file_path:
+        return None
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    tagged_path = os.path.join(directory or os.path.dirname(file_path), f"{stem}_{code}{ext}")
+    os.replace(file_path, tagged_path)
+    return tagged_path
@@ -0,0 +1,103 @@
+import hashlib
+import os
+from ..config.settings import Settings
+from .logger import get_logger
+from .helpers import ensure_directory, PARSER_VERSION
+
+
+class ParseCache:
+    """파싱된 DataFrame을 파일 내용 해시 기준으로 Feather 파일에 캐시
+
+    키는 원본 파일 SHA-256 + 파서 버전이며, 캐시 디렉토리 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 파일부터 삭제한다. pyarrow가 없으면 캐시를 사용하지 않는다.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.logger = get_logger()
+        self.cache_dir = cache_dir or Settings.PARSE_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Settings.PARSE_CACHE_MAX_BYTES
+
+    @staticmethod
+    def is_available():
+        if not Settings.PARSE_CACHE_ENABLED:
+            return False
+        try:
+            import pyarrow.feather  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    def file_hash(file_path):
+        """파일 SHA-256"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _cache_path(self, file_path):
+        key = f"{self.file_hash(file_path)}-v{PARSER_VERSION}"
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def get(self, file_path):
+        """캐시된 DataFrame 반환 (없으면 None)"""
+        if not self.is_available():
+            return None
+
+        try:
+            from pyarrow import feather
+
+            cache_path = self._cache_path(file_path)
+            if not os.path.exists(cache_path):
+                return None
+
+            table = feather.read_table(cache_path, memory_map=True)
+            # LRU 순서를 위해 사용 시각 갱신
+            os.utime(cache_path)
+            self.logger.info(f"파싱 캐시 사용: {os.path.basename(file_path)}")
+            return table.to_pandas()
+        except Exception as e:
+            self.logger.warning(f"파싱 캐시 읽기 실패: {str(e)}")
+            return None
+
+    def put(self, file_path, df):
+        """DataFrame을 캐시에 저장"""
+        if not self.is_available():
+            return False
+
+        try:
+            import pyarrow as pa
+            from pyarrow import feather
+
+            ensure_directory(self.cache_dir)
+            cache_path = self._cache_path(file_path)
+            temp_path = f"{cache_path}.tmp"
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            feather.write_feather(table, temp_path)
+            os.replace(temp_path, cache_path)
+
+            self._evict()
+            return True
+        except Exception as e:
+            self.logger.warning(f"파싱 캐시 저장 실패: {str(e)}")
+            return False
+
+    def _evict(self):
+        """캐시 크기 제한을 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.feather'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.logger.info(f"파싱 캐시 삭제: {os.path.basename(path)}")
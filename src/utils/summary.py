@@ -0,0 +1,186 @@
+import pandas as pd
+from .helpers import resolve_column_roles
+
+
+def _to_number(value):
+    """합계 값을 정수/실수 파이썬 값으로 변환"""
+    if pd.isna(value):
+        return 0
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def parse_number_series(values):
+    """숫자 컬럼 변환 ("1,000" 같은 문자열 포함, 숫자가 아닌 값은 NaN)"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    return pd.to_numeric(values.astype(str).str.replace(',', '', regex=False), errors='coerce')
+
+
+def _sales_series(df, roles):
+    """매출 컬럼을 숫자로 변환 ("1,000" 같은 문자열 포함, 컬럼이 없으면 0)"""
+    if 'amount' not in roles:
+        return pd.Series(0, index=df.index)
+    return parse_number_series(df[roles['amount']])
+
+
+def _breakdown(frame, key):
+    """key 컬럼 기준 매출/건수/수량 집계"""
+    grouped = frame.groupby(key, sort=True, dropna=True)
+    totals = grouped['_sales'].sum()
+    counts = grouped.size()
+    result = {}
+    quantities = grouped['_quantity'].sum() if '_quantity' in frame else None
+    for name in counts.index:
+        entry = {'sales': _to_number(totals[name]), 'items': int(counts[name])}
+        if quantities is not None:
+            entry['quantity'] = _to_number(quantities[name])
+        result[name] = entry
+    return result
+
+
+def compute_summary(df, roles=None):
+    """매출 요약 계산 (입력 DataFrame은 변경하지 않음)
+
+    컬럼 역할은 resolve_column_roles로 한 번만 찾고(컬럼 구성별 캐시),
+    필요한 컬럼만 모은 작은 프레임에서 총매출/건수/수량, 기간과
+    자판기별/상품별/시간대별 집계를 계산한다. roles로 역할을 직접 지정할 수 있다.
+    """
+    if df is None or df.empty:
+        return {
+            'total_sales': 0,
+            'total_items': 0,
+            'period': "데이터 없음",
+            'by_machine': {},
+            'by_product': {},
+            'by_hour': {}
+        }
+
+    if roles is None:
+        roles = resolve_column_roles(df.columns)
+
+    # 역할별 컬럼만 모아 작업용 프레임 구성 (원본은 그대로)
+    work = {'_sales': _sales_series(df, roles)}
+    if 'quantity' in roles:
+        work['_quantity'] = pd.to_numeric(df[roles['quantity']], errors='coerce')
+    if 'timestamp' in roles:
+        timestamps = df[roles['timestamp']]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors='coerce')
+        work['_timestamp'] = timestamps
+    if 'machine' in roles:
+        work['_machine'] = df[roles['machine']]
+    if 'product' in roles:
+        work['_product'] = df[roles['product']]
+    frame = pd.DataFrame(work)
+
+    summary = {
+        'total_sales': _to_number(frame['_sales'].sum()),
+        'total_items': len(frame),
+        'period': "기간 정보 없음"
+    }
+    if '_quantity' in frame:
+        summary['total_quantity'] = _to_number(frame['_quantity'].sum())
+
+    if '_timestamp' in frame:
+        start, end = frame['_timestamp'].min(), frame['_timestamp'].max()
+        if pd.notna(start) and pd.notna(end):
+            summary['start'] = start.to_pydatetime()
+            summary['end'] = end.to_pydatetime()
+            summary['period'] = f"{start.strftime('%Y-%m-%d')} ~ {end.strftime('%Y-%m-%d')}"
+        frame['_hour'] = frame['_timestamp'].dt.hour
+
+    summary['by_machine'] = _breakdown(frame, '_machine') if '_machine' in frame else {}
+    summary['by_product'] = _breakdown(frame, '_product') if '_product' in frame else {}
+    summary['by_hour'] = (
+        {int(hour): value for hour, value in _breakdown(frame, '_hour').items()}
+        if '_hour' in frame else {}
+    )
+
+    return summary
+
+
+# 수신자별 필터에 사용할 수 있는 역할
+FILTER_ROLES = ('machine', 'product', 'distributor')
+
+
+def _cell_breakdown(cells, key):
+    """group-by 결과 셀을 key 기준으로 다시 합산"""
+    grouped = cells.groupby(key, sort=True)[['sales', 'items', 'quantity']].sum()
+    return {
+        name: {
+            'sales': _to_number(row['sales']),
+            'items': int(row['items']),
+            'quantity': _to_number(row['quantity'])
+        }
+        for name, row in grouped.iterrows()
+    }
+
+
+def compute_filtered_summaries(df, filters, roles=None, constants=None):
+    """필터별 매출 요약을 한 번의 group-by로 계산 ({이름: 요약})
+
+    filters는 {이름: {역할: [값, ...]}} 형태로 역할은 machine/product/distributor이다.
+    원본을 (자판기, 상품, 총판) 조합별로 한 번만 집계한 뒤 필터마다 작은 집계표에서
+    골라 합산하므로 필터 수만큼 원본을 다시 훑지 않는다. 데이터에 없는 역할은
+    constants의 고정 값(예: {'distributor': '040'})과 비교한다. 결과 형식은
+    compute_summary와 같다(시간대별 집계 제외).
+    """
+    if roles is None:
+        roles = resolve_column_roles(df.columns)
+    constants = {role: str(value) for role, value in (constants or {}).items()}
+
+    keys = [role for role in FILTER_ROLES if role in roles]
+    work = {'sales': _sales_series(df, roles)}
+    work['quantity'] = (
+        pd.to_numeric(df[roles['quantity']], errors='coerce') if 'quantity' in roles
+        else pd.Series(0, index=df.index)
+    )
+    if 'timestamp' in roles:
+        timestamps = df[roles['timestamp']]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors='coerce')
+        work['start'] = timestamps
+        work['end'] = timestamps
+    for role in keys:
+        work[role] = df[roles[role]].astype(str)
+    frame = pd.DataFrame(work)
+
+    aggregations = {'sales': ('sales', 'sum'), 'items': ('sales', 'size'), 'quantity': ('quantity', 'sum')}
+    if 'start' in frame:
+        aggregations.update(start=('start', 'min'), end=('end', 'max'))
+    if keys:
+        cells = frame.groupby(keys, sort=False, dropna=False).agg(**aggregations).reset_index()
+    else:
+        cells = frame.assign(_all=0).groupby('_all').agg(**aggregations).reset_index(drop=True)
+
+    summaries = {}
+    for name, criteria in filters.items():
+        mask = pd.Series(True, index=cells.index)
+        for role, values in criteria.items():
+            values = {str(value) for value in (values if isinstance(values, (list, tuple, set)) else [values])}
+            if role in keys:
+                mask &= cells[role].isin(values)
+            elif constants.get(role) not in values:
+                mask &= False
+        subset = cells[mask]
+
+        summary = {
+            'total_sales': _to_number(subset['sales'].sum()),
+            'total_items': int(subset['items'].sum()),
+            'period': "데이터 없음" if subset.empty else "기간 정보 없음",
+            'by_machine': _cell_breakdown(subset, 'machine') if 'machine' in keys else {},
+            'by_product': _cell_breakdown(subset, 'product') if 'product' in keys else {},
+            'by_hour': {}
+        }
+        if 'quantity' in roles:
+            summary['total_quantity'] = _to_number(subset['quantity'].sum())
+        if 'start' in subset and not subset.empty:
+            start, end = subset['start'].min(), subset['end'].max()
+            if pd.notna(start) and pd.notna(end):
+                summary['start'] = start.to_pydatetime()
+                summary['end'] = end.to_pydatetime()
+                summary['period'] = f"{start.strftime('%Y-%m-%d')} ~ {end.strftime('%Y-%m-%d')}"
+        summaries[name] = summary
+
+    return summaries
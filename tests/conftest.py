@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가 (scripts와 같은 방식으로 src 패키지 사용)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """상태 파일(SQLite, 캐시)을 테스트마다 임시 폴더에 생성"""
+    from src.config.settings import Settings
+    monkeypatch.setattr(Settings, 'STATE_DIR', str(tmp_path / 'state'))
+    return tmp_path
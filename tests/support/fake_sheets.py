@@ -0,0 +1,304 @@
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+# A1 표기 파싱 ("A1", "C20", "A5:ZZ", "H2:H100")
+_A1_PATTERN = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def column_to_index(letters):
+    """열 문자를 1부터 시작하는 번호로 변환 (A -> 1, ZZ -> 702)"""
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + (ord(char) - ord('A') + 1)
+    return number
+
+
+def parse_a1_range(range_name):
+    """A1 범위를 (시작 행, 시작 열, 끝 행, 끝 열)로 변환 (1부터, 생략된 끝은 None)"""
+    if '!' in range_name:
+        range_name = range_name.split('!', 1)[1]
+    start, _, end = range_name.partition(':')
+    end = end or start
+
+    def parse(part):
+        match = _A1_PATTERN.match(part.strip())
+        if not match:
+            raise ValueError(f"잘못된 A1 범위: {range_name}")
+        letters, digits = match.groups()
+        return (int(digits) if digits else None), (column_to_index(letters) if letters else None)
+
+    start_row, start_col = parse(start)
+    end_row, end_col = parse(end)
+    return start_row or 1, start_col or 1, end_row, end_col
+
+
+class FakeResponse:
+    """requests.Response 대용 (status_code, json())"""
+
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeAPIError(Exception):
+    """할당량 초과 등 API 오류 (gspread APIError처럼 response.status_code 제공)"""
+
+    def __init__(self, status_code=429, message='Quota exceeded'):
+        super().__init__(f"{status_code}: {message}")
+        self.response = FakeResponse(status_code, {'error': {'code': status_code, 'message': message}})
+
+
+class FakeCell:
+    def __init__(self, row, col, value):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+class FakeWorksheet:
+    """gspread.Worksheet 중 SpreadsheetHandler가 사용하는 부분을 메모리로 구현"""
+
+    def __init__(self, spreadsheet, title, sheet_id, rows=None, row_count=1000, col_count=26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.values = [[self._to_cell(value) for value in row] for row in (rows or [])]
+        self.row_count = max(row_count, len(self.values))
+        self.col_count = col_count
+        # 서식 요청 기록 ((시작 행, 끝 행, 시작 열, 끝 열), 서식)
+        self.formats = []
+
+    @staticmethod
+    def _to_cell(value):
+        # 시트에서 읽으면 값은 항상 문자열
+        return '' if value is None else str(value)
+
+    def _last_data_row(self):
+        last = len(self.values)
+        while last and not any(self.values[last - 1]):
+            last -= 1
+        return last
+
+    def get_all_values(self):
+        self.spreadsheet._call('get_all_values')
+        rows = self.values[:self._last_data_row()]
+        width = max((len(row) for row in rows), default=0)
+        return [row + [''] * (width - len(row)) for row in rows]
+
+    def get(self, range_name):
+        self.spreadsheet._call('get')
+        start_row, start_col, end_row, end_col = parse_a1_range(range_name)
+        end_row = min(end_row or len(self.values), len(self.values))
+
+        result = []
+        for row in self.values[start_row - 1:end_row]:
+            cells = row[start_col - 1:end_col]
+            while cells and cells[-1] == '':
+                cells.pop()
+            result.append(cells)
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    def acell(self, label):
+        self.spreadsheet._call('acell')
+        row, col, _, _ = parse_a1_range(label)
+        value = self.values[row - 1][col - 1] if row <= len(self.values) and col <= len(self.values[row - 1]) else ''
+        return FakeCell(row, col, value)
+
+    def append_row(self, values, **kwargs):
+        self.spreadsheet._call('append_row')
+        return self._append([values])
+
+    def append_rows(self, values, **kwargs):
+        self.spreadsheet._call('append_rows')
+        return self._append(values)
+
+    def _append(self, rows):
+        start = self._last_data_row()
+        del self.values[start:]
+        self.values.extend([self._to_cell(value) for value in row] for row in rows)
+        self.row_count = max(self.row_count, len(self.values))
+        self.spreadsheet._bump_revision()
+        self.spreadsheet._fail_after_write()
+        return {'updates': {'updatedRange': f"{self.title}!A{start + 1}", 'updatedRows': len(rows)}}
+
+    def update(self, range_name, values=None, **kwargs):
+        self.spreadsheet._call('update')
+        start_row, start_col, _, _ = parse_a1_range(range_name)
+        if not isinstance(values, list):
+            values = [[values]]
+        elif values and not isinstance(values[0], list):
+            values = [values]
+
+        for i, row in enumerate(values):
+            row_index = start_row - 1 + i
+            while len(self.values) <= row_index:
+                self.values.append([])
+            target = self.values[row_index]
+            for j, value in enumerate(row):
+                col_index = start_col - 1 + j
+                if len(target) <= col_index:
+                    target.extend([''] * (col_index + 1 - len(target)))
+                target[col_index] = self._to_cell(value)
+
+        self.row_count = max(self.row_count, len(self.values))
+        self.spreadsheet._bump_revision()
+        return {'updatedRange': f"{self.title}!{range_name}"}
+
+    def format(self, range_name, cell_format):
+        self.spreadsheet._call('format')
+        start_row, start_col, end_row, end_col = parse_a1_range(range_name)
+        self.formats.append(((start_row - 1, end_row or start_row, start_col - 1, end_col or start_col), cell_format))
+        self.spreadsheet._bump_revision()
+
+    def formatted_rows(self, column_index):
+        """해당 열(0부터)에 서식이 적용된 행 번호 집합 (1부터)"""
+        rows = set()
+        for (start_row, end_row, start_col, end_col), _ in self.formats:
+            if start_col <= column_index < end_col:
+                rows.update(range(start_row + 1, end_row + 1))
+        return rows
+
+
+class FakeClient:
+    """gspread.Client 대용 (open_by_key, request)"""
+
+    def __init__(self, spreadsheet=None):
+        self.spreadsheet = spreadsheet or FakeSpreadsheet(client=self)
+        self.spreadsheet.client = self
+
+    def open_by_key(self, key):
+        self.spreadsheet._call('open_by_key')
+        return self.spreadsheet
+
+    def request(self, method, endpoint, params=None, **kwargs):
+        """Drive 파일 메타데이터 조회만 지원 (version 필드)"""
+        self.spreadsheet._call('drive_request')
+        return FakeResponse(200, {'version': str(self.spreadsheet.revision)})
+
+
+class FakeSpreadsheet:
+    """Google 스프레드시트를 메모리로 흉내 내는 백엔드
+
+    SpreadsheetHandler가 사용하는 gspread/Sheets v4 기능(worksheet, get_all_values, get,
+    append_row(s), acell, format, update, batch_update, Drive version 조회)을 구현한다.
+    호출마다 latency초 지연을 주고, error_rate 확률 또는 fail_next()로 지정한 횟수만큼
+    429 오류를 낸다. fail_next(after_write=True)는 행 추가나 batchUpdate를 반영한 뒤 오류를 내서
+    응답만 유실된 경우를 흉내 낸다. 호출 수는 calls에 메서드별로 기록한다.
+    """
+
+    def __init__(self, sheets=None, spreadsheet_id='fake-spreadsheet', latency=0.0,
+                 error_rate=0.0, error_status=429, seed=None, client=None):
+        self.id = spreadsheet_id
+        self.title = 'fake'
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.revision = 1
+        self.calls = Counter()
+        self.client = client
+        self._random = random.Random(seed)
+        self._forced_errors = 0
+        self._errors_after_write = 0
+        self._lock = threading.Lock()
+        self._worksheets = {}
+        for title, rows in (sheets or {}).items():
+            self.add_worksheet(title, rows)
+
+    def add_worksheet(self, title, rows=None, row_count=1000, col_count=26):
+        worksheet = FakeWorksheet(self, title, len(self._worksheets), rows, row_count, col_count)
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    def fail_next(self, count=1, status=None, after_write=False):
+        """다음 count번의 호출을 오류로 응답 (after_write=True면 쓰기를 반영한 뒤 오류)"""
+        with self._lock:
+            if after_write:
+                self._errors_after_write += count
+            else:
+                self._forced_errors += count
+            if status is not None:
+                self.error_status = status
+
+    def _call(self, name):
+        """호출 기록, 지연, 오류 주입"""
+        with self._lock:
+            self.calls[name] += 1
+            fail = self._forced_errors > 0 or (self.error_rate and self._random.random() < self.error_rate)
+            if self._forced_errors > 0:
+                self._forced_errors -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            self.calls['errors'] += 1
+            raise FakeAPIError(self.error_status)
+
+    def _fail_after_write(self):
+        with self._lock:
+            if self._errors_after_write <= 0:
+                return
+            self._errors_after_write -= 1
+            self.calls['errors'] += 1
+        raise FakeAPIError(self.error_status)
+
+    def _bump_revision(self):
+        with self._lock:
+            self.revision += 1
+
+    def total_calls(self):
+        """오류 응답을 제외한 전체 API 호출 수"""
+        return sum(count for name, count in self.calls.items() if name != 'errors')
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def worksheets(self):
+        self._call('worksheets')
+        return list(self._worksheets.values())
+
+    def worksheet(self, title):
+        self._call('worksheet')
+        if title not in self._worksheets:
+            raise FakeAPIError(404, f"worksheet not found: {title}")
+        return self._worksheets[title]
+
+    def batch_update(self, body):
+        """batchUpdate 요청 중 appendDimension / updateSheetProperties(행·열 수) / repeatCell 적용 (나머지는 기록만)"""
+        self._call('batch_update')
+        by_id = {worksheet.id: worksheet for worksheet in self._worksheets.values()}
+
+        for request in body.get('requests', []):
+            if 'appendDimension' in request:
+                spec = request['appendDimension']
+                worksheet = by_id[spec.get('sheetId', 0)]
+                if spec.get('dimension') == 'ROWS':
+                    worksheet.row_count += spec['length']
+                else:
+                    worksheet.col_count += spec['length']
+            elif 'updateSheetProperties' in request:
+                properties = request['updateSheetProperties']['properties']
+                worksheet = by_id[properties.get('sheetId', 0)]
+                grid = properties.get('gridProperties', {})
+                worksheet.row_count = grid.get('rowCount', worksheet.row_count)
+                worksheet.col_count = grid.get('columnCount', worksheet.col_count)
+            elif 'repeatCell' in request:
+                spec = request['repeatCell']
+                grid = spec['range']
+                worksheet = by_id[grid.get('sheetId', 0)]
+                end_row = min(grid.get('endRowIndex', worksheet.row_count), worksheet.row_count)
+                worksheet.formats.append((
+                    (grid.get('startRowIndex', 0), end_row,
+                     grid.get('startColumnIndex', 0), grid.get('endColumnIndex', worksheet.col_count)),
+                    spec['cell'].get('userEnteredFormat', {})
+                ))
+
+        self._bump_revision()
+        self._fail_after_write()
+        return {'spreadsheetId': self.id, 'replies': [{} for _ in body.get('requests', [])]}
@@ -0,0 +1,77 @@
+from functools import partial
+
+import pandas as pd
+from openpyxl import Workbook
+
+from src.utils import helpers
+from src.utils.helpers import apply_column_schema, parse_excel_file
+
+
+def test_thousands_separators_are_parsed():
+    df = pd.DataFrame({'금액': ['1,500', '2,000', 300, None], '수량': ['1', '2', 3, None]})
+    apply_column_schema(df)
+
+    assert df['금액'].dtype == 'float64'
+    assert df['금액'].tolist()[:3] == [1500.0, 2000.0, 300.0]
+    assert pd.isna(df['금액'].iloc[3])
+    assert df['수량'].tolist()[:3] == [1, 2, 3]
+
+
+def test_unparseable_values_are_kept():
+    df = pd.DataFrame({
+        '금액': ['1,500', '환불'],
+        '수량': [1, 2],
+        '거래일시': ['2025-06-19 10:00:00', '미확인'],
+    })
+    apply_column_schema(df)
+
+    assert df['금액'].tolist() == ['1,500', '환불']
+    assert df['거래일시'].tolist() == ['2025-06-19 10:00:00', '미확인']
+    assert df['수량'].dtype == 'Int64'
+
+
+def test_excel_file_with_formatted_amounts(tmp_path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['거래번호', '자판기', '금액', '거래일시'])
+    sheet.append(['T1', 'VM1', '1,500', '2025-06-19 10:00:00'])
+    sheet.append(['T2', 'VM2', 2000, '2025-06-19 11:00:00'])
+    path = tmp_path / 'Sell_Total2025-06-19.xlsx'
+    workbook.save(path)
+
+    df = parse_excel_file(str(path))
+    assert df['금액'].tolist() == [1500.0, 2000.0]
+
+
+def test_column_types_do_not_depend_on_chunk_boundaries(tmp_path, monkeypatch):
+    # 한 청크에만 숫자가 아닌 값이 있어도 전체 컬럼을 같은 방식으로 처리
+    monkeypatch.setattr(helpers, 'iter_excel_chunks', partial(helpers.iter_excel_chunks, chunk_size=2))
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['거래번호', '금액'])
+    for i, amount in enumerate(['1,500', '1,500', '1,500', '환불']):
+        sheet.append([f"T{i}", amount])
+    path = tmp_path / 'Sell_Total2025-06-19.xlsx'
+    workbook.save(path)
+
+    df = parse_excel_file(str(path))
+    assert df['금액'].tolist() == ['1,500', '1,500', '1,500', '환불']
+
+
+def test_streaming_failure_is_logged_before_fallback(tmp_path, monkeypatch, caplog):
+    def broken_reader(file_path):
+        raise ValueError('손상된 시트')
+        yield
+
+    monkeypatch.setattr(helpers, 'iter_excel_chunks', broken_reader)
+    workbook = Workbook()
+    workbook.active.append(['거래번호', '금액'])
+    workbook.active.append(['T1', '1,500'])
+    path = tmp_path / 'Sell_Total2025-06-19.xlsx'
+    workbook.save(path)
+
+    with caplog.at_level('WARNING', logger='vending_machine'):
+        df = parse_excel_file(str(path))
+
+    assert df['금액'].tolist() == [1500.0]
+    assert '손상된 시트' in caplog.text
@@ -0,0 +1,224 @@
+import email
+import socket
+import socketserver
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.email_outbox import EmailOutbox
+from src.services.email_sender import EmailSender, SMTPConnection
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """테스트용 최소 SMTP 서버 (EHLO/HELO, MAIL, RCPT, DATA, NOOP, RSET, QUIT)"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 localhost test SMTP')
+
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command.split(':', 1)[1].strip(), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip().strip('<>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b'.\r\n', b''):
+                        break
+                    lines.append(data_line)
+                with server.lock:
+                    server.messages.append((recipients, b''.join(lines)))
+                    drop = server.drop_after_next
+                    server.drop_after_next = False
+                self.reply('250 OK queued')
+                if drop:
+                    # 서버가 유휴 연결을 끊은 상황
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+            elif verb in ('NOOP', 'RSET'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.drop_after_next = False
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPStub()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sender(smtp_server):
+    connection = SMTPConnection(
+        host='127.0.0.1', port=smtp_server.server_address[1], use_tls=False,
+        username='bot@example.com', password='', timeout=5, idle_check_seconds=60
+    )
+    sender = EmailSender(connection)
+    yield sender
+    sender.connection.close()
+
+
+def batch(sender, count):
+    return [
+        sender.build_message(f"보고서 {i}", f"내용 {i}", [f"user{i}@example.com"])
+        for i in range(count)
+    ]
+
+
+def test_send_batch_uses_one_session(sender, smtp_server):
+    assert sender.send_batch(batch(sender, 5)) == 5
+    assert smtp_server.connections == 1
+    assert sender.connection.connect_count == 1
+    assert [recipients for recipients, _ in smtp_server.messages] == [
+        [f"user{i}@example.com"] for i in range(5)
+    ]
+    assert sender.last_batch_failures == []
+
+
+def test_send_batch_accepts_build_message_arguments(sender, smtp_server):
+    messages = [{'subject': '보고서', 'content': '내용', 'recipients': ['a@example.com']}]
+    assert sender.send_batch(messages) == 1
+    message = email.message_from_bytes(smtp_server.messages[0][1])
+    assert message['To'] == 'a@example.com'
+
+
+def test_reconnects_when_server_drops_connection(sender, smtp_server):
+    messages = batch(sender, 3)
+    smtp_server.drop_after_next = True
+
+    assert sender.send_batch(messages) == 3
+    # 첫 메시지 뒤 끊긴 연결을 감지하고 다시 연결해 나머지를 발송
+    assert sender.connection.connect_count == 2
+    assert smtp_server.connections == 2
+    assert len(smtp_server.messages) == 3
+
+
+def test_idle_connection_is_checked_before_reuse(sender, smtp_server):
+    sender.connection.idle_check_seconds = 0
+    smtp_server.drop_after_next = True
+    sender.send_email('보고서', '내용', ['a@example.com'])
+
+    sender.send_email('보고서', '내용', ['b@example.com'])
+    assert sender.connection.connect_count == 2
+    assert len(smtp_server.messages) == 2
+
+
+def test_outbox_sends_once_per_dedupe_key(sender, smtp_server, tmp_path):
+    outbox = EmailOutbox(sender, path=str(tmp_path / 'outbox.sqlite3'), backoff_base=0.01)
+    msg, recipients = sender.build_message('보고서', '내용', ['a@example.com'])
+
+    assert outbox.enqueue(msg, recipients, 'daily-report:2025-06-19:a@example.com')
+    assert not outbox.enqueue(msg, recipients, 'daily-report:2025-06-19:a@example.com')
+    assert outbox.drain(timeout=5) == 0
+    assert len(smtp_server.messages) == 1
+    outbox.close()
+
+
+def test_failed_message_can_be_enqueued_again(sender, smtp_server, tmp_path):
+    outbox = EmailOutbox(sender, path=str(tmp_path / 'outbox.sqlite3'), max_attempts=1, backoff_base=0.01)
+    msg, recipients = sender.build_message('보고서', '내용', ['a@example.com'])
+    key = 'daily-report:2025-06-19:a@example.com'
+    port = sender.connection.port
+    sender.connection.port = 1  # 연결 거부
+
+    assert outbox.enqueue(msg, recipients, key)
+    assert outbox.drain(timeout=5) == 0
+    assert smtp_server.messages == []
+
+    # 최종 실패한 키는 다시 넣으면 새로 발송
+    sender.connection.port = port
+    assert outbox.enqueue(msg, recipients, key)
+    assert outbox.drain(timeout=5) == 0
+    assert len(smtp_server.messages) == 1
+    assert not outbox.enqueue(msg, recipients, key)
+    outbox.close()
+
+
+def test_claimed_message_is_not_sent_by_another_outbox(sender, smtp_server, tmp_path):
+    # 같은 대기열을 쓰는 다른 프로세스가 먼저 가져간 메시지는 발송하지 않음
+    path = str(tmp_path / 'outbox.sqlite3')
+    first = EmailOutbox(sender, path=path)
+    second = EmailOutbox(sender, path=path)
+    msg, recipients = sender.build_message('보고서', '내용', ['a@example.com'])
+    first.enqueue(msg, recipients, 'daily-report:2025-06-19:a@example.com')
+
+    assert second._claim(1)
+    first.process_due()
+    assert smtp_server.messages == []
+    assert first.pending_count() == 1
+    first.close()
+    second.close()
+
+
+class BlockingConnection:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.sent = []
+
+    def send(self, message, recipients):
+        self.started.set()
+        self.release.wait(5)
+        self.sent.append(recipients)
+
+
+def test_close_waits_for_in_flight_send(sender, tmp_path, monkeypatch):
+    monkeypatch.setattr('src.config.settings.Settings.SMTP_TIMEOUT', 0.05)
+    connection = BlockingConnection()
+    blocking_sender = SimpleNamespace(connection=connection)
+    outbox = EmailOutbox(blocking_sender, path=str(tmp_path / 'outbox.sqlite3'))
+    msg, recipients = sender.build_message('보고서', '내용', ['a@example.com'])
+    outbox.enqueue(msg, recipients, 'daily-report:2025-06-19:a@example.com')
+    outbox.start()
+    assert connection.started.wait(5)
+
+    # 발송 중에 close해도 연결은 발송 결과를 기록한 뒤 스레드가 닫음
+    outbox.close()
+    assert outbox.conn is not None
+    connection.release.set()
+    outbox._thread.join(5)
+    assert outbox.conn is None
+    assert connection.sent == [['a@example.com']]
+
+    reopened = EmailOutbox(blocking_sender, path=str(tmp_path / 'outbox.sqlite3'))
+    assert reopened.pending_count() == 0
+    reopened.close()
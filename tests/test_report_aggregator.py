@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.services.report_aggregator import ReportAggregator
+from src.services.running_totals import RunningTotals
+from src.services.sales_warehouse import SalesWarehouse
+
+
+def days_frame(first, last):
+    dates = pd.date_range(first, last, freq='D') + pd.Timedelta(hours=10)
+    return pd.DataFrame({'거래일시': dates, '자판기': 'VM1', '금액': 1000})
+
+
+def test_monthly_from_running_totals_when_month_is_complete(tmp_path):
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    totals.apply_dataframe(days_frame('2025-06-01', '2025-06-30'), 'Sell_Total2025-06-30.xlsx')
+
+    assert ReportAggregator(running_totals=totals).compute_monthly('2025-06') == ['2025-06', '30,000원']
+
+
+def test_monthly_falls_back_when_days_are_missing(tmp_path):
+    # 배포 이후(6월 20일부터)만 처리한 경우 월 누적은 시트 값을 써야 함
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    totals.apply_dataframe(days_frame('2025-06-20', '2025-06-30'), 'Sell_Total2025-06-30.xlsx')
+
+    assert ReportAggregator(running_totals=totals).compute_monthly('2025-06') is None
+
+
+def test_monthly_until_date_uses_warehouse_coverage(tmp_path):
+    warehouse = SalesWarehouse(str(tmp_path / 'warehouse.sqlite3'))
+    warehouse.ingest(days_frame('2025-06-01', '2025-06-10'), 'Sell_Total2025-06-10.xlsx')
+    aggregator = ReportAggregator(warehouse=warehouse)
+
+    assert aggregator.compute_monthly('2025-06', until_date='2025-06-10') == ['2025-06', '10,000원']
+    assert aggregator.compute_monthly('2025-06', until_date='2025-06-05') == ['2025-06', '5,000원']
+    assert aggregator.compute_monthly('2025-06', until_date='2025-06-11') is None
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.services.data_processor import DataProcessor
+from src.services.email_sender import EmailSender
+from src.services.report_fanout import ReportFanout
+from src.services.running_totals import RunningTotals
+from src.utils.helpers import format_currency
+
+
+def test_dedupe_keys_use_report_date_without_timestamps():
+    # 일시 컬럼이 없으면 요약 기간은 고정 문자열이므로 키에 쓰면 다음 날 보고서가 막힘
+    df = pd.DataFrame({'자판기': ['VM1', 'VM2'], '금액': [1000, 2000]})
+    fanout = ReportFanout(DataProcessor(), EmailSender())
+    filters = {'a@example.com': {'machine': ['VM1']}}
+
+    first = fanout.build_messages(df, filters, '2025-06-19')
+    second = fanout.build_messages(df, filters, '2025-06-20')
+
+    assert [key for _, _, key in first] == ['daily-report:2025-06-19:a@example.com']
+    assert [key for _, _, key in second] == ['daily-report:2025-06-20:a@example.com']
+
+
+def test_distributor_filter_gets_monthly_total(tmp_path, monkeypatch):
+    # 월 누적은 총판별로 저장되므로 총판 필터 수신자도 월 누적 매출을 받음
+    month = datetime.now().strftime('%Y-%m')
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    totals.apply_day(f"{month}-01", {'VM1': {'sales': 5000, 'items': 2}}, '040')
+    totals.apply_day(f"{month}-01", {'VM2': {'sales': 1000, 'items': 1}}, '041')
+    fanout = ReportFanout(DataProcessor(), EmailSender(), running_totals=totals)
+    monkeypatch.setattr(fanout.aggregator, 'is_month_covered', lambda source, month: True)
+
+    assert fanout._monthly_for({'distributor': ['041']}) == [month, format_currency(1000)]
+    assert fanout._monthly_for({'machine': ['VM1'], 'distributor': ['040', '041']}) == [month, format_currency(5000)]
+    assert fanout._monthly_for({'machine': ['VM1'], 'distributor': ['041']}) is None
+    assert fanout._monthly_for({'product': ['콜라']}) is None
+    totals.close()
+
+
+class FailingOutbox:
+    """두 번째 메시지부터 대기열 추가 실패"""
+
+    def __init__(self):
+        self.keys = []
+
+    def enqueue(self, msg, recipients, dedupe_key):
+        if self.keys:
+            raise RuntimeError('database is locked')
+        self.keys.append(dedupe_key)
+        return True
+
+
+def test_failed_send_records_handled_recipients():
+    df = pd.DataFrame({'자판기': ['VM1', 'VM2'], '금액': [1000, 2000]})
+    fanout = ReportFanout(DataProcessor(), EmailSender(), FailingOutbox())
+    filters = {
+        'a@example.com': {'machine': ['VM1']},
+        'b@example.com': {'machine': ['VM2']},
+        'c@example.com': {'machine': ['VM9']},
+    }
+
+    with pytest.raises(RuntimeError):
+        fanout.send(df, filters, '2025-06-19')
+
+    # 발송 대기열에 들어간 수신자와 데이터가 없어 건너뛴 수신자만 처리된 것으로 기록
+    assert sorted(fanout.handled) == ['a@example.com', 'c@example.com']
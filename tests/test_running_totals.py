@@ -0,0 +1,81 @@
+import sqlite3
+
+import pandas as pd
+
+from src.config.settings import Settings
+from src.services.running_totals import RunningTotals
+from src.services.sales_warehouse import SalesWarehouse
+
+
+def day_frame(rows):
+    return pd.DataFrame(rows, columns=['거래일시', '자판기', '금액'])
+
+
+def test_distributors_on_same_day_are_summed(tmp_path):
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    first = day_frame([['2025-06-19 10:00', 'VM1', 5000], ['2025-06-19 11:00', 'VM1', 5000]])
+    second = day_frame([['2025-06-19 12:00', 'VM2', 1000], ['2025-06-19 13:00', 'VM2', 1000]])
+
+    totals.apply_dataframe(first, 'Sell_Total2025-06-19_040.xlsx')
+    totals.apply_dataframe(second, 'Sell_Total2025-06-19_041.xlsx')
+
+    assert totals.month_to_date('2025-06') == (12000, 4)
+    assert totals.machine_totals('2025-06') == {'VM1': (10000, 2), 'VM2': (2000, 2)}
+
+
+def test_reapplying_replaces_only_that_distributor(tmp_path):
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    totals.apply_dataframe(day_frame([['2025-06-19 10:00', 'VM1', 5000]]), 'a.xlsx', distributor='040')
+    totals.apply_dataframe(day_frame([['2025-06-19 10:00', 'VM2', 1000]]), 'b.xlsx', distributor='041')
+    totals.apply_dataframe(day_frame([['2025-06-19 10:00', 'VM1', 7000]]), 'a.xlsx', distributor='040')
+
+    assert totals.month_to_date('2025-06') == (8000, 2)
+    assert totals.machine_totals('2025-06') == {'VM1': (7000, 1), 'VM2': (1000, 1)}
+
+
+def test_untagged_file_uses_default_distributor(tmp_path):
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    frame = day_frame([['2025-06-19 10:00', 'VM1', 5000]])
+    totals.apply_dataframe(frame, 'Sell_Total2025-06-19.xlsx')
+    totals.apply_dataframe(frame, f'Sell_Total2025-06-19_{Settings.DISTRIBUTOR_CODE}.xlsx')
+
+    assert totals.month_to_date('2025-06') == (5000, 1)
+
+
+def test_formatted_amounts_are_counted(tmp_path):
+    # 환불 행 때문에 문자열로 남은 금액 컬럼의 "1,500"도 0이 아닌 금액으로 집계
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    frame = day_frame([['2025-06-19 10:00', 'VM1', '1,500'], ['2025-06-19 11:00', 'VM1', '환불']])
+    totals.apply_dataframe(frame, 'Sell_Total2025-06-19.xlsx')
+
+    assert totals.month_to_date('2025-06') == (1500, 2)
+
+
+def test_old_schema_is_migrated(tmp_path):
+    path = str(tmp_path / 'totals.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE daily_contrib (sale_date TEXT NOT NULL, machine TEXT NOT NULL, sales REAL NOT NULL, "
+        "items INTEGER NOT NULL, PRIMARY KEY (sale_date, machine))"
+    )
+    conn.execute("INSERT INTO daily_contrib VALUES ('2025-06-18', 'VM1', 3000, 1)")
+    conn.commit()
+    conn.close()
+
+    totals = RunningTotals(path)
+    rows = totals.conn.execute("SELECT sale_date, distributor, machine FROM daily_contrib").fetchall()
+    assert rows == [('2025-06-18', Settings.DISTRIBUTOR_CODE, 'VM1')]
+
+
+def test_rebuild_keeps_distributors_apart(tmp_path):
+    warehouse = SalesWarehouse(str(tmp_path / 'warehouse.sqlite3'))
+    warehouse.ingest(day_frame([['2025-06-19 10:00', 'VM1', 5000]]), 'Sell_Total2025-06-19_040.xlsx')
+    warehouse.ingest(day_frame([['2025-06-19 11:00', 'VM1', 2000]]), 'Sell_Total2025-06-19_041.xlsx')
+
+    totals = RunningTotals(str(tmp_path / 'totals.sqlite3'))
+    assert totals.rebuild(warehouse) == 1
+    assert totals.month_to_date('2025-06') == (7000, 2)
+
+    # 재구성 뒤 한 총판만 다시 적용해도 다른 총판 값은 유지
+    totals.apply_dataframe(day_frame([['2025-06-19 10:00', 'VM1', 6000]]), 'Sell_Total2025-06-19_040.xlsx')
+    assert totals.month_to_date('2025-06') == (8000, 2)
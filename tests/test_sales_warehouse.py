@@ -0,0 +1,56 @@
+import sqlite3
+
+import pandas as pd
+
+from src.config.settings import Settings
+from src.services.sales_warehouse import SalesWarehouse
+
+
+def days_frame(first, last, amount=1000):
+    dates = pd.date_range(first, last, freq='D') + pd.Timedelta(hours=10)
+    return pd.DataFrame({'거래일시': dates, '자판기': 'VM1', '금액': amount})
+
+
+def test_overlapping_backfill_and_daily_files_are_not_double_counted(tmp_path):
+    warehouse = SalesWarehouse(str(tmp_path / 'warehouse.sqlite3'))
+    warehouse.ingest(days_frame('2025-06-01', '2025-06-07'), 'Sell_Total2025-06-01.xlsx')
+    warehouse.ingest(days_frame('2025-06-07', '2025-06-07'), 'Sell_Total2025-06-07.xlsx')
+    # 총판 코드가 붙은 같은 날짜 파일을 다시 받은 경우
+    warehouse.ingest(days_frame('2025-06-07', '2025-06-07'), f'Sell_Total2025-06-07_{Settings.DISTRIBUTOR_CODE}.xlsx')
+
+    assert warehouse.month_to_date('2025-06') == (7000, 7)
+
+
+def test_distributors_are_replaced_separately(tmp_path):
+    warehouse = SalesWarehouse(str(tmp_path / 'warehouse.sqlite3'))
+    warehouse.ingest(days_frame('2025-06-07', '2025-06-07'), 'Sell_Total2025-06-07_040.xlsx')
+    warehouse.ingest(days_frame('2025-06-07', '2025-06-07', 500), 'Sell_Total2025-06-07_041.xlsx')
+    warehouse.ingest(days_frame('2025-06-07', '2025-06-07', 2000), 'Sell_Total2025-06-07_040.xlsx')
+
+    assert warehouse.month_to_date('2025-06') == (2500, 2)
+
+
+def test_formatted_amounts_are_stored_as_numbers(tmp_path):
+    # 스키마를 적용하지 못한 컬럼의 "1,500" 같은 문자열도 금액/수량으로 집계
+    warehouse = SalesWarehouse(str(tmp_path / 'warehouse.sqlite3'))
+    df = days_frame('2025-06-07', '2025-06-07').assign(금액='1,500', 수량='1,200')
+    warehouse.ingest(df, 'Sell_Total2025-06-07.xlsx')
+
+    assert warehouse.month_to_date('2025-06') == (1500, 1)
+    assert warehouse.query("SELECT quantity FROM sales")["quantity"].tolist() == [1200]
+
+
+def test_existing_table_gets_distributor_column(tmp_path):
+    path = str(tmp_path / 'warehouse.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE sales (source_file TEXT NOT NULL, month TEXT, sale_date TEXT, sold_at TEXT, "
+        "machine TEXT, product TEXT, amount REAL, quantity INTEGER, row_json TEXT)"
+    )
+    conn.execute("INSERT INTO sales (source_file, month, sale_date, amount) "
+                 "VALUES ('Sell_Total2025-06-07_041.xlsx', '2025-06', '2025-06-07', 100)")
+    conn.commit()
+    conn.close()
+
+    warehouse = SalesWarehouse(path)
+    assert warehouse.conn.execute("SELECT distributor FROM sales").fetchall() == [('041',)]
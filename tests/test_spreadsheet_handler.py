@@ -0,0 +1,208 @@
+import pytest
+
+from src.config.settings import Settings
+from src.services.sheets_scheduler import SheetsRequestScheduler
+from src.services.spreadsheet_handler import SpreadsheetHandler
+from tests.support.fake_sheets import FakeAPIError, FakeClient, FakeSpreadsheet
+
+HEADER = ['거래번호', '자판기', '상품명', '수량', '금액', '결제수단', '카드사', '거래일시', '상태', '비고']
+
+
+def make_rows(count, offset=0):
+    return [
+        [f"T{offset + i:05d}", f"VM{(offset + i) % 3}", '상품', 1, 1000, '카드', '', f"2025-06-19 10:{i % 60:02d}:00", '정상', '']
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(params=[True, False], ids=['row-key-cache', 'full-read'])
+def sheets(request, monkeypatch):
+    monkeypatch.setattr(Settings, 'ROW_KEY_CACHE_ENABLED', request.param)
+    spreadsheet = FakeSpreadsheet(
+        sheets={
+            Settings.MAIN_SHEET: [HEADER] + make_rows(5),
+            Settings.TABLE1_SHEET: [['구분', '매출액', '판매 수']],
+            Settings.TABLE2_SHEET: [['월', '매출액']],
+        },
+        seed=0
+    )
+    scheduler = SheetsRequestScheduler(
+        read_per_minute=10 ** 9, write_per_minute=10 ** 9, max_retries=3, sleep=lambda _: None
+    )
+    handler = SpreadsheetHandler(scheduler=scheduler, client=FakeClient(spreadsheet))
+    assert handler.open_spreadsheet()
+    yield spreadsheet, handler
+    if handler.row_key_store is not None:
+        handler.row_key_store.close()
+
+
+def main_rows(spreadsheet):
+    return spreadsheet._worksheets[Settings.MAIN_SHEET].get_all_values()[1:]
+
+
+def test_quota_error_on_append_is_retried(sheets):
+    spreadsheet, handler = sheets
+    worksheet = spreadsheet._worksheets[Settings.MAIN_SHEET]
+    original = worksheet.append_rows
+    attempts = []
+
+    def append_rows(values, **kwargs):
+        attempts.append(len(values))
+        if len(attempts) == 1:
+            raise FakeAPIError(429)
+        return original(values, **kwargs)
+
+    worksheet.append_rows = append_rows
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 3
+    assert attempts == [3, 3]
+    # 429는 반영되지 않은 요청이므로 시트를 다시 확인하지 않고 바로 재시도
+    assert spreadsheet.calls['get'] <= 1
+    assert len(main_rows(spreadsheet)) == 8
+
+
+def test_committed_append_with_lost_response_is_not_duplicated(sheets):
+    spreadsheet, handler = sheets
+    spreadsheet.fail_next(1, 503, after_write=True)
+
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 3
+    rows = main_rows(spreadsheet)
+    assert len(rows) == 8
+    assert len({row[0] for row in rows}) == 8
+    assert spreadsheet.calls['append_rows'] == 1
+
+    # 다음 실행에서도 같은 행은 중복으로 판단
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 0
+    assert len(main_rows(spreadsheet)) == 8
+
+
+def test_partial_append_reports_rows_found_in_sheet(sheets):
+    spreadsheet, handler = sheets
+    worksheet = spreadsheet._worksheets[Settings.MAIN_SHEET]
+    original = worksheet.append_rows
+    attempts = []
+
+    def append_rows(values, **kwargs):
+        attempts.append(len(values))
+        if len(attempts) == 1:
+            # 첫 행만 반영되고 다른 실행의 행이 끼어든 뒤 응답 유실
+            original(values[:1], **kwargs)
+            original(make_rows(1, offset=900), **kwargs)
+            raise FakeAPIError(503)
+        return original(values, **kwargs)
+
+    worksheet.append_rows = append_rows
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 3
+    assert attempts == [3, 2]
+    assert len(main_rows(spreadsheet)) == 9
+
+
+def test_uncommitted_append_after_server_error_is_retried(sheets):
+    spreadsheet, handler = sheets
+    worksheet = spreadsheet._worksheets[Settings.MAIN_SHEET]
+    original = worksheet.append_rows
+    attempts = []
+
+    def append_rows(values, **kwargs):
+        attempts.append(len(values))
+        if len(attempts) == 1:
+            raise FakeAPIError(500, 'Internal error')
+        return original(values, **kwargs)
+
+    worksheet.append_rows = append_rows
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 3
+    assert attempts == [3, 3]
+    assert len(main_rows(spreadsheet)) == 8
+
+
+def test_non_idempotent_write_is_not_retried_on_server_error():
+    scheduler = SheetsRequestScheduler(
+        read_per_minute=10 ** 9, write_per_minute=10 ** 9, max_retries=3, sleep=lambda _: None
+    )
+    calls = []
+
+    def fail(status):
+        calls.append(status)
+        raise FakeAPIError(status)
+
+    with pytest.raises(FakeAPIError):
+        scheduler.write_once(fail, 503)
+    assert calls == [503]
+
+    with pytest.raises(FakeAPIError):
+        scheduler.write_once(fail, 429)
+    assert calls == [503] + [429] * 4
+
+    calls.clear()
+    with pytest.raises(FakeAPIError):
+        scheduler.write(fail, 503)
+    assert calls == [503] * 4
+
+
+def test_append_uses_one_write_and_one_format_request(sheets):
+    spreadsheet, handler = sheets
+    spreadsheet.reset_calls()
+
+    assert handler.append_rows_to_main_sheet(make_rows(50, offset=100)) == 50
+    assert spreadsheet.calls['append_rows'] == 1
+    assert spreadsheet.calls['batch_update'] == 1
+    worksheet = spreadsheet._worksheets[Settings.MAIN_SHEET]
+    assert set(range(2, 57)) <= worksheet.formatted_rows(7)
+
+    # 서식 여유 행 안에 추가되는 다음 날짜는 서식 요청 없음
+    spreadsheet.reset_calls()
+    assert handler.append_rows_to_main_sheet(make_rows(50, offset=200)) == 50
+    assert spreadsheet.calls['append_rows'] == 1
+    assert spreadsheet.calls['batch_update'] == 0
+
+
+def test_grid_resize_is_not_doubled_when_response_is_lost(sheets):
+    spreadsheet, handler = sheets
+    worksheet = spreadsheet._worksheets[Settings.MAIN_SHEET]
+    original = worksheet.append_rows
+
+    def append_rows(values, **kwargs):
+        result = original(values, **kwargs)
+        # 행 추가 다음 요청(서식 batchUpdate)이 반영된 뒤 응답만 유실
+        spreadsheet.fail_next(1, 503, after_write=True)
+        return result
+
+    worksheet.append_rows = append_rows
+    assert handler.append_rows_to_main_sheet(make_rows(3, offset=100)) == 3
+    assert spreadsheet.calls['batch_update'] == 2
+    assert worksheet.row_count == 9 + Settings.DATE_FORMAT_HEADROOM_ROWS
+
+
+def test_rerun_skips_duplicates_without_writing(sheets):
+    spreadsheet, handler = sheets
+    rows = make_rows(20, offset=100)
+    assert handler.append_rows_to_main_sheet(rows) == 20
+
+    spreadsheet.reset_calls()
+    assert handler.append_rows_to_main_sheet(rows + make_rows(5)) == 0
+    assert spreadsheet.calls['append_rows'] == 0
+    assert handler.last_append_stats['skipped'] == 25
+    assert len(main_rows(spreadsheet)) == 25
+
+
+def test_rerun_with_row_key_cache_does_not_read_sheet(sheets):
+    spreadsheet, handler = sheets
+    if not Settings.ROW_KEY_CACHE_ENABLED:
+        pytest.skip("행 키 캐시 사용 시에만 해당")
+    rows = make_rows(20, offset=100)
+    handler.append_rows_to_main_sheet(rows)
+
+    spreadsheet.reset_calls()
+    handler.append_rows_to_main_sheet(rows)
+    assert spreadsheet.calls['get_all_values'] == 0
+    assert spreadsheet.calls['get'] == 0
+
+
+def test_quota_errors_are_retried_with_backoff(sheets):
+    spreadsheet, handler = sheets
+    spreadsheet.reset_calls()
+    spreadsheet.fail_next(2, 429)
+
+    assert handler.append_rows_to_main_sheet(make_rows(10, offset=100)) == 10
+    assert spreadsheet.calls['errors'] == 2
+    assert handler.scheduler.get_metrics()['retries'] == 2
+    assert len(main_rows(spreadsheet)) == 15
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.summary import compute_summary, compute_filtered_summaries
+
+ROWS = 200_000
+MACHINES = [f"VM{i:02d}" for i in range(40)]
+PRODUCTS = [f"P{i:02d}" for i in range(50)]
+
+
+@pytest.fixture(scope='module')
+def sales_frame():
+    """자판기 40대, 상품 50종, 1초 간격 거래 20만 건"""
+    index = np.arange(ROWS)
+    return pd.DataFrame({
+        '거래일시': pd.date_range('2025-01-01', periods=ROWS, freq='s'),
+        '자판기': np.array(MACHINES)[index % len(MACHINES)],
+        '상품명': np.array(PRODUCTS)[index % len(PRODUCTS)],
+        '금액': 1000 + (index % 5) * 100,
+        '수량': 1 + index % 3,
+    })
+
+
+def test_totals_on_large_frame(sales_frame):
+    summary = compute_summary(sales_frame)
+
+    assert summary['total_sales'] == int(sales_frame['금액'].sum())
+    assert summary['total_items'] == ROWS
+    assert summary['total_quantity'] == int(sales_frame['수량'].sum())
+    assert summary['period'] == '2025-01-01 ~ 2025-01-03'
+    assert summary['start'] == pd.Timestamp('2025-01-01 00:00:00')
+    assert summary['end'] == pd.Timestamp('2025-01-01') + pd.Timedelta(seconds=ROWS - 1)
+
+
+def test_input_frame_is_not_modified(sales_frame):
+    before = sales_frame.copy()
+    compute_summary(sales_frame)
+    compute_filtered_summaries(sales_frame, {'a': {'machine': ['VM01']}})
+
+    pd.testing.assert_frame_equal(sales_frame, before)
+
+
+def test_breakdowns(sales_frame):
+    summary = compute_summary(sales_frame)
+    expected_machine = sales_frame.groupby('자판기')['금액'].agg(['sum', 'size'])
+    expected_product = sales_frame.groupby('상품명')['금액'].agg(['sum', 'size'])
+    expected_hour = sales_frame.groupby(sales_frame['거래일시'].dt.hour)['금액'].agg(['sum', 'size'])
+
+    assert set(summary['by_machine']) == set(MACHINES)
+    for name, row in expected_machine.iterrows():
+        assert summary['by_machine'][name]['sales'] == row['sum']
+        assert summary['by_machine'][name]['items'] == row['size']
+    for name, row in expected_product.iterrows():
+        assert summary['by_product'][name]['sales'] == row['sum']
+        assert summary['by_product'][name]['items'] == row['size']
+    assert set(summary['by_hour']) == set(range(24))
+    for hour, row in expected_hour.iterrows():
+        assert summary['by_hour'][hour]['sales'] == row['sum']
+        assert summary['by_hour'][hour]['items'] == row['size']
+
+
+def test_string_amounts_with_thousands_separator():
+    df = pd.DataFrame({'자판기': ['A', 'A', 'B'], '금액': ['1,500', '2,000', '10,000']})
+    summary = compute_summary(df)
+
+    assert summary['total_sales'] == 13500
+    assert summary['by_machine']['A']['sales'] == 3500
+
+
+def test_without_timestamp_column():
+    df = pd.DataFrame({'자판기': ['A', 'B'], '금액': [1000, 2000]})
+    summary = compute_summary(df)
+
+    assert summary['period'] == '기간 정보 없음'
+    assert 'start' not in summary
+    assert summary['by_hour'] == {}
+    assert summary['total_sales'] == 3000
+
+
+def test_empty_frame():
+    summary = compute_summary(pd.DataFrame())
+    assert summary['total_sales'] == 0
+    assert summary['total_items'] == 0
+
+
+def test_filtered_summaries_match_masked_frames(sales_frame):
+    filters = {
+        'two_machines': {'machine': ['VM01', 'VM02']},
+        'product_in_machines': {'product': ['P01'], 'machine': ['VM01', 'VM11']},
+        'no_match': {'machine': ['없음']},
+    }
+    summaries = compute_filtered_summaries(sales_frame, filters)
+
+    for name, criteria in filters.items():
+        mask = pd.Series(True, index=sales_frame.index)
+        if 'machine' in criteria:
+            mask &= sales_frame['자판기'].isin(criteria['machine'])
+        if 'product' in criteria:
+            mask &= sales_frame['상품명'].isin(criteria['product'])
+        expected = compute_summary(sales_frame[mask]) if mask.any() else None
+
+        if expected is None:
+            assert summaries[name]['total_items'] == 0
+            assert summaries[name]['period'] == '데이터 없음'
+            continue
+        assert summaries[name]['total_sales'] == expected['total_sales']
+        assert summaries[name]['total_items'] == expected['total_items']
+        assert summaries[name]['total_quantity'] == expected['total_quantity']
+        assert summaries[name]['period'] == expected['period']
+        assert summaries[name]['by_machine'] == expected['by_machine']
+
+
+def test_filtered_summaries_distributor_column_and_constant():
+    df = pd.DataFrame({
+        '자판기': ['A', 'B', 'C'],
+        '금액': ['1,000', '2,000', '3,000'],
+        '총판코드': ['040', '040', '041'],
+    })
+    summaries = compute_filtered_summaries(df, {'040': {'distributor': ['040']}, '041': {'distributor': '041'}})
+    assert summaries['040']['total_sales'] == 3000
+    assert summaries['041']['total_sales'] == 3000
+
+    # 총판 컬럼이 없으면 고정 값과 비교
+    plain = df.drop(columns=['총판코드'])
+    summaries = compute_filtered_summaries(
+        plain, {'hit': {'distributor': ['040']}, 'miss': {'distributor': ['041']}},
+        constants={'distributor': '040'}
+    )
+    assert summaries['hit']['total_sales'] == 6000
+    assert summaries['hit']['period'] == '기간 정보 없음'
+    assert summaries['miss']['total_items'] == 0
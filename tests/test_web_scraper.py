@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from src.config.settings import Settings
+from src.services.web_scraper import WebScraper
+
+
+class StubDriver:
+    """execute_script 호출마다 준비된 페이지 상태를 차례로 반환"""
+
+    def __init__(self, states):
+        self.states = list(states)
+
+    def execute_script(self, script, *args):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+def state(idle=True, sent=1, done=1, results='<tr>old</tr>', empty=False):
+    return {'idle': idle, 'sent': sent, 'done': done, 'results': results, 'empty': empty}
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, 'DOWNLOAD_DIR', str(tmp_path / 'downloads'))
+    monkeypatch.setattr(Settings, 'SEARCH_SETTLE_SECONDS', 0.05)
+    return WebScraper()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_changed_results_complete_immediately(scraper):
+    scraper.driver = StubDriver([state(sent=2, done=1), state(sent=2, done=2, results='<tr>new</tr>')])
+    is_complete = scraper._search_completion(1, state())
+
+    assert is_complete() is False
+    assert is_complete() is True
+
+
+def test_unchanged_results_complete_after_request_settles(scraper):
+    # 매출 없는 날: 검색 요청은 끝났지만 결과 테이블은 그대로
+    scraper.driver = StubDriver([state(sent=2, done=2)])
+    is_complete = scraper._search_completion(1, state())
+
+    started = time.monotonic()
+    assert wait_until(is_complete)
+    assert time.monotonic() - started < 1.0
+
+
+def test_no_request_seen_is_not_complete(scraper):
+    scraper.driver = StubDriver([state(sent=1, done=1)])
+    is_complete = scraper._search_completion(1, state())
+
+    assert not wait_until(is_complete, timeout=0.2)
+
+
+def test_no_data_marker_completes(scraper):
+    scraper.driver = StubDriver([state(sent=1, done=1, empty=True)])
+    assert scraper._search_completion(1, state())() is True
+
+
+def test_page_reload_completes_when_idle(scraper):
+    scraper.driver = StubDriver([state(idle=False, sent=None, done=None), state(sent=None, done=None)])
+    is_complete = scraper._search_completion(1, state())
+
+    assert is_complete() is False
+    assert is_complete() is True
+
+
+class StubResponse:
+    def __init__(self, content):
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class StubSession:
+    def __init__(self, content):
+        self.content = content
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return StubResponse(self.content)
+
+
+def test_worker_session_failure_leaves_shared_state(scraper, monkeypatch):
+    # 작업 스레드용 세션이 실패해도 공유 세션을 지우거나 드라이버로 새 세션을 만들지 않음
+    monkeypatch.setattr(Settings, 'EXPORT_URL', 'https://example.com/export?d={distributor}')
+    scraper.driver = None
+    shared = StubSession(b'PK')
+    scraper.http_session = shared
+    worker = StubSession(b'<html>login</html>')
+
+    with pytest.raises(Exception):
+        scraper.fetch_export_via_http('2025-06-19', '2025-06-19', '040', session=worker)
+
+    assert scraper.http_session is shared
+    assert worker.urls == ['https://example.com/export?d=040']
+
+
+def test_worker_session_saves_file(scraper, tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, 'EXPORT_URL', 'https://example.com/export?d={distributor}')
+    scraper.driver = None
+
+    file_path = scraper.fetch_export_via_http(
+        '2025-06-19', '2025-06-19', '040', download_dir=str(tmp_path), session=StubSession(b'PK\x03\x04')
+    )
+
+    assert file_path == str(tmp_path / 'Sell_Total2025-06-19.xlsx')
+    assert scraper.http_session is None
+
+
+def test_download_range_covers_every_distributor(scraper, monkeypatch):
+    # 백필도 모든 총판을 받아 총판 코드가 붙은 파일명으로 구분
+    scraper.logged_in = True
+
+    def fake_export(start_date, end_date, distributor_code=None):
+        file_path = scraper.download_dir + f"/Sell_Total{start_date}.xlsx"
+        open(file_path, 'wb').close()
+        return file_path
+
+    monkeypatch.setattr(scraper, '_try_http_export', fake_export)
+
+    results = list(scraper.download_range(['2025-06-18', '2025-06-19'], ['040', '041']))
+
+    assert [(start, code) for start, _, code, _ in results] == [
+        ('2025-06-18', '040'), ('2025-06-18', '041'), ('2025-06-19', '040'), ('2025-06-19', '041')
+    ]
+    assert [file_path.rsplit('/', 1)[1] for *_, file_path in results] == [
+        'Sell_Total2025-06-18_040.xlsx', 'Sell_Total2025-06-18_041.xlsx',
+        'Sell_Total2025-06-19_040.xlsx', 'Sell_Total2025-06-19_041.xlsx'
+    ]
+
+
+def test_unreadable_saved_session_means_no_session(scraper):
+    # 저장 파일이 사라졌거나 손상된 경우 예외 없이 일반 로그인으로 진행
+    def load():
+        raise FileNotFoundError('session.bin')
+
+    scraper.session_store.load = load
+    assert scraper.restore_session() is False
+    assert scraper.logged_in is False